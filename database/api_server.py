@@ -0,0 +1,377 @@
+#!/usr/bin/env python
+"""
+ReasonPath Article API
+Asyncio JSON API over the article database
+
+Usage:
+    python database/api_server.py [--db database/reasonpath.db] [--port 8001] [--workers 8]
+                                  [--instrument | --trace-sql] [--metrics-port 9108]
+
+Routes (GET or HEAD, all JSON):
+    /api/articles?limit=&cursor=&category=&tag=   a page of published articles
+    /api/articles/<slug>                          one published article, with its Markdown,
+                                                  rendered HTML and table of contents
+    /api/search?q=&limit=                         BM25-ranked search results
+    /api/tags/<slug>?limit=&cursor=               a tag and a page of its articles
+
+The event loop only parses requests and writes responses; every SQLite
+call runs on a fixed-size thread pool, each thread with its own pooled
+read connection. Each connection has at most one request in flight, so
+the pool's queue is bounded by the number of open connections.
+
+Successful responses are cached, encoded and gzipped, keyed by path and
+sorted query parameters. The cache is a FeedCache, so any write to the
+articles, tags or categories (from this process or another) invalidates
+it through the database's article revision.
+"""
+
+import argparse
+import asyncio
+import email.utils
+import gzip
+import hashlib
+import json
+import signal
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from article_manager import ArticleDatabase
+from feed_cache import FeedCache
+from instrumentation import METRICS_PORT, SLOW_QUERY_MS, MetricsServer
+
+PORT = 8001
+
+# Threads running SQLite queries
+DEFAULT_WORKERS = 8
+
+# Cached responses (each keeps its JSON and gzip bodies)
+CACHE_ENTRIES = 4096
+CACHE_TTL = 300.0
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+# Seconds an idle keep-alive connection is held open
+KEEPALIVE_TIMEOUT = 5
+
+MAX_HEADER_LINES = 64
+
+# Only bodies at least this large are worth gzipping
+GZIP_MIN_SIZE = 1024
+
+# Article fields in list responses; detail responses add DETAIL_FIELDS.
+# view_count is left out: it changes without invalidating the cache.
+LIST_FIELDS = ('id', 'slug', 'title', 'subtitle', 'excerpt', 'author', 'featured', 'hero_image',
+               'thumbnail_image', 'reading_time', 'published_at', 'updated_at', 'tags', 'categories')
+DETAIL_FIELDS = LIST_FIELDS + ('content', 'content_html', 'toc', 'ai_sources', 'meta_description',
+                               'meta_keywords')
+
+STATUS_REASONS = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+                  405: 'Method Not Allowed', 408: 'Request Timeout', 500: 'Internal Server Error'}
+
+
+class APIError(Exception):
+    """A client error answered with {"error": message}."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class Response:
+    """An encoded JSON response, shared between requests when cached."""
+
+    __slots__ = ('status', 'body', 'gzip_body', 'etag', 'article_id')
+
+    def __init__(self, status: int, document, article_id: Optional[int] = None):
+        self.status = status
+        self.body = json.dumps(document, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        self.gzip_body = gzip.compress(self.body, 6) if len(self.body) >= GZIP_MIN_SIZE else None
+        self.etag = '"' + hashlib.sha1(self.body).hexdigest()[:20] + '"'
+        # Detail responses count a view each time they are served
+        self.article_id = article_id
+
+
+def article_summary(article: Dict, fields=LIST_FIELDS) -> Dict:
+    summary = {field: article.get(field) for field in fields}
+    summary['url'] = f"/blog/{article['slug']}.html"
+    return summary
+
+
+class ArticleAPI:
+    """
+    Request routing and response building, independent of the transport.
+
+    handle() does blocking database work and is meant to run on a worker
+    thread.
+    """
+
+    def __init__(self, db: ArticleDatabase, cache_entries: int = CACHE_ENTRIES,
+                 cache_ttl: float = CACHE_TTL):
+        self.db = db
+        self.cache = FeedCache(db.pool, ttl=cache_ttl, max_entries=cache_entries)
+        # (route, has a slug) -> handler(params, slug)
+        self.routes = {
+            ('articles', False): self.list_articles,
+            ('articles', True): self.article_detail,
+            ('search', False): self.search,
+            ('tags', True): self.tag_articles,
+        }
+
+    def handle(self, path: str, query: str) -> Response:
+        """Answer one GET for path with the raw query string."""
+        parts = path.strip('/').split('/')
+        handler = None
+        if parts[0] == 'api' and len(parts) in (2, 3):
+            handler = self.routes.get((parts[1], len(parts) == 3))
+        if handler is None:
+            return Response(404, {'error': 'Not found'})
+        slug = urllib.parse.unquote(parts[2]) if len(parts) == 3 else None
+        params = {key: values[-1] for key, values in urllib.parse.parse_qs(query).items()}
+
+        key = path + '?' + urllib.parse.urlencode(sorted(params.items()))
+        try:
+            response = self.cache.get(key, lambda: handler(params, slug))
+        except APIError as e:
+            return Response(e.status, {'error': str(e)})
+
+        if response.article_id is not None and not self.db.read_only:
+            self.db.view_counter.record(response.article_id)
+        return response
+
+    def _limit(self, params: Dict) -> int:
+        try:
+            limit = int(params.get('limit', DEFAULT_LIMIT))
+        except ValueError:
+            raise APIError(400, "limit must be an integer")
+        if not 1 <= limit <= MAX_LIMIT:
+            raise APIError(400, f"limit must be between 1 and {MAX_LIMIT}")
+        return limit
+
+    def _page(self, params: Dict, **filters) -> Dict:
+        try:
+            page = self.db.get_articles_page(limit=self._limit(params), cursor=params.get('cursor'),
+                                             **filters)
+        except ValueError as e:
+            raise APIError(400, str(e))
+        return {
+            'articles': [article_summary(article) for article in page['articles']],
+            'next_cursor': page['next_cursor'],
+        }
+
+    def list_articles(self, params: Dict, slug: Optional[str] = None) -> Response:
+        return Response(200, self._page(params, category=params.get('category'), tag=params.get('tag')))
+
+    def article_detail(self, params: Dict, slug: str) -> Response:
+        article = self.db.get_article_by_slug(slug, record_view=False)
+        if article is None or article['status'] != 'published':
+            raise APIError(404, f"No published article {slug!r}")
+        self.db.attach_rendered_content([article])
+        return Response(200, article_summary(article, DETAIL_FIELDS), article_id=article['id'])
+
+    def search(self, params: Dict, slug: Optional[str] = None) -> Response:
+        query = params.get('q', '').strip()
+        if not query:
+            raise APIError(400, "q is required")
+        results = []
+        for article in self.db.search_articles(query, limit=self._limit(params)):
+            summary = article_summary(article)
+            summary['snippet'] = article['snippet']
+            results.append(summary)
+        return Response(200, {'query': query, 'results': results})
+
+    def tag_articles(self, params: Dict, slug: str) -> Response:
+        with self.db.read_connection() as conn:
+            tag = conn.execute(
+                "SELECT name, slug, description FROM tags WHERE slug = ?", (slug,)
+            ).fetchone()
+        if tag is None:
+            raise APIError(404, f"No tag {slug!r}")
+        document = {'tag': dict(tag)}
+        document.update(self._page(params, tag=slug))
+        return Response(200, document)
+
+
+class APIServer:
+    """Asyncio HTTP/1.1 front end for ArticleAPI with keep-alive."""
+
+    def __init__(self, api: ArticleAPI, workers: int = DEFAULT_WORKERS, quiet: bool = False):
+        self.api = api
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='reasonpath-api')
+        self.quiet = quiet
+        self.server = None
+        self.connections = {}  # handler task -> stream writer
+
+    async def start(self, host: str, port: int):
+        self.server = await asyncio.start_server(self.handle_connection, host, port)
+        return self.server
+
+    async def close(self):
+        """Stop accepting, let in-flight requests finish and close idle connections."""
+        if self.server is not None:
+            self.server.close()
+        # Closing the transport ends a handler waiting for its next request
+        for writer in self.connections.values():
+            writer.close()
+        await asyncio.gather(*self.connections, return_exceptions=True)
+        self.executor.shutdown(wait=True)
+
+    async def read_request(self, reader):
+        """Return (method, target, version, headers), or None when the client is done."""
+        try:
+            line = await asyncio.wait_for(reader.readline(), KEEPALIVE_TIMEOUT)
+        except asyncio.TimeoutError:
+            return None
+        if not line:
+            return None
+        parts = line.decode('latin-1').split()
+        if len(parts) != 3:
+            raise APIError(400, "Malformed request line")
+        try:
+            headers = await asyncio.wait_for(self.read_headers(reader), KEEPALIVE_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise APIError(408, "Timed out reading headers")
+        return parts[0], parts[1], parts[2], headers
+
+    async def read_headers(self, reader) -> Dict:
+        headers = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                return headers
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        raise APIError(400, "Too many headers")
+
+    async def handle_connection(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        self.connections[task] = writer
+        try:
+            while True:
+                try:
+                    request = await self.read_request(reader)
+                except APIError as e:
+                    await self.send(writer, Response(e.status, {'error': str(e)}), {}, 'GET', False)
+                    break
+                if request is None:
+                    break
+                method, target, version, headers = request
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+                # Request bodies are never read, so the stream can't be reused after one
+                if headers.get('content-length', '0') != '0' or 'transfer-encoding' in headers:
+                    keep_alive = False
+
+                start = time.perf_counter()
+                if method not in ('GET', 'HEAD'):
+                    response = Response(405, {'error': f"{method} not allowed"})
+                    keep_alive = False
+                else:
+                    path, _, query = target.partition('?')
+                    try:
+                        response = await loop.run_in_executor(self.executor, self.api.handle, path, query)
+                    except Exception as e:
+                        print(f"Error handling {target}: {e!r}")
+                        response = Response(500, {'error': 'Internal server error'})
+                await self.send(writer, response, headers, method, keep_alive)
+                if not self.quiet:
+                    print(f"{method} {target} {response.status} {(time.perf_counter() - start) * 1000:.1f}ms")
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connections.pop(task, None)
+            writer.close()
+
+    async def send(self, writer, response: Response, headers: Dict, method: str, keep_alive: bool):
+        status, body = response.status, response.body
+        extra = []
+        if status == 200:
+            extra.append(f"ETag: {response.etag}")
+            if response.etag in headers.get('if-none-match', ''):
+                status, body = 304, b''
+        if body and response.gzip_body is not None and 'gzip' in headers.get('accept-encoding', ''):
+            body = response.gzip_body
+            extra.append("Content-Encoding: gzip")
+        head = [
+            f"HTTP/1.1 {status} {STATUS_REASONS.get(status, '')}",
+            f"Date: {email.utils.formatdate(usegmt=True)}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(body)}",
+            "Cache-Control: no-cache",
+            "Vary: Accept-Encoding",
+            "Access-Control-Allow-Origin: *",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+            *extra,
+        ]
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1'))
+        if method != 'HEAD':
+            writer.write(body)
+        await writer.drain()
+
+
+async def serve(args):
+    db = ArticleDatabase(args.db, read_only=args.read_only)
+    api = ArticleAPI(db, cache_entries=args.cache_entries)
+    server = APIServer(api, workers=args.workers, quiet=args.quiet)
+    await server.start(args.bind, args.port)
+    print(f"✓ Article API on http://{args.bind}:{args.port}/api/articles ({args.workers} workers)")
+    metrics = None
+    if args.instrument or args.trace_sql:
+        instrumentation = db.instrument(sql=args.trace_sql, slow_query_ms=args.slow_query_ms,
+                                        slow_log_path=args.slow_log)
+        # Always local: the figures include raw SQL
+        metrics = MetricsServer(instrumentation, port=args.metrics_port).start()
+        print(f"✓ Database metrics on {metrics.url} (JSON at /metrics.json)")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            pass  # Windows: Ctrl+C raises KeyboardInterrupt instead
+    try:
+        await stop.wait()
+    finally:
+        await server.close()
+        if metrics is not None:
+            metrics.close()
+        db.close()
+        stats = api.cache.stats()
+        print(f"ℹ️  Stopped; response cache {stats['hits']:,} hits, {stats['misses']:,} misses")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the article JSON API")
+    parser.add_argument('--db', default="database/reasonpath.db", help="Path to the article database")
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--bind', default='127.0.0.1', help="Address to listen on")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="Database worker threads")
+    parser.add_argument('--cache-entries', type=int, default=CACHE_ENTRIES,
+                        help="Cached responses to keep (0 disables the cache)")
+    parser.add_argument('--read-only', action='store_true', help="Never write (views are not counted)")
+    parser.add_argument('--quiet', action='store_true', help="Don't log requests")
+    parser.add_argument('--instrument', action='store_true',
+                        help="Time database calls and serve the figures on --metrics-port")
+    parser.add_argument('--trace-sql', action='store_true',
+                        help="Also time every SQL statement (implies --instrument)")
+    parser.add_argument('--slow-query-ms', type=float, default=SLOW_QUERY_MS,
+                        help="Log statements at least this slow (with --trace-sql)")
+    parser.add_argument('--slow-log', help="Also append slow statements to this JSON-lines file")
+    parser.add_argument('--metrics-port', type=int, default=METRICS_PORT,
+                        help="Port for /metrics and /metrics.json on 127.0.0.1")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -4,43 +4,128 @@ Handles all SQLite operations for article management
 """
 
 import sqlite3
+import base64
+import html
 import json
 import os
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from itertools import islice
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 import re
 
+from connection_pool import ConnectionPool
+from dimension_cache import dimension_cache
+from feed_cache import FeedCache
+from instrumentation import SLOW_QUERY_MS, Instrumentation
+from markdown_renderer import content_hash, render_markdown
+from view_counter import ViewCounter
+
+# Schema shipped alongside this module, used when the database lives elsewhere
+DEFAULT_SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'schema.sql')
+
+# Each statistic in get_stats and the full-scan query that recomputes it
+STATS_QUERIES = {
+    'total_articles': "SELECT COUNT(*) FROM articles",
+    'published_articles': "SELECT COUNT(*) FROM articles WHERE status = 'published'",
+    'draft_articles': "SELECT COUNT(*) FROM articles WHERE status = 'draft'",
+    'total_views': "SELECT IFNULL(SUM(view_count), 0) FROM articles",
+    'total_tags': "SELECT COUNT(*) FROM tags",
+    'total_categories': "SELECT COUNT(*) FROM categories",
+}
+
+# Articles rendered per write transaction by render_all_content
+RENDER_BATCH_SIZE = 500
+
+# Methods timed and counted once instrument() is called
+INSTRUMENTED_METHODS = (
+    'create_article', 'bulk_create_articles', 'update_article', 'get_articles',
+    'get_articles_page', 'hydrate_articles', 'attach_rendered_content', 'render_all_content',
+    'get_article_by_slug', 'get_featured_articles', 'get_recent_articles',
+    'get_articles_by_category', 'get_articles_by_tag', 'search_articles',
+    'rebuild_search_index', 'get_stats', 'flush_views',
+)
+
 class ArticleDatabase:
-    def __init__(self, db_path: str = "database/reasonpath.db"):
-        """Initialize database connection and ensure schema exists."""
+    def __init__(self, db_path: str = "database/reasonpath.db", read_only: bool = False,
+                 pool_factory: Callable[..., ConnectionPool] = ConnectionPool):
+        """Initialize database connection and ensure schema exists.
+        
+        A read_only instance never writes: it skips schema setup and
+        does not count views. pool_factory(db_path, read_only=...) builds
+        the pool shared by every component; benchmarks pass their own.
+        """
         self.db_path = db_path
-        self.ensure_database()
+        self.read_only = read_only
+        self.pool = pool_factory(db_path, read_only=read_only)
+        self.view_counter = ViewCounter(self.pool)
+        self.feed_cache = FeedCache(self.pool)
+        self.dimensions = dimension_cache(db_path)
+        self.instrumentation: Optional[Instrumentation] = None
+        if not read_only:
+            self.ensure_database()
     
     def ensure_database(self):
         """Create database and tables if they don't exist."""
         # Create database directory if it doesn't exist
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        
-        # Connect and execute schema
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
         
         # Read and execute schema file
         schema_path = os.path.join(os.path.dirname(self.db_path), 'schema.sql')
+        if not os.path.exists(schema_path):
+            schema_path = DEFAULT_SCHEMA_PATH
         if os.path.exists(schema_path):
             with open(schema_path, 'r') as f:
                 schema = f.read()
+            with self.pool.writer() as conn:
                 conn.executescript(schema)
-        
-        conn.commit()
-        conn.close()
+                # Databases created before the search index get an empty one;
+                # fill it now, the update trigger fails on unindexed rows
+                if (conn.execute("SELECT EXISTS (SELECT 1 FROM articles)").fetchone()[0]
+                        and not conn.execute("SELECT EXISTS (SELECT 1 FROM articles_fts_docsize)").fetchone()[0]):
+                    conn.execute("INSERT INTO articles_fts (articles_fts) VALUES ('rebuild')")
     
     def get_connection(self):
-        """Get a database connection with row factory."""
+        """Get a standalone database connection with row factory."""
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
     
+    def read_connection(self):
+        """Context manager yielding this thread's pooled read connection."""
+        return self.pool.reader()
+    
+    def write_connection(self):
+        """Context manager yielding the shared write connection in a transaction."""
+        return self.pool.writer()
+    
+    def flush_views(self) -> int:
+        """Write buffered view counts now and return how many were written."""
+        return self.view_counter.flush()
+    
+    def instrument(self, sql: bool = False, slow_query_ms: float = SLOW_QUERY_MS,
+                   slow_log_path: str = None) -> Instrumentation:
+        """Start timing this database's methods (and every statement if sql is True).
+        
+        Returns the Instrumentation holding the figures; its disable()
+        restores the uninstrumented methods.
+        """
+        if self.instrumentation is None:
+            self.instrumentation = Instrumentation(self, INSTRUMENTED_METHODS)
+        self.instrumentation.slow_query_seconds = slow_query_ms / 1000
+        self.instrumentation.slow_log_path = slow_log_path
+        return self.instrumentation.enable(sql=sql)
+    
+    def close(self):
+        """Flush buffered views and close all pooled connections."""
+        self.view_counter.close()
+        self.pool.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
     def create_slug(self, title: str) -> str:
         """Generate URL-friendly slug from title."""
         slug = re.sub(r'[^\w\s-]', '', title.lower())
@@ -66,10 +151,9 @@ class ArticleDatabase:
                       meta_keywords: str = None,
                       status: str = 'draft') -> int:
         """Create a new article and return its ID."""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        try:
+        with self.pool.writer() as conn:
+            cursor = conn.cursor()
+            
             # Generate slug
             slug = self.create_slug(title)
             
@@ -104,159 +188,451 @@ class ArticleDatabase:
                   meta_description, meta_keywords, status, published_at))
             
             article_id = cursor.lastrowid
+            self._store_rendered_content(conn, [(article_id, content)])
             
-            # Add tags
+            # Tag and category ids come from the dimension cache; unknown
+            # tags are created in one statement
+            if tags or categories:
+                self.dimensions.refresh(conn)
             if tags:
-                for tag_name in tags:
-                    tag_slug = self.create_slug(tag_name)
-                    # Insert or get tag
-                    cursor.execute("""
-                        INSERT OR IGNORE INTO tags (name, slug) VALUES (?, ?)
-                    """, (tag_name, tag_slug))
-                    
-                    cursor.execute("SELECT id FROM tags WHERE slug = ?", (tag_slug,))
-                    tag_id = cursor.fetchone()['id']
-                    
-                    # Link to article
-                    cursor.execute("""
-                        INSERT INTO article_tags (article_id, tag_id) VALUES (?, ?)
-                    """, (article_id, tag_id))
+                self._link_tags(conn, article_id, tags)
             
-            # Add categories
+            # Add categories (unknown names are skipped)
             if categories:
-                for cat_name in categories:
-                    cursor.execute("SELECT id FROM categories WHERE name = ?", (cat_name,))
-                    cat = cursor.fetchone()
-                    if cat:
-                        cursor.execute("""
-                            INSERT INTO article_categories (article_id, category_id) 
-                            VALUES (?, ?)
-                        """, (article_id, cat['id']))
-            
-            conn.commit()
-            return article_id
-            
-        except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
-            conn.close()
+                cursor.executemany("""
+                    INSERT OR IGNORE INTO article_categories (article_id, category_id) 
+                    VALUES (?, ?)
+                """, [(article_id, category_id)
+                      for category_id in self.dimensions.category_ids(categories)])
+        
+        self.feed_cache.invalidate()
+        return article_id
     
-    def get_articles(self, 
-                    status: str = 'published',
-                    limit: int = 10,
-                    offset: int = 0,
-                    featured_only: bool = False,
-                    category: str = None,
-                    tag: str = None) -> List[Dict]:
-        """Fetch articles with filters."""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+    def _link_tags(self, conn: sqlite3.Connection, article_id: int, tag_names: List[str]):
+        """Link an article to tags by name, creating unknown tags (dimensions refreshed)."""
+        tags = {}
+        for tag_name in tag_names:
+            tags.setdefault(self.create_slug(tag_name), tag_name)
+        tag_ids = self.dimensions.resolve_tags(conn, tags)
+        conn.executemany(
+            "INSERT OR IGNORE INTO article_tags (article_id, tag_id) VALUES (?, ?)",
+            [(article_id, tag_ids[slug]) for slug in tags if slug in tag_ids]
+        )
+    
+    def bulk_create_articles(self,
+                             articles: Iterable[Dict],
+                             batch_size: int = 5000,
+                             on_batch: Callable[[int], None] = None) -> int:
+        """Create many articles efficiently and return how many were created.
+        
+        Each item takes the same keys as create_article, plus optional 'slug'
+        and 'published_at' to preserve values from an existing archive. The
+        input is consumed lazily, batch_size articles per transaction; slugs,
+        tags and categories are resolved for a whole batch at once.
+        on_batch, if given, is called with the running total after each batch.
+        """
+        created = 0
+        iterator = iter(articles)
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                break
+            with self.pool.writer() as conn:
+                self._insert_article_batch(conn, batch)
+            created += len(batch)
+            self.feed_cache.invalidate()
+            if on_batch:
+                on_batch(created)
+        
+        return created
+    
+    def _resolve_slugs(self, conn: sqlite3.Connection, bases: List[str]) -> List[str]:
+        """Pick a unique slug for each base, the same way create_article does."""
+        bases_json = json.dumps(sorted(set(bases)))
+        taken = {
+            row[0] for row in conn.execute(
+                "SELECT slug FROM articles WHERE slug IN (SELECT value FROM json_each(?))",
+                (bases_json,)
+            )
+        }
+        
+        # Only bases that collide need their numbered variants loaded
+        seen = set()
+        colliding = set()
+        for base in bases:
+            if base in taken or base in seen:
+                colliding.add(base)
+            seen.add(base)
+        for base in colliding:
+            taken.update(
+                row[0] for row in conn.execute(
+                    "SELECT slug FROM articles WHERE slug GLOB ?", (f"{base}-[0-9]*",)
+                )
+            )
         
-        query = """
-            SELECT DISTINCT a.* FROM articles a
-            LEFT JOIN article_categories ac ON a.id = ac.article_id
-            LEFT JOIN categories c ON ac.category_id = c.id
-            LEFT JOIN article_tags at ON a.id = at.article_id
-            LEFT JOIN tags t ON at.tag_id = t.id
-            WHERE a.status = ?
+        slugs = []
+        for base in bases:
+            slug = base
+            counter = 1
+            while slug in taken:
+                slug = f"{base}-{counter}"
+                counter += 1
+            taken.add(slug)
+            slugs.append(slug)
+        return slugs
+    
+    def _insert_article_batch(self, conn: sqlite3.Connection, batch: List[Dict]):
+        """Insert one batch of articles with their tags and categories."""
+        now = datetime.now()
+        slugs = self._resolve_slugs(
+            conn, [self.create_slug(item.get('slug') or item['title']) for item in batch]
+        )
+        
+        rows = []
+        for item, slug in zip(batch, slugs):
+            status = item.get('status', 'draft')
+            published_at = item.get('published_at')
+            if published_at is None and status == 'published':
+                published_at = now
+            ai_sources = item.get('ai_sources')
+            rows.append((
+                slug, item['title'], item.get('subtitle'), item.get('excerpt'),
+                item['content'], bool(item.get('featured', False)),
+                json.dumps(ai_sources) if ai_sources else None,
+                self.calculate_reading_time(item['content']),
+                item.get('meta_description'), item.get('meta_keywords'),
+                status, published_at
+            ))
+        
+        conn.executemany("""
+            INSERT INTO articles (
+                slug, title, subtitle, excerpt, content, 
+                featured, ai_sources, reading_time,
+                meta_description, meta_keywords, status, published_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+        
+        article_ids = {
+            row[1]: row[0] for row in conn.execute(
+                "SELECT id, slug FROM articles WHERE slug IN (SELECT value FROM json_each(?))",
+                (json.dumps(slugs),)
+            )
+        }
+        self._store_rendered_content(
+            conn, [(article_ids[slug], item['content']) for item, slug in zip(batch, slugs)]
+        )
+        
+        # Resolve every tag for the batch at once, creating only the unknown ones
+        tag_names = {}
+        for item in batch:
+            for tag_name in item.get('tags') or []:
+                tag_names.setdefault(self.create_slug(tag_name), tag_name)
+        self.dimensions.refresh(conn)
+        tag_ids = self.dimensions.resolve_tags(conn, tag_names) if tag_names else {}
+        category_ids = self.dimensions.categories_by_name
+        
+        tag_links = []
+        category_links = []
+        for item, slug in zip(batch, slugs):
+            article_id = article_ids[slug]
+            for tag_name in item.get('tags') or []:
+                tag_id = tag_ids.get(self.create_slug(tag_name))
+                if tag_id is not None:
+                    tag_links.append((article_id, tag_id))
+            for cat_name in item.get('categories') or []:
+                if cat_name in category_ids:
+                    category_links.append((article_id, category_ids[cat_name]))
+        
+        conn.executemany(
+            "INSERT OR IGNORE INTO article_tags (article_id, tag_id) VALUES (?, ?)",
+            tag_links
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO article_categories (article_id, category_id) VALUES (?, ?)",
+            category_links
+        )
+    
+    def _article_filters(self,
+                         status: str,
+                         featured_only: bool = False,
+                         category: str = None,
+                         tag: str = None) -> Tuple[str, List]:
+        """Build the WHERE clause shared by the article listing queries.
+        
+        Category and tag filters are EXISTS subqueries so the planner can walk
+        the (status, published_at, id) index instead of sorting a join.
         """
+        where = "WHERE a.status = ?"
         params = [status]
         
         if featured_only:
-            query += " AND a.featured = 1"
+            where += " AND a.featured = 1"
         
         if category:
-            query += " AND c.slug = ?"
+            where += """ AND EXISTS (
+                SELECT 1 FROM article_categories ac
+                JOIN categories c ON c.id = ac.category_id
+                WHERE ac.article_id = a.id AND c.slug = ?
+            )"""
             params.append(category)
         
         if tag:
-            query += " AND t.slug = ?"
+            where += """ AND EXISTS (
+                SELECT 1 FROM article_tags at
+                JOIN tags t ON t.id = at.tag_id
+                WHERE at.article_id = a.id AND t.slug = ?
+            )"""
             params.append(tag)
         
-        query += " ORDER BY a.published_at DESC LIMIT ? OFFSET ?"
+        return where, params
+    
+    def get_articles(self, 
+                    status: str = 'published',
+                    limit: int = 10,
+                    offset: int = 0,
+                    featured_only: bool = False,
+                    category: str = None,
+                    tag: str = None) -> List[Dict]:
+        """Fetch articles with filters."""
+        where, params = self._article_filters(status, featured_only, category, tag)
+        query = f"""
+            SELECT a.* FROM articles a
+            {where}
+            ORDER BY a.published_at DESC, a.id DESC LIMIT ? OFFSET ?
+        """
         params.extend([limit, offset])
         
-        cursor.execute(query, params)
-        articles = []
-        
-        for row in cursor.fetchall():
-            article = dict(row)
-            
-            # Get tags for this article
-            cursor.execute("""
-                SELECT t.name, t.slug FROM tags t
-                JOIN article_tags at ON t.id = at.tag_id
-                WHERE at.article_id = ?
-            """, (article['id'],))
-            article['tags'] = [dict(tag) for tag in cursor.fetchall()]
-            
-            # Get categories
-            cursor.execute("""
-                SELECT c.name, c.slug FROM categories c
-                JOIN article_categories ac ON c.id = ac.category_id
-                WHERE ac.article_id = ?
-            """, (article['id'],))
-            article['categories'] = [dict(cat) for cat in cursor.fetchall()]
+        with self.pool.reader() as conn:
+            rows = conn.execute(query, params).fetchall()
+            return self._hydrate_rows(conn, rows)
+    
+    def encode_cursor(self, article: Dict) -> str:
+        """Encode an article's sort position as an opaque pagination cursor."""
+        position = json.dumps([article['published_at'], article['id']], separators=(',', ':'))
+        return base64.urlsafe_b64encode(position.encode()).decode().rstrip('=')
+    
+    def decode_cursor(self, cursor: str) -> Tuple[Optional[str], int]:
+        """Decode a cursor from encode_cursor into (published_at, id)."""
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            published_at, article_id = json.loads(base64.urlsafe_b64decode(padded))
+            if not isinstance(article_id, int):
+                raise ValueError
+            return published_at, article_id
+        except (ValueError, TypeError):
+            raise ValueError(f"Invalid pagination cursor: {cursor!r}")
+    
+    def get_articles_page(self,
+                          status: str = 'published',
+                          limit: int = 10,
+                          cursor: str = None,
+                          featured_only: bool = False,
+                          category: str = None,
+                          tag: str = None) -> Dict:
+        """Fetch one page of articles using keyset (cursor) pagination.
+        
+        Returns {'articles': [...], 'next_cursor': str or None}. Pass
+        next_cursor back to get the following page; every page costs the same
+        as the first because it seeks straight to the cursor position.
+        """
+        where, params = self._article_filters(status, featured_only, category, tag)
+        order = "ORDER BY a.published_at DESC, a.id DESC LIMIT ?"
+        
+        with self.pool.reader() as conn:
+            if cursor is None:
+                rows = conn.execute(
+                    f"SELECT a.* FROM articles a {where} {order}",
+                    params + [limit + 1]
+                ).fetchall()
+            else:
+                published_at, article_id = self.decode_cursor(cursor)
+                rows = []
+                if published_at is not None:
+                    rows = conn.execute(
+                        f"SELECT a.* FROM articles a {where} "
+                        f"AND (a.published_at, a.id) < (?, ?) {order}",
+                        params + [published_at, article_id, limit + 1]
+                    ).fetchall()
+                    # Unpublished rows (NULL published_at) sort after all dated ones
+                    article_id = None
+                if len(rows) <= limit:
+                    null_where = where + " AND a.published_at IS NULL"
+                    null_params = list(params)
+                    if article_id is not None:
+                        null_where += " AND a.id < ?"
+                        null_params.append(article_id)
+                    rows += conn.execute(
+                        f"SELECT a.* FROM articles a {null_where} ORDER BY a.id DESC LIMIT ?",
+                        null_params + [limit + 1 - len(rows)]
+                    ).fetchall()
             
-            # Parse AI sources
+            articles = self._hydrate_rows(conn, rows[:limit])
+        
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = self.encode_cursor(articles[-1])
+        return {'articles': articles, 'next_cursor': next_cursor}
+    
+    def _hydrate_rows(self, conn: sqlite3.Connection, rows) -> List[Dict]:
+        """Turn article rows into dicts with tags, categories and parsed AI sources.
+        
+        Tags and categories for the whole page are loaded with one query each,
+        regardless of how many rows are passed in.
+        """
+        articles = [dict(row) for row in rows]
+        if not articles:
+            return articles
+        
+        by_id = {}
+        for article in articles:
+            article['tags'] = []
+            article['categories'] = []
+            by_id[article['id']] = article
+        ids_json = json.dumps(list(by_id))
+        
+        # Plain tuples are much cheaper than sqlite3.Row for these wide joins
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        
+        # Only the link ids are read; names and slugs come from the dimension cache
+        self.dimensions.refresh(conn)
+        
+        # Get tags for every article on the page
+        links = cursor.execute("""
+            SELECT article_id, tag_id FROM article_tags
+            WHERE article_id IN (SELECT value FROM json_each(?))
+        """, (ids_json,)).fetchall()
+        names = self.dimensions.tag_names(conn, {tag_id for _, tag_id in links})
+        for article_id, tag_id in links:
+            if tag_id in names:
+                name, slug = names[tag_id]
+                by_id[article_id]['tags'].append({'name': name, 'slug': slug})
+        
+        # Get categories
+        links = cursor.execute("""
+            SELECT article_id, category_id FROM article_categories
+            WHERE article_id IN (SELECT value FROM json_each(?))
+        """, (ids_json,)).fetchall()
+        names = self.dimensions.category_names(conn, {category_id for _, category_id in links})
+        for article_id, category_id in links:
+            if category_id in names:
+                name, slug = names[category_id]
+                by_id[article_id]['categories'].append({'name': name, 'slug': slug})
+        
+        # Parse AI sources
+        for article in articles:
             if article['ai_sources']:
                 article['ai_sources'] = json.loads(article['ai_sources'])
-            
-            articles.append(article)
         
-        conn.close()
         return articles
     
-    def get_article_by_slug(self, slug: str) -> Optional[Dict]:
-        """Fetch a single article by its slug."""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT * FROM articles WHERE slug = ?", (slug,))
-        row = cursor.fetchone()
+    def hydrate_articles(self, article_ids: List[int]) -> List[Dict]:
+        """Fetch fully hydrated articles for the given IDs, in the same order.
         
-        if not row:
-            conn.close()
-            return None
+        Unknown IDs are skipped.
+        """
+        ids_json = json.dumps(list(article_ids))
+        with self.pool.reader() as conn:
+            rows = conn.execute("""
+                SELECT a.* FROM articles a
+                JOIN json_each(?) j ON j.value = a.id
+                ORDER BY j.key
+            """, (ids_json,)).fetchall()
+            return self._hydrate_rows(conn, rows)
+    
+    def attach_rendered_content(self, articles: List[Dict]) -> List[Dict]:
+        """Add content_html and toc to hydrated articles, in place.
         
-        article = dict(row)
+        Stored renders are used when their hash matches the article's
+        content; anything else (never rendered, or content edited outside
+        update_article) is rendered here without being stored.
+        """
+        ids_json = json.dumps([article['id'] for article in articles])
+        with self.pool.reader() as conn:
+            stored = {
+                row[0]: row[1:] for row in conn.execute("""
+                    SELECT article_id, content_hash, html, toc FROM article_html
+                    WHERE article_id IN (SELECT value FROM json_each(?))
+                """, (ids_json,))
+            }
+        for article in articles:
+            row = stored.get(article['id'])
+            if row and row[0] == content_hash(article['content']):
+                article['content_html'], article['toc'] = row[1], json.loads(row[2])
+            else:
+                article['content_html'], article['toc'] = render_markdown(article['content'])
+        return articles
+    
+    def _store_rendered_content(self, conn: sqlite3.Connection,
+                                items: List[Tuple[int, str]]) -> int:
+        """Render and store each (article_id, content) whose stored hash differs.
         
-        # Increment view count
-        cursor.execute("""
-            UPDATE articles SET view_count = view_count + 1 WHERE id = ?
-        """, (article['id'],))
+        Returns how many were rendered.
+        """
+        hashes = [(article_id, content, content_hash(content)) for article_id, content in items]
+        stored = dict(conn.execute("""
+            SELECT article_id, content_hash FROM article_html
+            WHERE article_id IN (SELECT value FROM json_each(?))
+        """, (json.dumps([article_id for article_id, _ in items]),)).fetchall())
+        
+        rows = []
+        for article_id, content, digest in hashes:
+            if stored.get(article_id) != digest:
+                rendered, toc = render_markdown(content)
+                rows.append((article_id, digest, rendered, json.dumps(toc, separators=(',', ':'))))
+        conn.executemany("""
+            INSERT OR REPLACE INTO article_html (article_id, content_hash, html, toc)
+            VALUES (?, ?, ?, ?)
+        """, rows)
+        return len(rows)
+    
+    def render_all_content(self, force: bool = False) -> Dict:
+        """Render every article whose stored render is missing or stale.
         
-        # Get tags
-        cursor.execute("""
-            SELECT t.name, t.slug FROM tags t
-            JOIN article_tags at ON t.id = at.tag_id
-            WHERE at.article_id = ?
-        """, (article['id'],))
-        article['tags'] = [dict(tag) for tag in cursor.fetchall()]
+        force re-renders everything. Returns {'rendered', 'unchanged'}.
+        """
+        if force:
+            with self.pool.writer() as conn:
+                conn.execute("DELETE FROM article_html")
+        
+        rendered = total = 0
+        last_id = 0
+        while True:
+            with self.pool.writer() as conn:
+                items = [tuple(row) for row in conn.execute(
+                    "SELECT id, content FROM articles WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, RENDER_BATCH_SIZE)
+                )]
+                if not items:
+                    break
+                rendered += self._store_rendered_content(conn, items)
+            total += len(items)
+            last_id = items[-1][0]
+        return {'rendered': rendered, 'unchanged': total - rendered}
+    
+    def get_article_by_slug(self, slug: str, record_view: bool = True) -> Optional[Dict]:
+        """Fetch a single article by its slug.
         
-        # Get categories
-        cursor.execute("""
-            SELECT c.name, c.slug FROM categories c
-            JOIN article_categories ac ON c.id = ac.category_id
-            WHERE ac.article_id = ?
-        """, (article['id'],))
-        article['categories'] = [dict(cat) for cat in cursor.fetchall()]
+        Counts a view unless record_view is False (callers serving the
+        article from a cache record views themselves).
+        """
+        with self.pool.reader() as conn:
+            rows = conn.execute("SELECT * FROM articles WHERE slug = ?", (slug,)).fetchall()
+            if not rows:
+                return None
+            article = self._hydrate_rows(conn, rows)[0]
         
-        # Parse AI sources
-        if article['ai_sources']:
-            article['ai_sources'] = json.loads(article['ai_sources'])
+        # Count the view; it is written in the next batched flush
+        if record_view and not self.read_only:
+            self.view_counter.record(article['id'])
         
-        conn.commit()
-        conn.close()
         return article
     
     def update_article(self, article_id: int, **kwargs) -> bool:
         """Update an existing article."""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        try:
+        with self.pool.writer() as conn:
+            cursor = conn.cursor()
+            
             # Build update query
             updates = []
             values = []
@@ -274,8 +650,9 @@ class ArticleDatabase:
             if not updates:
                 return False
             
-            # Add updated_at
-            updates.append("updated_at = CURRENT_TIMESTAMP")
+            # Add updated_at (millisecond precision so the site builder sees
+            # every edit, even several within the same second)
+            updates.append("updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now')")
             
             # If status changed to published, set published_at
             if 'status' in kwargs and kwargs['status'] == 'published':
@@ -291,33 +668,22 @@ class ArticleDatabase:
             values.append(article_id)
             cursor.execute(query, values)
             
+            # Re-render only if the Markdown actually changed
+            if 'content' in kwargs:
+                self._store_rendered_content(conn, [(article_id, kwargs['content'])])
+            
             # Update tags if provided
             if 'tags' in kwargs:
                 # Remove existing tags
                 cursor.execute("DELETE FROM article_tags WHERE article_id = ?", (article_id,))
                 
                 # Add new tags
-                for tag_name in kwargs['tags']:
-                    tag_slug = self.create_slug(tag_name)
-                    cursor.execute("""
-                        INSERT OR IGNORE INTO tags (name, slug) VALUES (?, ?)
-                    """, (tag_name, tag_slug))
-                    
-                    cursor.execute("SELECT id FROM tags WHERE slug = ?", (tag_slug,))
-                    tag_id = cursor.fetchone()['id']
-                    
-                    cursor.execute("""
-                        INSERT INTO article_tags (article_id, tag_id) VALUES (?, ?)
-                    """, (article_id, tag_id))
-            
-            conn.commit()
-            return True
-            
-        except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
-            conn.close()
+                if kwargs['tags']:
+                    self.dimensions.refresh(conn)
+                    self._link_tags(conn, article_id, kwargs['tags'])
+        
+        self.feed_cache.invalidate()
+        return True
     
     def get_featured_articles(self, limit: int = 3) -> List[Dict]:
         """Get featured articles for homepage."""
@@ -335,61 +701,114 @@ class ArticleDatabase:
         """Get articles with a specific tag."""
         return self.get_articles(tag=tag_slug, limit=limit)
     
-    def search_articles(self, query: str, limit: int = 20) -> List[Dict]:
-        """Search articles by title, excerpt, or content."""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+    def build_search_query(self, query: str) -> str:
+        """Translate user search input into an FTS5 MATCH expression.
         
-        cursor.execute("""
-            SELECT * FROM articles 
-            WHERE status = 'published' 
-            AND (title LIKE ? OR excerpt LIKE ? OR content LIKE ?)
-            ORDER BY published_at DESC
-            LIMIT ?
-        """, (f'%{query}%', f'%{query}%', f'%{query}%', limit))
-        
-        articles = []
-        for row in cursor.fetchall():
-            article = dict(row)
-            if article['ai_sources']:
-                article['ai_sources'] = json.loads(article['ai_sources'])
-            articles.append(article)
+        Words are matched as terms (all must appear), "quoted text" as a
+        phrase, and a trailing * turns a word into a prefix search. Every
+        term is quoted so FTS5 operators in user input are never interpreted.
+        """
+        terms = []
+        for phrase, word in re.findall(r'"([^"]*)"|(\S+)', query):
+            if phrase:
+                words = re.findall(r'\w+', phrase)
+                if words:
+                    terms.append('"' + ' '.join(words) + '"')
+                continue
+            parts = [f'"{part}"' for part in re.findall(r'\w+', word)]
+            if parts and word.endswith('*'):
+                parts[-1] += '*'
+            terms.extend(parts)
+        return ' '.join(terms)
+    
+    def search_articles(self, query: str, limit: int = 20) -> List[Dict]:
+        """Search published articles by title, excerpt, or content.
         
-        conn.close()
+        Results are ranked by BM25 (title matches weigh most) and carry a
+        'snippet' of the best matching passage with <mark> highlights.
+        """
+        match = self.build_search_query(query)
+        if not match:
+            return []
+        
+        with self.pool.reader() as conn:
+            cursor = conn.execute("""
+                SELECT a.*,
+                       snippet(articles_fts, -1, char(2), char(3), '…', 16) AS snippet
+                FROM articles_fts
+                JOIN articles a ON a.id = articles_fts.rowid
+                WHERE articles_fts MATCH ?
+                AND a.status = 'published'
+                ORDER BY bm25(articles_fts, 10.0, 4.0, 1.0)
+                LIMIT ?
+            """, (match, limit))
+            articles = self._hydrate_rows(conn, cursor.fetchall())
+        
+        for article in articles:
+            article['snippet'] = (
+                html.escape(article['snippet'] or '')
+                .replace('\x02', '<mark>')
+                .replace('\x03', '</mark>')
+            )
         return articles
     
-    def get_stats(self) -> Dict:
-        """Get database statistics."""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        stats = {}
-        
-        # Total articles
-        cursor.execute("SELECT COUNT(*) as count FROM articles")
-        stats['total_articles'] = cursor.fetchone()['count']
-        
-        # Published articles
-        cursor.execute("SELECT COUNT(*) as count FROM articles WHERE status = 'published'")
-        stats['published_articles'] = cursor.fetchone()['count']
-        
-        # Draft articles
-        cursor.execute("SELECT COUNT(*) as count FROM articles WHERE status = 'draft'")
-        stats['draft_articles'] = cursor.fetchone()['count']
-        
-        # Total views
-        cursor.execute("SELECT SUM(view_count) as total FROM articles")
-        stats['total_views'] = cursor.fetchone()['total'] or 0
-        
-        # Total tags
-        cursor.execute("SELECT COUNT(*) as count FROM tags")
-        stats['total_tags'] = cursor.fetchone()['count']
+    def rebuild_search_index(self):
+        """Rebuild the full-text index from the articles table.
         
-        # Total categories
-        cursor.execute("SELECT COUNT(*) as count FROM categories")
-        stats['total_categories'] = cursor.fetchone()['count']
+        ensure_database fills an empty index on its own; this repairs one
+        that drifted, e.g. after rows were changed with triggers disabled.
+        """
+        with self.pool.writer() as conn:
+            conn.execute("INSERT INTO articles_fts (articles_fts) VALUES ('rebuild')")
+            conn.execute("INSERT INTO articles_fts (articles_fts) VALUES ('optimize')")
+    
+    def get_stats(self) -> Dict:
+        """Get database statistics.
         
-        conn.close()
+        Read from the trigger-maintained site_stats row; databases without
+        it (opened read-only before the table existed) are counted instead.
+        """
+        with self.pool.reader() as conn:
+            try:
+                row = conn.execute(f"""
+                    SELECT {', '.join(STATS_QUERIES)} FROM site_stats WHERE id = 1
+                """).fetchone()
+            except sqlite3.OperationalError:
+                row = None
+        
+        if row is None:
+            return self.count_stats()
+        return dict(row)
+    
+    def count_stats(self) -> Dict:
+        """Compute the statistics from the tables themselves (full scans)."""
+        with self.pool.reader() as conn:
+            return {
+                key: conn.execute(query).fetchone()[0]
+                for key, query in STATS_QUERIES.items()
+            }
+    
+    def verify_stats(self) -> Dict[str, Tuple[int, int]]:
+        """Return {counter: (stored, actual)} for every counter that has drifted."""
+        stored = self.get_stats()
+        actual = self.count_stats()
+        return {
+            key: (stored[key], actual[key])
+            for key in STATS_QUERIES
+            if stored[key] != actual[key]
+        }
+    
+    def rebuild_stats(self) -> Dict:
+        """Recount every statistic into site_stats and return the new values."""
+        with self.pool.writer() as conn:
+            stats = {
+                key: conn.execute(query).fetchone()[0]
+                for key, query in STATS_QUERIES.items()
+            }
+            conn.execute(f"""
+                INSERT OR REPLACE INTO site_stats (id, {', '.join(stats)})
+                VALUES (1, {', '.join('?' * len(stats))})
+            """, list(stats.values()))
         return stats
 
 
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+"""
+Article API load test
+p50/p99 latency of the list, detail and search endpoints against targets
+
+Usage: python database/benchmarks/bench_api.py [--articles 20000] [--concurrency 16] [--duration 5]
+
+Seeds a throwaway database, starts database/api_server.py on it in a
+separate process and drives each endpoint class with keep-alive asyncio
+clients, first with a warmed response cache and then without it. Exits
+with status 1 if a cached p99 misses its target.
+"""
+
+import argparse
+import asyncio
+import http.client
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+from common import DATABASE_DIR, WORDS, print_table, seed_database, temp_db_path
+
+sys.path.insert(0, os.path.join(os.path.dirname(DATABASE_DIR), 'scripts'))
+from load_test_server import client, free_port, percentile  # noqa: E402
+
+# Default p99 targets in milliseconds, with the response cache on
+TARGETS = {'list': 25.0, 'detail': 25.0, 'search': 50.0}
+
+
+def endpoint_paths(slugs, tags, rng):
+    """A few hundred request paths per endpoint class, in random order."""
+    paths = {
+        'list': [f"/api/articles?limit={rng.choice((10, 20))}" for _ in range(10)]
+                + [f"/api/tags/{tag}?limit=10" for tag in tags[:40]],
+        'detail': [f"/api/articles/{slug}" for slug in rng.sample(slugs, min(500, len(slugs)))],
+        'search': [f"/api/search?q={rng.choice(WORDS)}+{rng.choice(WORDS)}&limit=10" for _ in range(200)],
+    }
+    for values in paths.values():
+        rng.shuffle(values)
+    return paths
+
+
+def start_server(db_path: str, port: int, cache_entries: int) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(DATABASE_DIR, 'api_server.py'), '--db', db_path,
+         '--port', str(port), '--cache-entries', str(cache_entries), '--quiet'],
+        stdout=subprocess.DEVNULL
+    )
+    for _ in range(100):
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.1).close()
+            return process
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("api_server.py did not start")
+
+
+def warm(port, paths):
+    """Request every path once so the measured run sees the cache's steady state."""
+    conn = http.client.HTTPConnection('127.0.0.1', port)
+    try:
+        for path in paths:
+            conn.request('GET', path)
+            conn.getresponse().read()
+    finally:
+        conn.close()
+
+
+async def run(port, paths, concurrency, duration):
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        # Each client starts at a different offset in the path list
+        client('127.0.0.1', port, paths[i:] + paths[:i], 'Accept-Encoding: gzip\r\n',
+               deadline, latencies, errors)
+        for i in range(concurrency)
+    ))
+    return latencies, errors, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--articles', type=int, default=20000)
+    parser.add_argument('--concurrency', type=int, default=16, help="Keep-alive connections")
+    parser.add_argument('--duration', type=float, default=5.0, help="Seconds per endpoint and cache mode")
+    for name, target in TARGETS.items():
+        parser.add_argument(f'--p99-{name}', type=float, default=target, help=f"p99 target for {name} (ms)")
+    args = parser.parse_args()
+
+    db_path = temp_db_path()
+    with seed_database(db_path, args.articles, content_words=200) as db:
+        with db.read_connection() as conn:
+            slugs = [row[0] for row in conn.execute("SELECT slug FROM articles WHERE status = 'published'")]
+            tags = [row[0] for row in conn.execute("SELECT slug FROM tags ORDER BY id")]
+    paths = endpoint_paths(slugs, tags, random.Random(42))
+
+    results = []
+    missed = []
+    for cache_entries in (4096, 0):
+        port = free_port()
+        process = start_server(db_path, port, cache_entries)
+        try:
+            for name, endpoint in paths.items():
+                if cache_entries:
+                    warm(port, endpoint)
+                latencies, errors, elapsed = asyncio.run(run(port, endpoint, args.concurrency, args.duration))
+                p99 = percentile(latencies, 0.99) * 1000
+                target = getattr(args, f'p99_{name}')
+                ok = p99 <= target
+                if cache_entries and not ok:
+                    missed.append(name)
+                results.append((name, 'on' if cache_entries else 'off', f"{len(latencies) / elapsed:,.0f}",
+                                f"{percentile(latencies, 0.50) * 1000:.2f}", f"{p99:.2f}",
+                                f"{target:.0f}" + ('' if ok else ' ✗'), len(errors)))
+        finally:
+            process.send_signal(signal.SIGINT)
+            process.wait(timeout=30)
+
+    print(f"{args.articles:,} articles, {args.concurrency} connections, {args.duration:.0f}s per row")
+    print_table(("endpoint", "cache", "req/s", "p50 ms", "p99 ms", "p99 target", "errors"), results)
+    if missed:
+        print(f"✗ p99 target missed with the cache on: {', '.join(missed)}")
+        sys.exit(1)
+    print("✓ All cached p99 targets met")
+
+
+if __name__ == "__main__":
+    main()
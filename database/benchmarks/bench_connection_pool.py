@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""
+Connection pool benchmark
+Compares requests/sec of pooled connections against connect-per-call
+
+Usage: python database/benchmarks/bench_connection_pool.py [--articles N] [--threads N]
+"""
+
+import argparse
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from common import print_table, seed_database, temp_db_path
+from article_manager import ArticleDatabase
+from connection_pool import ConnectionPool
+
+
+class ConnectPerCallPool:
+    """Mimics the old behaviour: a fresh sqlite3.connect for every call."""
+
+    def __init__(self, db_path: str, read_only: bool = False):
+        self.db_path = db_path
+
+    @contextmanager
+    def _connection(self, commit: bool):
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+            if commit:
+                conn.commit()
+        finally:
+            conn.close()
+
+    def reader(self):
+        return self._connection(commit=False)
+
+    def writer(self):
+        return self._connection(commit=True)
+
+    def close(self):
+        pass
+
+
+def run_workload(db: ArticleDatabase, slugs, threads: int, duration: float) -> float:
+    """Hammer the read API from several threads and return requests/sec."""
+    counts = [0] * threads
+    stop = time.perf_counter() + duration
+
+    def worker(index):
+        i = index
+        while time.perf_counter() < stop:
+            db.get_recent_articles(limit=10)
+            db.get_article_by_slug(slugs[i % len(slugs)])
+            db.get_stats()
+            counts[index] += 3
+            i += threads
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return sum(counts) / duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--articles', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=3.0)
+    args = parser.parse_args()
+
+    db_path = temp_db_path()
+    seed_database(db_path, args.articles).close()
+    slugs = [f"bench-article-{i}" for i in range(1, args.articles + 1)]
+
+    results = []
+    for label, pool_factory in (("connect-per-call", ConnectPerCallPool), ("pooled", ConnectionPool)):
+        for threads in sorted({1, args.threads}):
+            db = ArticleDatabase(db_path, pool_factory=pool_factory)
+            rps = run_workload(db, slugs, threads, args.duration)
+            db.close()
+            results.append((label, threads, f"{rps:,.0f}"))
+
+    print(f"Seeded {args.articles} articles at {db_path}\n")
+    print_table(("mode", "threads", "requests/sec"), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""
+Dimension cache benchmark
+Statements and wall time per create_article, cached ids vs per-tag lookups
+
+Usage: python database/benchmarks/bench_dimension_cache.py [--articles 20000] [--creates 500]
+"""
+
+import argparse
+import random
+
+from common import count_queries, print_table, seed_database, temp_db_path, timeit
+
+# Typical article shape: five tags, two categories
+CATEGORIES = ['Research', 'Analysis']
+
+
+def legacy_link(conn, db, article_id, tags, categories):
+    """The original create_article loops: INSERT OR IGNORE + SELECT per tag, SELECT per category."""
+    cursor = conn.cursor()
+    for tag_name in tags:
+        tag_slug = db.create_slug(tag_name)
+        cursor.execute("INSERT OR IGNORE INTO tags (name, slug) VALUES (?, ?)", (tag_name, tag_slug))
+        cursor.execute("SELECT id FROM tags WHERE slug = ?", (tag_slug,))
+        tag_id = cursor.fetchone()['id']
+        cursor.execute("INSERT INTO article_tags (article_id, tag_id) VALUES (?, ?)", (article_id, tag_id))
+    for cat_name in categories:
+        cursor.execute("SELECT id FROM categories WHERE name = ?", (cat_name,))
+        cat = cursor.fetchone()
+        if cat:
+            cursor.execute("INSERT INTO article_categories (article_id, category_id) VALUES (?, ?)",
+                           (article_id, cat['id']))
+
+
+def legacy_create(db, title, tags, categories):
+    with db.pool.writer() as conn:
+        article_id = db.create_article(title=title, content="Body", status='published')
+        legacy_link(conn, db, article_id, tags, categories)
+
+
+def cached_create(db, title, tags, categories):
+    db.create_article(title=title, content="Body", tags=tags, categories=categories, status='published')
+
+
+def statements(db, create, title, tags):
+    """SQL statements issued by one create, not counting trigger and FTS internals."""
+    with db.pool.writer() as conn:
+        with count_queries(conn) as executed:
+            create(db, title, tags, CATEGORIES)
+    # The trace callback repeats a statement once per trigger step it runs
+    issued = [sql for sql in executed if not sql.lstrip().startswith('--')]
+    return sum(1 for i, sql in enumerate(issued) if i == 0 or sql != issued[i - 1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--articles', type=int, default=20000)
+    parser.add_argument('--creates', type=int, default=500, help="Articles created per row")
+    args = parser.parse_args()
+
+    db = seed_database(temp_db_path(), args.articles, tags=500)
+    rng = random.Random(42)
+    known = [f"Topic {i}" for i in range(500)]
+    serial = iter(range(10 ** 9))
+
+    def known_tags():
+        return rng.sample(known, 5)
+
+    def new_tags():
+        n = next(serial)
+        return [f"Fresh {n} {i}" for i in range(5)]
+
+    results = []
+    for label, make_tags in (("5 existing tags", known_tags), ("5 new tags", new_tags)):
+        for name, create in (("per-tag lookups", legacy_create), ("dimension cache", cached_create)):
+            count = statements(db, create, f"Probe {next(serial)}", make_tags())
+            elapsed = timeit(lambda: create(db, f"Bench {next(serial)}", make_tags(), CATEGORIES), args.creates)
+            results.append((label, name, count, f"{elapsed * 1e6:.0f}"))
+
+    print(f"{args.articles:,} articles, 500 tags, {len(CATEGORIES)} categories per create")
+    print_table(("tags", "write path", "statements", "µs per create"), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+"""
+Feed cache benchmark
+Homepage fragment cost with and without the revision-keyed feed cache
+
+Usage: python database/benchmarks/bench_feed_cache.py [--sizes 1000,10000,100000]
+"""
+
+import argparse
+
+from common import count_queries, print_table, seed_database, temp_db_path, timeit
+
+from feed_generator import generate_article_feed_html, render_article_feed
+
+
+def uncached_feed(db):
+    return render_article_feed(db.get_featured_articles(limit=1), db.get_recent_articles(limit=9))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='1000,10000,100000',
+                        help="Comma-separated archive sizes to measure")
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    results = []
+    for size in sorted(int(s) for s in args.sizes.split(',')):
+        with seed_database(temp_db_path(), size, content_words=60) as db:
+            uncached_ms = timeit(lambda: uncached_feed(db), args.repeat) * 1000
+            generate_article_feed_html(db)
+            hit_ms = timeit(lambda: generate_article_feed_html(db), args.repeat) * 1000
+            with db.read_connection() as conn, count_queries(conn) as statements:
+                generate_article_feed_html(db)
+
+            # View counting must not invalidate the cache
+            article_id = db.get_recent_articles(limit=1)[0]['id']
+            db.view_counter.record(article_id, 10)
+            db.flush_views()
+            before = db.feed_cache.stats()['misses']
+            generate_article_feed_html(db)
+            views_invalidate = db.feed_cache.stats()['misses'] > before
+
+            # An edit does, and the next request pays for one rebuild
+            db.update_article(article_id, excerpt="A fresh excerpt")
+            rebuild_ms = timeit(lambda: generate_article_feed_html(db)) * 1000
+            stats = db.feed_cache.stats()
+
+        results.append((size, f"{uncached_ms:.2f}", f"{hit_ms * 1000:.0f}", len(statements),
+                        f"{rebuild_ms:.2f}", 'yes' if views_invalidate else 'no',
+                        f"{stats['hits']}/{stats['misses']}"))
+
+    print_table(("articles", "uncached ms", "cache hit µs", "queries per hit", "after edit ms",
+                 "views invalidate", "hits/misses"), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""
+Glossary benchmark
+Import, indexed lookups, FTS search and change-aware export as the dictionary grows
+
+Usage: python database/benchmarks/bench_glossary.py [--sizes 1000,10000,100000]
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+
+from common import lorem, print_table, temp_db_path, timeit
+
+from article_manager import ArticleDatabase
+from glossary_manager import GlossaryDatabase
+
+CATEGORIES = ['Core Concepts', 'Model Types', 'Training Techniques', 'AI Safety & Ethics',
+              'Evaluation', 'Model Architecture', 'Data Science', 'Inference']
+DIFFICULTIES = ['Beginner', 'Intermediate', 'Advanced']
+
+
+def synthetic_terms(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    return [{
+        'id': f"term-{i}",
+        'term': f"{lorem(rng, 2).title()} {i}",
+        'category': rng.choice(CATEGORIES),
+        'difficulty': rng.choice(DIFFICULTIES),
+        'definition': lorem(rng, 35),
+        'analogy': lorem(rng, 20),
+        'example': lorem(rng, 12),
+        'related': [f"term-{rng.randrange(count)}" for _ in range(3)],
+    } for i in range(count)]
+
+
+def json_category_page(data: bytes, category: str):
+    """The flat-file path: parse the whole dictionary and filter it."""
+    terms = json.loads(data)
+    return [term for term in terms if term['category'] == category][:10]
+
+
+def json_search(data: bytes, query: str):
+    terms = json.loads(data)
+    return [term for term in terms
+            if query in term['term'].lower() or query in term['definition'].lower()][:20]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='1000,10000,100000',
+                        help="Comma-separated dictionary sizes to measure")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    results = []
+    for size in sorted(int(s) for s in args.sizes.split(',')):
+        terms = synthetic_terms(size)
+        data = json.dumps(terms).encode('utf-8')
+        export_paths = [os.path.join(tempfile.mkdtemp(prefix='reasonpath-bench-'), 'dictionary.json')]
+
+        with ArticleDatabase(temp_db_path()) as db:
+            glossary = GlossaryDatabase(db)
+            import_ms = timeit(lambda: glossary.import_terms(terms)) * 1000
+            reimport_ms = timeit(lambda: glossary.import_terms(terms)) * 1000
+            export_ms = timeit(lambda: glossary.export_dictionary(export_paths)) * 1000
+            skip_ms = timeit(lambda: glossary.export_dictionary(export_paths), args.repeat) * 1000
+
+            page_json_ms = timeit(lambda: json_category_page(data, 'Evaluation'), args.repeat) * 1000
+            page_db_ms = timeit(lambda: glossary.get_terms(category='Evaluation', limit=10, offset=20),
+                                args.repeat) * 1000
+            search_json_ms = timeit(lambda: json_search(data, 'alignment'), args.repeat) * 1000
+            search_db_ms = timeit(lambda: glossary.search_terms('alignment'), args.repeat) * 1000
+
+        results.append((size, f"{import_ms:.0f}", f"{reimport_ms:.0f}", f"{export_ms:.1f}", f"{skip_ms:.2f}",
+                        f"{page_json_ms:.2f}", f"{page_db_ms:.2f}", f"{search_json_ms:.2f}", f"{search_db_ms:.2f}"))
+
+    print_table(("terms", "import ms", "re-import ms", "export ms", "unchanged export ms",
+                 "JSON page ms", "DB page ms", "JSON search ms", "FTS5 ms"), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""
+Article hydration benchmark
+Compares per-row tag/category queries against batched hydration
+
+Usage: python database/benchmarks/bench_hydration.py [--articles N] [--tags-per-article N]
+"""
+
+import argparse
+import json
+
+from common import count_queries, print_table, seed_database, temp_db_path, timeit
+
+
+def page_rows(conn, limit: int):
+    """Fetch the raw rows for the newest page of published articles."""
+    return conn.execute("""
+        SELECT * FROM articles WHERE status = 'published'
+        ORDER BY published_at DESC LIMIT ?
+    """, (limit,)).fetchall()
+
+
+def legacy_hydrate(conn, rows):
+    """The original get_articles loop: two extra queries per returned row."""
+    cursor = conn.cursor()
+    articles = []
+    for row in rows:
+        article = dict(row)
+        cursor.execute("""
+            SELECT t.name, t.slug FROM tags t
+            JOIN article_tags at ON t.id = at.tag_id
+            WHERE at.article_id = ?
+        """, (article['id'],))
+        article['tags'] = [dict(tag) for tag in cursor.fetchall()]
+        cursor.execute("""
+            SELECT c.name, c.slug FROM categories c
+            JOIN article_categories ac ON c.id = ac.category_id
+            WHERE ac.article_id = ?
+        """, (article['id'],))
+        article['categories'] = [dict(cat) for cat in cursor.fetchall()]
+        if article['ai_sources']:
+            article['ai_sources'] = json.loads(article['ai_sources'])
+        articles.append(article)
+    return articles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--articles', type=int, default=10000)
+    parser.add_argument('--tags-per-article', type=int, default=12)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    db_path = temp_db_path()
+    db = seed_database(db_path, args.articles, tags=500,
+                       tags_per_article=args.tags_per_article, content_words=50)
+
+    results = []
+    with db.read_connection() as conn:
+        for page_size in (10, 50, 100, 500):
+            rows = page_rows(conn, page_size)
+            with count_queries(conn) as legacy_queries:
+                legacy = legacy_hydrate(conn, rows)
+            with count_queries(conn) as batched_queries:
+                batched = db._hydrate_rows(conn, rows)
+            assert [a['tags'] for a in legacy] == [a['tags'] for a in batched]
+
+            # Timings cover hydration only; the page query itself is shared
+            legacy_ms = timeit(lambda: legacy_hydrate(conn, rows), args.repeat) * 1000
+            batched_ms = timeit(lambda: db._hydrate_rows(conn, rows), args.repeat) * 1000
+            results.append((
+                page_size,
+                len(legacy_queries), f"{legacy_ms:.2f}",
+                len(batched_queries), f"{batched_ms:.2f}",
+            ))
+    db.close()
+
+    print(f"{args.articles} articles, {args.tags_per_article} tags each\n")
+    print_table(
+        ("page size", "N+1 queries", "N+1 ms", "batched queries", "batched ms"),
+        results
+    )
+
+
+if __name__ == "__main__":
+    main()
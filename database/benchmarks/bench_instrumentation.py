@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+"""
+Instrumentation overhead benchmark
+Per-call cost of ArticleDatabase methods with instrumentation off, on, and with SQL timing
+
+Usage: python database/benchmarks/bench_instrumentation.py [--articles 20000] [--calls 5000] [--rounds 5]
+"""
+
+import argparse
+import random
+
+from common import print_table, seed_database, temp_db_path, timeit
+
+from article_manager import ArticleDatabase
+
+
+def check_query_counts(db: ArticleDatabase, slug: str, repeat: int = 3):
+    """Calling a method `repeat` times must report `repeat` times the queries of one call."""
+    calls = (("get_stats", lambda: db.get_stats()),
+             ("get_article_by_slug", lambda: db.get_article_by_slug(slug, record_view=False)),
+             ("get_articles", lambda: db.get_articles(limit=10)))
+    instrumentation = db.instrumentation
+    for name, call in calls:
+        instrumentation.reset()
+        call()
+        once = instrumentation.methods[name].queries
+        instrumentation.reset()
+        for _ in range(repeat):
+            call()
+        total = instrumentation.methods[name].queries
+        print(f"{'✓' if total == once * repeat else '✗'} {name}: {once} per call, {total} for {repeat} calls")
+    instrumentation.reset()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--articles', type=int, default=20000)
+    parser.add_argument('--calls', type=int, default=5000, help="Calls per workload and run")
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    db_path = temp_db_path()
+    seed_database(db_path, args.articles).close()
+    # One database object per state, on the same file, measured in alternation
+    # so drift in the machine or the page cache hits every state alike
+    states = {name: ArticleDatabase(db_path) for name in ("never enabled", "after disable()",
+                                                          "methods", "methods + SQL")}
+    states["after disable()"].instrument(sql=True).disable()
+    states["methods"].instrument()
+    states["methods + SQL"].instrument(sql=True)
+
+    with states["never enabled"].read_connection() as conn:
+        slugs = [row[0] for row in conn.execute("SELECT slug FROM articles WHERE status = 'published'")]
+    rng = random.Random(42)
+    sample = [rng.choice(slugs) for _ in range(args.calls)]
+
+    def reader(db):
+        for _ in range(args.calls):
+            with db.pool.reader():
+                pass
+
+    def slug_lookups(db):
+        for slug in sample:
+            db.get_article_by_slug(slug, record_view=False)
+
+    def pages(db):
+        for _ in range(args.calls // 10):
+            db.get_articles(limit=10)
+
+    def stats(db):
+        for _ in range(args.calls):
+            db.get_stats()
+
+    workloads = (("pool.reader() enter/exit", reader, args.calls),
+                 ("get_article_by_slug", slug_lookups, len(sample)),
+                 ("get_articles(limit=10)", pages, args.calls // 10),
+                 ("get_stats", stats, args.calls))
+
+    best = {(state, name): float('inf') for state in states for name, _, _ in workloads}
+    for round_number in range(args.rounds + 1):  # round 0 only warms caches
+        for name, fn, calls in workloads:
+            for state, db in states.items():
+                elapsed = timeit(lambda: fn(db)) / calls
+                if round_number:
+                    best[state, name] = min(best[state, name], elapsed)
+
+    for state in ("methods", "methods + SQL"):
+        print(f"Query counts, {state}:")
+        check_query_counts(states[state], sample[0])
+    print()
+
+    rows = []
+    for name, _, _ in workloads:
+        base = best["never enabled", name]
+        row = [name, f"{base * 1e6:.2f}"]
+        for state in list(states)[1:]:
+            value = best[state, name]
+            row.append(f"{(value - base) * 1e6:+.2f} ({(value / base - 1) * 100:+.1f}%)")
+        rows.append(row)
+    print(f"{args.articles:,} articles, best of {args.rounds} rounds; "
+          f"µs per call, then the change against never enabled")
+    print_table(("workload", "never enabled µs", "after disable()", "methods", "methods + SQL"), rows)
+    for db in states.values():
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
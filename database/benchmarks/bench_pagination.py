@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""
+Pagination benchmark
+Compares LIMIT/OFFSET pages against keyset (cursor) pages at increasing depth
+
+Usage: python database/benchmarks/bench_pagination.py [--articles N] [--page-size N]
+"""
+
+import argparse
+
+from common import print_table, seed_database, temp_db_path, timeit
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--articles', type=int, default=100000)
+    parser.add_argument('--page-size', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    db = seed_database(temp_db_path(), args.articles, content_words=20)
+    published = db.get_stats()['published_articles']
+    last_page = published // args.page_size
+
+    results = []
+    for page in sorted({1, 10, 100, 1000, last_page // 2, last_page}):
+        if page < 1 or page > last_page:
+            continue
+        offset = (page - 1) * args.page_size
+        cursor = None
+        if offset:
+            previous = db.get_articles(limit=1, offset=offset - 1)[0]
+            cursor = db.encode_cursor(previous)
+
+        offset_page = db.get_articles(limit=args.page_size, offset=offset)
+        keyset_page = db.get_articles_page(limit=args.page_size, cursor=cursor)['articles']
+        assert [a['id'] for a in offset_page] == [a['id'] for a in keyset_page]
+
+        offset_ms = timeit(
+            lambda: db.get_articles(limit=args.page_size, offset=offset), args.repeat
+        ) * 1000
+        keyset_ms = timeit(
+            lambda: db.get_articles_page(limit=args.page_size, cursor=cursor), args.repeat
+        ) * 1000
+        results.append((page, f"{offset_ms:.2f}", f"{keyset_ms:.2f}"))
+
+    # Filtered listings go through the EXISTS rewrite on both paths
+    for label, kwargs in (("tag filter", {'tag': 'topic-7'}), ("category filter", {'category': 'analysis'})):
+        first = db.get_articles_page(limit=args.page_size, **kwargs)
+        results.append((
+            f"{label}, page 1",
+            f"{timeit(lambda: db.get_articles(limit=args.page_size, **kwargs), args.repeat) * 1000:.2f}",
+            f"{timeit(lambda: db.get_articles_page(limit=args.page_size, **kwargs), args.repeat) * 1000:.2f}",
+        ))
+        if first['next_cursor']:
+            cursor = first['next_cursor']
+            results.append((
+                f"{label}, page 2",
+                f"{timeit(lambda: db.get_articles(limit=args.page_size, offset=args.page_size, **kwargs), args.repeat) * 1000:.2f}",
+                f"{timeit(lambda: db.get_articles_page(limit=args.page_size, cursor=cursor, **kwargs), args.repeat) * 1000:.2f}",
+            ))
+    db.close()
+
+    print(f"{args.articles} articles, {args.page_size} per page\n")
+    print_table(("page", "OFFSET ms", "cursor ms"), results)
+
+
+if __name__ == "__main__":
+    main()
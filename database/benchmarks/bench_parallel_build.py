@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+"""
+Parallel site build benchmark
+Reports pages/sec for a full static build at different worker counts
+
+Usage: python database/benchmarks/bench_parallel_build.py [--articles N] [--jobs 1,2,4,8]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+
+from common import print_table, seed_database, temp_db_path
+from site_builder import SiteBuilder
+
+
+def main():
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--articles', type=int, default=10000)
+    parser.add_argument('--jobs', default=','.join(str(j) for j in sorted({1, 2, 4, cores})))
+    args = parser.parse_args()
+
+    db = seed_database(temp_db_path(), args.articles, content_words=400)
+
+    results = []
+    for jobs in (int(j) for j in args.jobs.split(',')):
+        output_dir = tempfile.mkdtemp(prefix='reasonpath-site-')
+        report = SiteBuilder(db, output_dir, jobs=jobs).build(force=True)
+        results.append((
+            jobs, report['rendered'], f"{report['seconds']:.2f}",
+            f"{report['rendered'] / report['seconds']:,.0f}"
+        ))
+        shutil.rmtree(output_dir)
+    db.close()
+
+    print(f"{args.articles} articles on {cores} cores\n")
+    print_table(("jobs", "pages", "seconds", "pages/sec"), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""
+Rendered content benchmark
+Markdown rendering per page build and API request, cold (no stored renders) vs warm
+
+Usage: python database/benchmarks/bench_rendered_content.py [--articles 20000] [--jobs 1]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+
+from common import lorem, print_table, seed_database, temp_db_path, timeit
+
+from site_builder import SiteBuilder
+
+
+def markdown_article(rng: random.Random) -> str:
+    """About 600 words of Markdown: sections, emphasis, code, links and lists."""
+    parts = [f"# {lorem(rng, 5).title()}", lorem(rng, 60)]
+    for _ in range(5):
+        parts.append(f"## {lorem(rng, 4).title()}")
+        parts.append(f"{lorem(rng, 30)} **{lorem(rng, 2)}** {lorem(rng, 20)} `{lorem(rng, 1)}` "
+                     f"[{lorem(rng, 2)}](https://reasonpath.com/{lorem(rng, 1)}) {lorem(rng, 25)} *{lorem(rng, 3)}*.")
+        parts.append('\n'.join(f"- {lorem(rng, 8)}" for _ in range(4)))
+        parts.append(lorem(rng, 30))
+    return '\n\n'.join(parts)
+
+
+def attach_all(db, ids):
+    for start in range(0, len(ids), 500):
+        db.attach_rendered_content(db.hydrate_articles(ids[start:start + 500]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--articles', type=int, default=20000)
+    parser.add_argument('--jobs', type=int, default=1, help="Site builder worker processes")
+    args = parser.parse_args()
+
+    db = seed_database(temp_db_path(), args.articles, content_words=10)
+    rng = random.Random(42)
+    with db.write_connection() as conn:
+        ids = [row[0] for row in conn.execute("SELECT id FROM articles ORDER BY id")]
+        conn.executemany("UPDATE articles SET content = ? WHERE id = ?",
+                         [(markdown_article(rng), article_id) for article_id in ids])
+        slugs = [row[0] for row in conn.execute(
+            "SELECT slug FROM articles WHERE status = 'published' ORDER BY id LIMIT 200")]
+
+    def detail_requests():
+        for slug in slugs:
+            db.attach_rendered_content([db.get_article_by_slug(slug, record_view=False)])
+
+    def site_build():
+        return SiteBuilder(db, tempfile.mkdtemp(prefix='reasonpath-bench-'), jobs=args.jobs).build()['seconds']
+
+    results = []
+    cold_attach = timeit(lambda: attach_all(db, ids))
+    cold_detail = timeit(detail_requests) / len(slugs)
+    cold_build = site_build()
+
+    start = time.perf_counter()
+    report = db.render_all_content()
+    render_s = time.perf_counter() - start
+    start = time.perf_counter()
+    db.render_all_content()
+    recheck_s = time.perf_counter() - start
+
+    warm_attach = timeit(lambda: attach_all(db, ids))
+    warm_detail = timeit(detail_requests) / len(slugs)
+    warm_build = site_build()
+
+    results.append(("attach all articles (s)", f"{cold_attach:.2f}", f"{warm_attach:.2f}",
+                    f"{cold_attach / warm_attach:.1f}x"))
+    results.append(("per article (µs)", f"{cold_attach / len(ids) * 1e6:.0f}",
+                    f"{warm_attach / len(ids) * 1e6:.0f}", ''))
+    results.append(("detail lookup + body (µs)", f"{cold_detail * 1e6:.0f}", f"{warm_detail * 1e6:.0f}",
+                    f"{cold_detail / warm_detail:.1f}x"))
+    results.append((f"full site build, {args.jobs} job(s) (s)", f"{cold_build:.2f}", f"{warm_build:.2f}",
+                    f"{cold_build / warm_build:.1f}x"))
+
+    print(f"{len(ids):,} articles of ~600 words of Markdown")
+    print(f"render_all_content: {report['rendered']:,} rendered in {render_s:.2f}s, "
+          f"re-run with nothing stale {recheck_s:.2f}s")
+    print_table(("", "cold", "warm", "speedup"), results)
+
+
+if __name__ == "__main__":
+    main()
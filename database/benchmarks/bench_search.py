@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+"""
+Search benchmark
+Compares FTS5 search_articles against the old LIKE scan as the archive grows
+
+Usage: python database/benchmarks/bench_search.py [--sizes 1000,10000,100000]
+"""
+
+import argparse
+
+from common import print_table, seed_database, temp_db_path, timeit
+
+QUERIES = ('alignment', 'context window', '"retrieval embedding"', 'halluc*')
+
+
+def like_search(conn, query: str, limit: int = 20):
+    """The original search_articles query: a LIKE scan over every article body."""
+    pattern = f'%{query.strip(chr(34)).rstrip("*")}%'
+    return conn.execute("""
+        SELECT * FROM articles
+        WHERE status = 'published'
+        AND (title LIKE ? OR excerpt LIKE ? OR content LIKE ?)
+        ORDER BY published_at DESC
+        LIMIT ?
+    """, (pattern, pattern, pattern, limit)).fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='1000,10000,50000',
+                        help="Comma-separated archive sizes to measure")
+    parser.add_argument('--content-words', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    db_path = temp_db_path()
+    db = None
+    seeded = 0
+    results = []
+    for size in sorted(int(s) for s in args.sizes.split(',')):
+        if db:
+            db.close()
+        # Grow the same database so each step adds to the previous archive
+        db = seed_database(db_path, size - seeded, content_words=args.content_words,
+                           seed=size)
+        seeded = size
+
+        with db.read_connection() as conn:
+            for query in QUERIES:
+                like_ms = timeit(lambda: like_search(conn, query), args.repeat) * 1000
+                fts_ms = timeit(lambda: db.search_articles(query), args.repeat) * 1000
+                results.append((size, query, f"{like_ms:.2f}", f"{fts_ms:.2f}"))
+    db.close()
+
+    print_table(("articles", "query", "LIKE ms", "FTS5 ms"), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+"""
+Static site build benchmark
+Times a full build, a no-op rebuild and a rebuild after editing one article
+
+Usage: python database/benchmarks/bench_site_build.py [--articles N]
+"""
+
+import argparse
+import os
+import tempfile
+
+from common import print_table, seed_database, temp_db_path
+from site_builder import SiteBuilder
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--articles', type=int, default=20000)
+    args = parser.parse_args()
+
+    db = seed_database(temp_db_path(), args.articles, content_words=400)
+    output_dir = tempfile.mkdtemp(prefix='reasonpath-site-')
+    builder = SiteBuilder(db, output_dir)
+
+    results = []
+
+    def run(label):
+        report = builder.build()
+        results.append((label, report['pages'], report['rendered'], f"{report['seconds']:.3f}"))
+
+    run("full build")
+    run("no changes")
+
+    # Edit an article deep in the archive
+    article_id = db.get_articles(limit=1, offset=args.articles // 2)[0]['id']
+    db.update_article(article_id, title="Edited Benchmark Article")
+    run("one article edited")
+
+    db.update_article(db.get_recent_articles(limit=1)[0]['id'], excerpt="A fresh excerpt")
+    run("newest article edited")
+    db.close()
+
+    print(f"{args.articles} articles, output in {output_dir}\n")
+    print_table(("build", "pages", "rendered", "seconds"), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+"""
+Snapshot benchmark
+Slug lookups and feed pages from the mmap snapshot vs ArticleDatabase
+
+Usage: python database/benchmarks/bench_snapshot.py [--sizes 10000,100000]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from common import print_table, seed_database, temp_db_path, timeit
+
+from snapshot import Snapshot, build_snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='10000,100000',
+                        help="Comma-separated archive sizes to measure")
+    parser.add_argument('--lookups', type=int, default=20000)
+    args = parser.parse_args()
+
+    results = []
+    for size in sorted(int(s) for s in args.sizes.split(',')):
+        path = os.path.join(tempfile.mkdtemp(prefix='reasonpath-bench-'), 'snapshot.bin')
+        with seed_database(temp_db_path(), size, content_words=300) as db:
+            with db.read_connection() as conn:
+                slugs = [row[0] for row in conn.execute("SELECT slug FROM articles WHERE status = 'published'")]
+            rng = random.Random(42)
+            sample = [rng.choice(slugs) for _ in range(args.lookups)]
+
+            start = time.perf_counter()
+            report = build_snapshot(db, path)
+            build_s = time.perf_counter() - start
+            skip_ms = timeit(lambda: build_snapshot(db, path)) * 1000
+            open_us = timeit(lambda: Snapshot(path).close(), 100) * 1e6
+            snapshot = Snapshot(path)
+
+            def db_lookups():
+                for slug in sample:
+                    db.get_article_by_slug(slug, record_view=False)
+
+            def snapshot_lookups():
+                for slug in sample:
+                    snapshot.get_article_by_slug(slug)
+
+            db_us = timeit(db_lookups) / len(sample) * 1e6
+            snap_us = timeit(snapshot_lookups) / len(sample) * 1e6
+            deep = len(slugs) // 2
+            db_page_ms = timeit(lambda: db.get_articles(limit=10, offset=deep), 20) * 1000
+            snap_page_ms = timeit(lambda: snapshot.articles(deep, 10), 20) * 1000
+            snapshot.close()
+
+        results.append((size, f"{report['bytes'] / 1e6:.1f}", f"{build_s:.2f}", f"{skip_ms:.2f}",
+                        f"{open_us:.0f}", f"{db_us:.1f}", f"{snap_us:.1f}", f"{db_us / snap_us:.1f}x",
+                        f"{db_page_ms:.2f}", f"{snap_page_ms:.3f}"))
+
+    print_table(("articles", "file MB", "build s", "unchanged build ms", "open µs", "DB slug µs",
+                 "snapshot slug µs", "speedup", "DB mid page ms", "snapshot mid page ms"), results)
+
+
+if __name__ == "__main__":
+    main()
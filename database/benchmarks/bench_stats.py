@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+"""
+Statistics benchmark
+get_stats from the trigger-maintained counters vs the six aggregate scans
+
+Usage: python database/benchmarks/bench_stats.py [--articles 1000000]
+"""
+
+import argparse
+import random
+import time
+
+from common import print_table, seed_database, temp_db_path, timeit
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--articles', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    db = seed_database(temp_db_path(), args.articles, tags_per_article=2, content_words=20)
+    print(f"Seeded {args.articles:,} articles in {time.perf_counter() - start:.0f}s")
+
+    with db:
+        assert db.get_stats() == db.count_stats()
+        scan_ms = timeit(db.count_stats, args.repeat) * 1000
+        counter_us = timeit(db.get_stats, args.repeat * 1000) * 1e6
+        verify_ms = timeit(db.verify_stats) * 1000
+        rebuild_ms = timeit(db.rebuild_stats) * 1000
+
+        # View flushes now also update the counters row once per article
+        rng = random.Random(42)
+        for _ in range(10000):
+            db.view_counter.record(rng.randint(1, args.articles))
+        flush_ms = timeit(db.flush_views) * 1000
+        assert not db.verify_stats()
+
+    print_table(("articles", "scans ms", "counters µs", "speedup", "verify ms", "rebuild ms",
+                 "10k-view flush ms"),
+                [(f"{args.articles:,}", f"{scan_ms:.0f}", f"{counter_us:.1f}",
+                  f"{scan_ms * 1000 / counter_us:,.0f}x", f"{verify_ms:.0f}", f"{rebuild_ms:.0f}",
+                  f"{flush_ms:.0f}")])
+
+
+if __name__ == "__main__":
+    main()
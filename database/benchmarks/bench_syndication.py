@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+"""
+Syndication benchmark
+Time and peak memory of streaming sitemaps/feeds vs building them in memory
+
+Usage: python database/benchmarks/bench_syndication.py [--sizes 10000,120000]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+from common import print_table, seed_database, temp_db_path
+
+import syndication
+
+
+def tree_sitemap(db, path: str):
+    """The obvious approach: fetch every URL, build an ElementTree, serialize once."""
+    with db.read_connection() as conn:
+        pages = list(syndication.sitemap_urls(conn, syndication.SITE_URL))
+    urlset = ET.Element('urlset', xmlns=syndication.SITEMAP_NS)
+    for loc, lastmod in pages:
+        url = ET.SubElement(urlset, 'url')
+        ET.SubElement(url, 'loc').text = loc
+        ET.SubElement(url, 'lastmod').text = lastmod
+    ET.ElementTree(urlset).write(path, encoding='utf-8', xml_declaration=True)
+
+
+def measure(fn):
+    """Return (seconds, peak traced MB, result); timed untraced, then run again under tracemalloc."""
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='10000,120000',
+                        help="Comma-separated archive sizes to measure")
+    args = parser.parse_args()
+
+    db_path = temp_db_path()
+    db = None
+    seeded = 0
+    results = []
+    for size in sorted(int(s) for s in args.sizes.split(',')):
+        if db:
+            db.close()
+        db = seed_database(db_path, size - seeded, content_words=60, seed=size)
+        seeded = size
+        output_dir = tempfile.mkdtemp(prefix='reasonpath-bench-')
+
+        tree_s, tree_mb, _ = measure(lambda: tree_sitemap(db, os.path.join(output_dir, 'tree.xml')))
+        stream_s, stream_mb, report = measure(lambda: syndication.write_sitemaps(db, output_dir))
+        start = time.perf_counter()
+        again = syndication.write_sitemaps(db, output_dir)
+        again_s = time.perf_counter() - start
+        rss_s, rss_mb, _ = measure(lambda: syndication.write_rss(db, os.path.join(output_dir, 'rss.xml')))
+
+        results.append((size, report['files'], f"{tree_s:.2f}", f"{tree_mb:.1f}", f"{stream_s:.2f}",
+                        f"{stream_mb:.2f}", f"{again_s:.2f} ({again['written']} written)",
+                        f"{rss_s * 1000:.0f}", f"{rss_mb:.2f}"))
+    db.close()
+
+    print_table(("articles", "sitemap files", "ElementTree s", "ElementTree MB", "streamed s",
+                 "streamed MB", "unchanged rerun s", "rss ms", "rss MB"), results)
+
+
+if __name__ == "__main__":
+    main()
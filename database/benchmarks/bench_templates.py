@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+"""
+Template rendering benchmark
+Compares cards rendered per second by the compiled templates against the
+original f-string and += concatenation functions, unescaped and escaped
+
+Usage: python database/benchmarks/bench_templates.py [--cards N] [--page-repeat N]
+"""
+
+import argparse
+import html
+import time
+from datetime import datetime
+
+from common import print_table, seed_database, temp_db_path, timeit
+from feed_generator import generate_article_card, generate_hero_article
+from templating import render_template
+
+
+def legacy_article_card(article):
+    """generate_article_card before templates (unescaped f-strings)."""
+    if article['published_at']:
+        formatted_date = datetime.fromisoformat(article['published_at']).strftime('%B %d, %Y')
+    else:
+        formatted_date = 'Draft'
+
+    tag_chips = ''
+    if article['tags']:
+        for tag in article['tags'][:3]:
+            tag_chips += f'<span class="article-tag">{tag["name"]}</span>'
+
+    category_badge = ''
+    if article['categories']:
+        category_badge = f'<span class="article-category">{article["categories"][0]["name"]}</span>'
+
+    ai_badge = ''
+    if article['ai_sources']:
+        ai_count = len(article['ai_sources'])
+        ai_badge = f'<span class="ai-badge" title="Created with {ai_count} AI models">🤖 {ai_count} AIs</span>'
+
+    featured_badge = ''
+    if article['featured']:
+        featured_badge = '<span class="featured-badge">⭐ Featured</span>'
+
+    return f"""
+    <article class="article-card" data-slug="{article['slug']}">
+        <div class="article-card-header">
+            {category_badge}
+            {featured_badge}
+            {ai_badge}
+        </div>
+        <h3 class="article-title">
+            <a href="/blog/{article['slug']}.html">{article['title']}</a>
+        </h3>
+        {f'<p class="article-subtitle">{article["subtitle"]}</p>' if article['subtitle'] else ''}
+        <p class="article-excerpt">{article['excerpt'] or article['content'][:200] + '...'}</p>
+        <div class="article-tags">
+            {tag_chips}
+        </div>
+        <div class="article-meta">
+            <span class="article-date">{formatted_date}</span>
+            <span class="article-reading-time">📖 {article['reading_time']} min read</span>
+            <span class="article-views">👁 {article['view_count']} views</span>
+        </div>
+        <a href="/blog/{article['slug']}.html" class="article-link">Read More →</a>
+    </article>
+    """
+
+
+def escaped_article_card(article):
+    """legacy_article_card with every value passed through html.escape, as the templates do."""
+    escape = html.escape
+    if article['published_at']:
+        formatted_date = datetime.fromisoformat(article['published_at']).strftime('%B %d, %Y')
+    else:
+        formatted_date = 'Draft'
+    slug = escape(article['slug'])
+
+    tag_chips = ''
+    if article['tags']:
+        for tag in article['tags'][:3]:
+            tag_chips += f'<span class="article-tag">{escape(tag["name"])}</span>'
+
+    category_badge = ''
+    if article['categories']:
+        category_badge = f'<span class="article-category">{escape(article["categories"][0]["name"])}</span>'
+
+    ai_badge = ''
+    if article['ai_sources']:
+        ai_count = len(article['ai_sources'])
+        ai_badge = f'<span class="ai-badge" title="Created with {ai_count} AI models">🤖 {ai_count} AIs</span>'
+
+    featured_badge = ''
+    if article['featured']:
+        featured_badge = '<span class="featured-badge">⭐ Featured</span>'
+
+    return f"""
+    <article class="article-card" data-slug="{slug}">
+        <div class="article-card-header">
+            {category_badge}
+            {featured_badge}
+            {ai_badge}
+        </div>
+        <h3 class="article-title">
+            <a href="/blog/{slug}.html">{escape(article['title'])}</a>
+        </h3>
+        {f'<p class="article-subtitle">{escape(article["subtitle"])}</p>' if article['subtitle'] else ''}
+        <p class="article-excerpt">{escape(article['excerpt'] or article['content'][:200] + '...')}</p>
+        <div class="article-tags">
+            {tag_chips}
+        </div>
+        <div class="article-meta">
+            <span class="article-date">{escape(formatted_date)}</span>
+            <span class="article-reading-time">📖 {article['reading_time']} min read</span>
+            <span class="article-views">👁 {article['view_count']} views</span>
+        </div>
+        <a href="/blog/{slug}.html" class="article-link">Read More →</a>
+    </article>
+    """
+
+
+def legacy_feed(articles, card=legacy_article_card):
+    """The original page assembly: one growing string built with +=."""
+    page = '<div class="article-feed-container">\n'
+    for article in articles:
+        page += card(article)
+    page += '\n</div>'
+    return page
+
+
+def cards_per_second(render, articles, count: int) -> float:
+    start = time.perf_counter()
+    for i in range(count):
+        render(articles[i % len(articles)])
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--cards', type=int, default=20000)
+    parser.add_argument('--page-cards', type=int, default=2000,
+                        help="Cards on one page for the page assembly comparison")
+    parser.add_argument('--page-repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    db = seed_database(temp_db_path(), 500, tags_per_article=6, content_words=100)
+    articles = db.get_articles(limit=500)
+    db.close()
+
+    # Warm the template cache so compilation isn't measured
+    generate_article_card(articles[0])
+    generate_hero_article(articles[0])
+
+    page = (articles * (args.page_cards // len(articles) + 1))[:args.page_cards]
+    # Averaged over several pages: one 2000-card page is too short to time alone
+    legacy_page_ms = timeit(lambda: legacy_feed(page), args.page_repeat) * 1000
+    escaped_page_ms = timeit(lambda: legacy_feed(page, escaped_article_card), args.page_repeat) * 1000
+    template_page_ms = timeit(lambda: render_template(
+        'article_feed.html', hero=None, cards=[generate_article_card(a) for a in page]
+    ), args.page_repeat) * 1000
+
+    print_table(("renderer", "cards/sec", f"{args.page_cards}-card page ms"), [
+        ("f-string + concatenation", f"{cards_per_second(legacy_article_card, articles, args.cards):,.0f}",
+         f"{legacy_page_ms:.1f}"),
+        ("f-string + html.escape", f"{cards_per_second(escaped_article_card, articles, args.cards):,.0f}",
+         f"{escaped_page_ms:.1f}"),
+        ("compiled template (escaped)", f"{cards_per_second(generate_article_card, articles, args.cards):,.0f}",
+         f"{template_page_ms:.1f}"),
+    ])
+
+
+if __name__ == "__main__":
+    main()
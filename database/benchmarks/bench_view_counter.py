@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""
+View counting benchmark
+Compares reads/sec of a write-per-read view count against buffered counting
+
+Usage: python database/benchmarks/bench_view_counter.py [--threads 1,4,16,64]
+"""
+
+import argparse
+import threading
+import time
+
+from common import print_table, seed_database, temp_db_path
+from article_manager import ArticleDatabase
+
+
+class WritePerReadCounter:
+    """The old behaviour: an UPDATE and commit for every page view."""
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    def record(self, article_id: int, views: int = 1):
+        with self.pool.writer() as conn:
+            conn.execute("""
+                UPDATE articles SET view_count = view_count + ? WHERE id = ?
+            """, (views, article_id))
+
+    def flush(self) -> int:
+        return 0
+
+    def close(self):
+        pass
+
+
+def run_reads(db: ArticleDatabase, slugs, threads: int, duration: float) -> float:
+    """Read articles by slug from several threads and return reads/sec."""
+    counts = [0] * threads
+    stop = time.perf_counter() + duration
+
+    def worker(index):
+        i = index
+        while time.perf_counter() < stop:
+            db.get_article_by_slug(slugs[i % len(slugs)])
+            counts[index] += 1
+            i += threads
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return sum(counts) / duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--articles', type=int, default=2000)
+    parser.add_argument('--threads', default='1,4,16,64')
+    parser.add_argument('--duration', type=float, default=2.0)
+    args = parser.parse_args()
+
+    db_path = temp_db_path()
+    seed_database(db_path, args.articles).close()
+    slugs = [f"bench-article-{i}" for i in range(1, args.articles + 1)]
+
+    results = []
+    for threads in (int(t) for t in args.threads.split(',')):
+        row = [threads]
+        for buffered in (False, True):
+            db = ArticleDatabase(db_path)
+            if not buffered:
+                db.view_counter = WritePerReadCounter(db.pool)
+            row.append(f"{run_reads(db, slugs, threads, args.duration):,.0f}")
+            db.close()
+        results.append(row)
+
+    with ArticleDatabase(db_path) as db:
+        total_views = db.get_stats()['total_views']
+
+    print(f"{args.articles} articles, {total_views:,} views recorded in total\n")
+    print_table(("threads", "write-per-read reads/sec", "buffered reads/sec"), results)
+
+
+if __name__ == "__main__":
+    main()
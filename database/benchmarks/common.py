@@ -0,0 +1,138 @@
+"""
+Shared helpers for the ReasonPath database benchmarks
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+# Make the database modules importable when run as a script
+DATABASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if DATABASE_DIR not in sys.path:
+    sys.path.insert(0, DATABASE_DIR)
+
+from article_manager import ArticleDatabase
+
+WORDS = (
+    "context window memory model agent reasoning alignment token prompt "
+    "retrieval embedding vector transformer attention safety benchmark "
+    "latency inference training dataset evaluation hallucination grounding"
+).split()
+
+SYLLABLES = "ka lo mi ne ru ta vi so pe du ra xe li mo na zu".split()
+
+
+def _build_vocabulary(size: int = 20000):
+    """Pseudo-words with the AI vocabulary spread across the frequency ranks."""
+    vocabulary = []
+    for i in range(size):
+        word, n = '', i + len(SYLLABLES)
+        while n:
+            n, r = divmod(n, len(SYLLABLES))
+            word += SYLLABLES[r]
+        vocabulary.append(word)
+    for rank, word in enumerate(WORDS):
+        vocabulary[20 + rank * 97] = word
+    return vocabulary
+
+
+VOCABULARY = _build_vocabulary()
+# Zipf-like frequencies so common words are everywhere and most are rare
+CUM_WEIGHTS = []
+_total = 0.0
+for _rank in range(len(VOCABULARY)):
+    _total += 1.0 / (_rank + 1)
+    CUM_WEIGHTS.append(_total)
+
+
+def lorem(rng: random.Random, words: int) -> str:
+    """Generate filler text with a natural-language-like word distribution."""
+    return ' '.join(rng.choices(VOCABULARY, cum_weights=CUM_WEIGHTS, k=words))
+
+
+def temp_db_path() -> str:
+    """Return a path for a throwaway benchmark database."""
+    return os.path.join(tempfile.mkdtemp(prefix='reasonpath-bench-'), 'bench.db')
+
+
+def seed_database(db_path: str, articles: int, tags: int = 200,
+                  tags_per_article: int = 5, content_words: int = 300,
+                  seed: int = 42) -> ArticleDatabase:
+    """Create a database at db_path filled with synthetic published articles."""
+    db = ArticleDatabase(db_path)
+    rng = random.Random(seed)
+
+    with db.write_connection() as conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO tags (name, slug) VALUES (?, ?)",
+            [(f"Topic {i}", f"topic-{i}") for i in range(tags)]
+        )
+        tag_ids = [row['id'] for row in conn.execute("SELECT id FROM tags")]
+        category_ids = [row['id'] for row in conn.execute("SELECT id FROM categories")]
+
+        start = conn.execute("SELECT COALESCE(MAX(id), 0) FROM articles").fetchone()[0]
+        rows = []
+        for i in range(start + 1, start + articles + 1):
+            rows.append((
+                f"bench-article-{i}",
+                f"Benchmark Article {i}: {lorem(rng, 5)}",
+                lorem(rng, 30),
+                lorem(rng, content_words),
+                rng.random() < 0.05,
+                max(1, round(content_words / 225)),
+                'published' if rng.random() < 0.9 else 'draft',
+                f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} "
+                f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}",
+            ))
+        conn.executemany("""
+            INSERT INTO articles (
+                slug, title, excerpt, content, featured, reading_time,
+                status, published_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+
+        links = []
+        categories = []
+        for article_id in range(start + 1, start + articles + 1):
+            for tag_id in rng.sample(tag_ids, min(tags_per_article, len(tag_ids))):
+                links.append((article_id, tag_id))
+            categories.append((article_id, rng.choice(category_ids)))
+        conn.executemany("INSERT INTO article_tags (article_id, tag_id) VALUES (?, ?)", links)
+        conn.executemany(
+            "INSERT INTO article_categories (article_id, category_id) VALUES (?, ?)",
+            categories
+        )
+
+    return db
+
+
+@contextmanager
+def count_queries(conn: sqlite3.Connection):
+    """Count the SQL statements executed on conn inside the block."""
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        yield statements
+    finally:
+        conn.set_trace_callback(None)
+
+
+def timeit(fn, repeat: int = 1) -> float:
+    """Return the average wall time of fn() in seconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def print_table(headers, rows):
+    """Print rows as an aligned plain-text table."""
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    print('  '.join(str(h).ljust(w) for h, w in zip(headers, widths)))
+    print('  '.join('-' * w for w in widths))
+    for row in rows:
+        print('  '.join(str(c).ljust(w) for c, w in zip(row, widths)))
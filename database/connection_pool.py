@@ -0,0 +1,188 @@
+"""
+ReasonPath Connection Pool
+Reusable SQLite connections for ArticleDatabase
+"""
+
+import os
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Callable, List, Optional
+from urllib.request import pathname2url
+
+# Connection tuning applied once per pooled connection
+PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -16000,        # ~16 MB page cache (negative = KiB)
+    'mmap_size': 268435456,      # 256 MB memory-mapped I/O
+    'temp_store': 'MEMORY',
+    'foreign_keys': 'ON',
+    'busy_timeout': 5000,        # ms to wait on a locked database
+}
+
+# Size of sqlite3's per-connection prepared statement cache
+STATEMENT_CACHE_SIZE = 256
+
+
+class _ThreadConnection:
+    """Holds a thread's read connection in thread-local storage.
+
+    Python drops a thread's locals when it exits; a finalizer on this
+    holder then closes the connection.
+    """
+
+    __slots__ = ('conn', '__weakref__')
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+
+def _release(connections: List[sqlite3.Connection], lock: threading.Lock, conn: sqlite3.Connection):
+    """Close a reader whose thread has gone and forget it."""
+    with lock:
+        if conn in connections:
+            connections.remove(conn)
+    conn.close()
+
+
+class ConnectionPool:
+    """
+    Pool of SQLite connections for one database file.
+
+    Readers get a connection per thread, closed when that thread exits
+    (or when the pool closes). All writes go through a single shared
+    connection guarded by a lock, so write transactions are serialized
+    in-process instead of fighting over SQLite's file lock. WAL mode lets
+    readers keep reading while the writer commits.
+
+    A read_only pool opens the file with SQLite's mode=ro and refuses to
+    hand out a writer; worker processes use it so they can never modify
+    the database they are reading.
+    """
+
+    def __init__(self, db_path: str, pragmas: dict = None, read_only: bool = False):
+        self.db_path = db_path
+        self.read_only = read_only
+        self.pragmas = dict(PRAGMAS, **(pragmas or {}))
+        if read_only:
+            # Changing the journal mode is a write
+            self.pragmas.pop('journal_mode', None)
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._writer = None
+        self._write_lock = threading.RLock()
+        self._write_depth = 0
+        self._closed = False
+        self._connect_hooks: List[Callable[[sqlite3.Connection], None]] = []
+        # Set by Instrumentation to time statements: wraps each connection handed out
+        self.wrapper: Optional[Callable[[sqlite3.Connection], object]] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open and tune a new connection."""
+        if self._closed:
+            raise sqlite3.ProgrammingError("Connection pool is closed")
+
+        if self.read_only:
+            target = f"file:{pathname2url(os.path.abspath(self.db_path))}?mode=ro"
+        else:
+            target = self.db_path
+        conn = sqlite3.connect(
+            target,
+            uri=self.read_only,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE
+        )
+        conn.row_factory = sqlite3.Row
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+
+        with self._connections_lock:
+            self._connections.append(conn)
+            hooks = list(self._connect_hooks)
+        for hook in hooks:
+            hook(conn)
+        return conn
+
+    def add_connect_hook(self, hook: Callable[[sqlite3.Connection], None]):
+        """Call hook(conn) on every open connection and on each one opened later."""
+        with self._connections_lock:
+            self._connect_hooks.append(hook)
+            connections = list(self._connections)
+        for conn in connections:
+            hook(conn)
+
+    def remove_connect_hook(self, hook: Callable[[sqlite3.Connection], None],
+                            undo: Callable[[sqlite3.Connection], None] = None):
+        """Stop calling hook on new connections; undo(conn) runs on the open ones."""
+        with self._connections_lock:
+            if hook in self._connect_hooks:
+                self._connect_hooks.remove(hook)
+            connections = list(self._connections)
+        if undo is not None:
+            for conn in connections:
+                undo(conn)
+
+    @contextmanager
+    def reader(self):
+        """Yield this thread's read connection."""
+        holder = getattr(self._local, 'holder', None)
+        if holder is None:
+            holder = _ThreadConnection(self._connect())
+            # Not a bound method: the finalizer must not keep the pool alive
+            weakref.finalize(holder, _release, self._connections, self._connections_lock, holder.conn)
+            self._local.holder = holder
+        conn = holder.conn
+        try:
+            yield conn if self.wrapper is None else self.wrapper(conn)
+        finally:
+            # Never leave a read transaction open on a pooled connection,
+            # it would pin the WAL snapshot for this thread
+            if conn.in_transaction:
+                conn.rollback()
+
+    @contextmanager
+    def writer(self):
+        """Yield the shared write connection inside a transaction."""
+        if self.read_only:
+            raise sqlite3.OperationalError("Connection pool is read-only")
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = self._connect()
+            conn = self._writer
+            handle = conn if self.wrapper is None else self.wrapper(conn)
+            # Re-entrant use joins the outer transaction
+            if self._write_depth:
+                self._write_depth += 1
+                try:
+                    yield handle
+                finally:
+                    self._write_depth -= 1
+                return
+            self._write_depth = 1
+            try:
+                yield handle
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                self._write_depth = 0
+
+    def close(self):
+        """Close every connection opened by the pool."""
+        with self._write_lock, self._connections_lock:
+            self._closed = True
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+            self._writer = None
+        self._local = threading.local()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
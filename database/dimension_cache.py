@@ -0,0 +1,149 @@
+"""
+ReasonPath Dimension Cache
+Process-wide tag and category id lookups for the write and hydration paths
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Row in dataset_revisions bumped by triggers on tags and categories
+REVISION_NAME = 'dimensions'
+
+# Tags per multi-row INSERT (two bound values each, well under SQLite's limit)
+INSERT_CHUNK = 500
+
+
+class DimensionCache:
+    """
+    Tag and category ids, names and slugs for one database file.
+
+    Loaded once from the tables, then kept current in place as this
+    process inserts tags. Every use first checks the 'dimensions'
+    revision, bumped by triggers on any tag or category change, and
+    reloads when another process (or a direct SQL write) moved it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.revision = None
+        self.tags_by_slug: Dict[str, int] = {}
+        self.tags_by_id: Dict[int, Tuple[str, str]] = {}  # id -> (name, slug)
+        self.categories_by_name: Dict[str, int] = {}
+        self.categories_by_id: Dict[int, Tuple[str, str]] = {}
+        self.loads = 0
+
+    def _current_revision(self, conn: sqlite3.Connection) -> Optional[int]:
+        try:
+            row = conn.execute(
+                "SELECT revision FROM dataset_revisions WHERE name = ?", (REVISION_NAME,)
+            ).fetchone()
+        except sqlite3.OperationalError:
+            # A read-only database from before the revision triggers existed
+            return None
+        return row[0] if row else None
+
+    def load(self, conn: sqlite3.Connection, revision: Optional[int] = None):
+        """Reload everything from the tables."""
+        tags_by_slug, tags_by_id = {}, {}
+        for tag_id, name, slug in conn.execute("SELECT id, name, slug FROM tags"):
+            tags_by_slug[slug] = tag_id
+            tags_by_id[tag_id] = (name, slug)
+        categories_by_name, categories_by_id = {}, {}
+        for category_id, name, slug in conn.execute("SELECT id, name, slug FROM categories"):
+            categories_by_name[name] = category_id
+            categories_by_id[category_id] = (name, slug)
+        with self._lock:
+            self.tags_by_slug, self.tags_by_id = tags_by_slug, tags_by_id
+            self.categories_by_name, self.categories_by_id = categories_by_name, categories_by_id
+            self.revision = revision
+            self.loads += 1
+
+    def refresh(self, conn: sqlite3.Connection):
+        """Reload if the tables changed since the last load; one primary-key read otherwise."""
+        revision = self._current_revision(conn)
+        if revision is None or revision != self.revision:
+            self.load(conn, revision)
+
+    def tag_names(self, conn: sqlite3.Connection, tag_ids: Iterable[int]) -> Dict[int, Tuple[str, str]]:
+        """(name, slug) for each tag id; reloads once if an id is unknown."""
+        tag_ids = set(tag_ids)
+        if not tag_ids <= self.tags_by_id.keys():
+            self.load(conn, self._current_revision(conn))
+        tags = self.tags_by_id
+        return {tag_id: tags[tag_id] for tag_id in tag_ids if tag_id in tags}
+
+    def category_names(self, conn: sqlite3.Connection, category_ids: Iterable[int]) -> Dict[int, Tuple[str, str]]:
+        """(name, slug) for each category id; reloads once if an id is unknown."""
+        category_ids = set(category_ids)
+        if not category_ids <= self.categories_by_id.keys():
+            self.load(conn, self._current_revision(conn))
+        categories = self.categories_by_id
+        return {category_id: categories[category_id] for category_id in category_ids
+                if category_id in categories}
+
+    def category_ids(self, names: Iterable[str]) -> List[int]:
+        """Ids of the named categories, skipping unknown names (call refresh first)."""
+        categories = self.categories_by_name
+        return [categories[name] for name in names if name in categories]
+
+    def resolve_tags(self, conn: sqlite3.Connection, tags: Dict[str, str]) -> Dict[str, int]:
+        """
+        Return {slug: id} for tags given as {slug: name}, creating unknown ones.
+
+        Call refresh first, on the write connection inside its transaction.
+        Unknown tags are inserted with multi-row statements of up to
+        INSERT_CHUNK tags each.
+        """
+        ids = {slug: self.tags_by_slug[slug] for slug in tags if slug in self.tags_by_slug}
+        missing = [(tags[slug], slug) for slug in tags if slug not in ids]
+        if not missing:
+            return ids
+
+        revision = self._current_revision(conn)
+        found = []
+        inserted = 0
+        for start in range(0, len(missing), INSERT_CHUNK):
+            chunk = missing[start:start + INSERT_CHUNK]
+            rows = conn.execute(
+                "INSERT OR IGNORE INTO tags (name, slug) VALUES %s RETURNING id, name, slug"
+                % ', '.join(['(?, ?)'] * len(chunk)),
+                [value for pair in chunk for value in pair]
+            ).fetchall()
+            inserted += len(rows)
+            found += [tuple(row) for row in rows]
+            if len(rows) < len(chunk):
+                # Ignored rows: created meanwhile elsewhere, or a name clash
+                returned = {row[2] for row in rows}
+                slugs = [slug for _, slug in chunk if slug not in returned]
+                found += [tuple(row) for row in conn.execute(
+                    "SELECT id, name, slug FROM tags WHERE slug IN (%s)" % ', '.join('?' * len(slugs)),
+                    slugs
+                )]
+
+        with self._lock:
+            for tag_id, name, slug in found:
+                self.tags_by_slug[slug] = tag_id
+                self.tags_by_id[tag_id] = (name, slug)
+                ids[slug] = tag_id
+            # Our own inserts bumped the revision once each; anything more
+            # means someone else changed the tables too, so reload next time
+            if revision is not None and self.revision == revision:
+                after = self._current_revision(conn)
+                self.revision = after if after == revision + inserted else None
+        return ids
+
+
+_caches: Dict[str, DimensionCache] = {}
+_caches_lock = threading.Lock()
+
+
+def dimension_cache(db_path: str) -> DimensionCache:
+    """The shared DimensionCache for a database file."""
+    key = os.path.realpath(db_path)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = DimensionCache()
+        return cache
@@ -0,0 +1,95 @@
+"""
+ReasonPath Feed Cache
+Keeps hydrated article lists and rendered feed fragments until the content changes
+"""
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from connection_pool import ConnectionPool
+
+# Row in dataset_revisions bumped by triggers on articles, tags and categories
+REVISION_NAME = 'articles'
+
+
+class FeedCache:
+    """
+    In-process cache keyed on the database's article revision.
+
+    Every entry remembers the revision it was computed at. Triggers bump
+    that revision on any article, tag or category change (view counts
+    excepted), so a lookup that sees a newer revision recomputes, even
+    when the write came from another process. Entries also expire after
+    ttl seconds, and the least recently used ones are evicted beyond
+    max_entries. Cached values are shared between callers; treat them
+    as read-only.
+    """
+
+    def __init__(self, pool: ConnectionPool, ttl: float = 300.0, max_entries: int = 128):
+        self.pool = pool
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()  # key -> (revision, expires, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def revision(self) -> Optional[int]:
+        """Current article revision (a single primary-key read), or None if untracked."""
+        try:
+            with self.pool.reader() as conn:
+                row = conn.execute(
+                    "SELECT revision FROM dataset_revisions WHERE name = ?", (REVISION_NAME,)
+                ).fetchone()
+        except sqlite3.OperationalError:
+            # A read-only database from before the revision triggers existed
+            return None
+        return row[0] if row else None
+
+    def get(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for key, computing and storing it if stale or missing."""
+        revision = self.revision()
+        if revision is None:
+            with self._lock:
+                self.misses += 1
+            return compute()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == revision and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+
+        # Computed outside the lock; the revision was read first, so a write
+        # landing meanwhile only makes the next lookup miss
+        value = compute()
+        with self._lock:
+            self._entries[key] = (revision, now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def invalidate(self):
+        """Drop every entry now."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """Hit/miss/eviction counters and the current entry count."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+            }
@@ -7,199 +7,61 @@ import os
 import sys
 from datetime import datetime
 from article_manager import ArticleDatabase
+from templating import render_template
+
+def format_article_date(published_at):
+    """Format a published_at value for display."""
+    if published_at:
+        date = datetime.fromisoformat(published_at)
+        return date.strftime('%B %d, %Y')
+    return 'Draft'
 
 def generate_article_card(article):
     """Generate HTML for a single article card."""
-    
-    # Format the date
-    if article['published_at']:
-        date = datetime.fromisoformat(article['published_at'])
-        formatted_date = date.strftime('%B %d, %Y')
-    else:
-        formatted_date = 'Draft'
-    
-    # Generate tag chips
-    tag_chips = ''
-    if article['tags']:
-        for tag in article['tags'][:3]:  # Show max 3 tags
-            tag_chips += f'<span class="article-tag">{tag["name"]}</span>'
-    
-    # Generate category badge
-    category_badge = ''
-    if article['categories']:
-        category_badge = f'<span class="article-category">{article["categories"][0]["name"]}</span>'
-    
-    # AI sources badge
-    ai_badge = ''
-    if article['ai_sources']:
-        ai_count = len(article['ai_sources'])
-        ai_badge = f'<span class="ai-badge" title="Created with {ai_count} AI models">🤖 {ai_count} AIs</span>'
-    
-    # Featured badge
-    featured_badge = ''
-    if article['featured']:
-        featured_badge = '<span class="featured-badge">⭐ Featured</span>'
-    
-    return f"""
-    <article class="article-card" data-slug="{article['slug']}">
-        <div class="article-card-header">
-            {category_badge}
-            {featured_badge}
-            {ai_badge}
-        </div>
-        <h3 class="article-title">
-            <a href="/blog/{article['slug']}.html">{article['title']}</a>
-        </h3>
-        {f'<p class="article-subtitle">{article["subtitle"]}</p>' if article['subtitle'] else ''}
-        <p class="article-excerpt">{article['excerpt'] or article['content'][:200] + '...'}</p>
-        <div class="article-tags">
-            {tag_chips}
-        </div>
-        <div class="article-meta">
-            <span class="article-date">{formatted_date}</span>
-            <span class="article-reading-time">📖 {article['reading_time']} min read</span>
-            <span class="article-views">👁 {article['view_count']} views</span>
-        </div>
-        <a href="/blog/{article['slug']}.html" class="article-link">Read More →</a>
-    </article>
-    """
+    return render_template(
+        'article_card.html',
+        article=article,
+        formatted_date=format_article_date(article['published_at'])
+    )
 
 def generate_hero_article(article):
     """Generate HTML for the hero/featured article."""
-    
-    if article['published_at']:
-        date = datetime.fromisoformat(article['published_at'])
-        formatted_date = date.strftime('%B %d, %Y')
-    else:
-        formatted_date = 'Draft'
-    
-    # Generate tag chips
-    tag_chips = ''
-    if article['tags']:
-        for tag in article['tags'][:5]:  # Show more tags for hero
-            tag_chips += f'<span class="hero-tag">{tag["name"]}</span>'
-    
-    return f"""
-    <div class="hero-article">
-        <div class="hero-article-content">
-            <div class="hero-article-category">
-                {article['categories'][0]['name'] if article['categories'] else 'Analysis'}
-            </div>
-            <h2 class="hero-article-title">
-                <a href="/blog/{article['slug']}.html">{article['title']}</a>
-            </h2>
-            {f'<p class="hero-article-subtitle">{article["subtitle"]}</p>' if article['subtitle'] else ''}
-            <p class="hero-article-excerpt">{article['excerpt'] or article['content'][:300] + '...'}</p>
-            <div class="hero-article-tags">
-                {tag_chips}
-            </div>
-            <div class="hero-article-meta">
-                <span class="hero-date">{formatted_date}</span>
-                <span class="hero-reading-time">📖 {article['reading_time']} min read</span>
-                {f'<span class="hero-ai-sources">🤖 Created with {', '.join(article["ai_sources"])}</span>' if article['ai_sources'] else ''}
-            </div>
-            <a href="/blog/{article['slug']}.html" class="btn btn-primary">Read Full Analysis →</a>
-        </div>
-    </div>
-    """
-
-def generate_article_feed_html():
+    return render_template(
+        'hero_article.html',
+        article=article,
+        formatted_date=format_article_date(article['published_at'])
+    )
+
+def get_homepage_articles(db: ArticleDatabase):
+    """Return (featured, recent) for the homepage, cached until the content changes."""
+    return db.feed_cache.get('homepage:articles', lambda: (
+        # Featured article for the hero, then the recent articles
+        db.get_featured_articles(limit=1),
+        db.get_recent_articles(limit=9),
+    ))
+
+def generate_article_feed_html(db: ArticleDatabase = None):
     """Generate the complete article feed HTML."""
     
-    db = ArticleDatabase()
-    
-    # Get featured article for hero
-    featured = db.get_featured_articles(limit=1)
+    db = db or ArticleDatabase()
     
-    # Get recent articles
-    recent = db.get_recent_articles(limit=9)
+    return db.feed_cache.get(
+        'homepage:html',
+        lambda: render_article_feed(*get_homepage_articles(db))
+    )
+
+def render_article_feed(featured, recent):
+    """Render the article feed from already-fetched featured and recent articles."""
     
     # Filter out the featured article from recent if it exists
     if featured:
         recent = [a for a in recent if a['id'] != featured[0]['id']]
     
-    html = '<div class="article-feed-container">\n'
-    
-    # Add hero article if exists
-    if featured:
-        html += f"""
-        <section class="hero-article-section">
-            <div class="frame">
-                <div class="frame-toolbar">
-                    <div class="frame-title">Featured Analysis</div>
-                    <div class="frame-actions">
-                        <button class="frame-btn" data-action="share">Share</button>
-                    </div>
-                </div>
-                <div class="frame-content">
-                    {generate_hero_article(featured[0])}
-                </div>
-            </div>
-        </section>
-        """
-    
-    # Add recent articles grid
-    if recent:
-        article_cards = '\n'.join([generate_article_card(article) for article in recent[:6]])
-        
-        html += f"""
-        <section class="recent-articles-section">
-            <div class="frame">
-                <div class="frame-toolbar">
-                    <div class="frame-title">Latest Articles</div>
-                    <div class="frame-actions">
-                        <button class="frame-btn" data-action="filter">Filter</button>
-                        <button class="frame-btn" data-action="view-all">View All</button>
-                    </div>
-                </div>
-                <div class="frame-content">
-                    <div class="articles-grid">
-                        {article_cards}
-                    </div>
-                </div>
-            </div>
-        </section>
-        """
-    
-    # Add categories section
-    categories_html = """
-    <section class="browse-categories-section">
-        <div class="frame">
-            <div class="frame-toolbar">
-                <div class="frame-title">Browse by Category</div>
-            </div>
-            <div class="frame-content">
-                <div class="category-cards">
-                    <a href="/category/ai-fundamentals" class="category-card">
-                        <div class="category-icon">🎓</div>
-                        <h4>AI Fundamentals</h4>
-                        <p>Core concepts explained</p>
-                    </a>
-                    <a href="/category/analysis" class="category-card">
-                        <div class="category-icon">🔍</div>
-                        <h4>Analysis</h4>
-                        <p>In-depth research</p>
-                    </a>
-                    <a href="/category/tutorials" class="category-card">
-                        <div class="category-icon">📚</div>
-                        <h4>Tutorials</h4>
-                        <p>Step-by-step guides</p>
-                    </a>
-                    <a href="/category/industry-news" class="category-card">
-                        <div class="category-icon">📰</div>
-                        <h4>Industry News</h4>
-                        <p>Latest developments</p>
-                    </a>
-                </div>
-            </div>
-        </div>
-    </section>
-    """
-    
-    html += categories_html
-    html += '\n</div>'
-    
-    return html
+    return render_template(
+        'article_feed.html',
+        hero=generate_hero_article(featured[0]) if featured else None,
+        cards=[generate_article_card(article) for article in recent[:6]]
+    )
 
 def generate_article_feed_styles():
     """Generate CSS for the article feed."""
@@ -0,0 +1,379 @@
+#!/usr/bin/env python
+"""
+ReasonPath Glossary Manager
+Stores the AI dictionary and benchmark results in SQLite and exports the public JSON
+
+Usage:
+    python database/glossary_manager.py import
+    python database/glossary_manager.py export [--force]
+    python database/glossary_manager.py search "attention"
+"""
+
+import argparse
+import html
+import json
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from article_manager import ArticleDatabase
+from site_builder import WEBSITE_ROOT, write_file_atomic
+
+DICTIONARY_SOURCE = os.path.join(WEBSITE_ROOT, 'data', 'dictionary.json')
+BENCHMARKS_SOURCE = os.path.join(WEBSITE_ROOT, 'public', 'data', 'benchmarks.json')
+
+# Files regenerated by export; the dictionary is still read from data/ by the build scripts
+DICTIONARY_EXPORTS = (
+    DICTIONARY_SOURCE,
+    os.path.join(WEBSITE_ROOT, 'public', 'data', 'dictionary.json'),
+)
+BENCHMARKS_EXPORTS = (BENCHMARKS_SOURCE,)
+
+# Glossary columns in JSON export order (slug is exported as "id")
+TERM_FIELDS = ('term', 'category', 'difficulty', 'definition', 'analogy', 'example', 'related')
+
+
+# Arrays and objects of scalars stay on one line if it fits in this many characters
+JSON_LINE_WIDTH = 120
+
+
+def format_json(value, indent: int = 0, prefix: int = 0) -> str:
+    """
+    JSON in the layout of the checked-in data files: two-space indents, with
+    short arrays and objects that hold only scalars kept on one line.
+    prefix is the width of whatever precedes value on its line.
+    """
+    if not isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    children = value.values() if isinstance(value, dict) else value
+    if all(not isinstance(child, (dict, list)) for child in children):
+        inline = json.dumps(value, ensure_ascii=False)
+        if not value or prefix + len(inline) + 1 <= JSON_LINE_WIDTH:
+            return inline
+    pad = '  ' * (indent + 1)
+    if isinstance(value, dict):
+        body = []
+        for key, child in value.items():
+            head = f"{pad}{json.dumps(key, ensure_ascii=False)}: "
+            body.append(head + format_json(child, indent + 1, len(head)))
+        brackets = '{}'
+    else:
+        body = [pad + format_json(child, indent + 1, len(pad)) for child in value]
+        brackets = '[]'
+    return brackets[0] + '\n' + ',\n'.join(body) + '\n' + '  ' * indent + brackets[1]
+
+
+class GlossaryDatabase:
+    """
+    The AI dictionary and benchmark results, stored next to the articles.
+
+    Imports upsert by slug and only touch rows whose values changed, so
+    re-importing an unchanged file is a no-op. Triggers bump a per-dataset
+    revision in dataset_revisions on every row change; export() rewrites
+    the public JSON only when that revision moved since the last export.
+    """
+
+    def __init__(self, db: ArticleDatabase):
+        self.db = db
+        self.pool = db.pool
+
+    # --- Import ---
+
+    def import_terms(self, terms: Iterable[Dict], prune: bool = True) -> Dict:
+        """Upsert dictionary terms, keeping file order; returns row counts."""
+        rows = [
+            (term['id'], term['term'], term['category'], term['difficulty'], term['definition'],
+             term.get('analogy'), term.get('example'), json.dumps(term.get('related') or []), position)
+            for position, term in enumerate(terms)
+        ]
+        with self.pool.writer() as conn:
+            return self._upsert(conn, 'glossary_terms', """
+                INSERT INTO glossary_terms (
+                    slug, term, category, difficulty, definition, analogy, example, related, position
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(slug) DO UPDATE SET
+                    term = excluded.term,
+                    category = excluded.category,
+                    difficulty = excluded.difficulty,
+                    definition = excluded.definition,
+                    analogy = excluded.analogy,
+                    example = excluded.example,
+                    related = excluded.related,
+                    position = excluded.position,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE (term, category, difficulty, definition, analogy, example, related, position)
+                   IS NOT (excluded.term, excluded.category, excluded.difficulty, excluded.definition,
+                           excluded.analogy, excluded.example, excluded.related, excluded.position)
+            """, rows, prune)
+
+    def import_benchmarks(self, data: Dict, prune: bool = True) -> Dict:
+        """Upsert benchmarks.json ({"benchmarks": {...}, "categories": [...]}); returns row counts."""
+        rows = [
+            (slug, record.get('title') or slug, record.get('description'), record.get('category'),
+             json.dumps(record, ensure_ascii=False), position)
+            for position, (slug, record) in enumerate(data.get('benchmarks', {}).items())
+        ]
+        categories = [
+            (category['id'], category.get('title') or category['id'],
+             json.dumps(category.get('benchmarks') or []), position)
+            for position, category in enumerate(data.get('categories', []))
+        ]
+        with self.pool.writer() as conn:
+            counts = self._upsert(conn, 'benchmarks', """
+                INSERT INTO benchmarks (slug, title, description, category, data, position)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(slug) DO UPDATE SET
+                    title = excluded.title,
+                    description = excluded.description,
+                    category = excluded.category,
+                    data = excluded.data,
+                    position = excluded.position,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE (title, description, category, data, position)
+                   IS NOT (excluded.title, excluded.description, excluded.category,
+                           excluded.data, excluded.position)
+            """, rows, prune)
+            category_counts = self._upsert(conn, 'benchmark_categories', """
+                INSERT INTO benchmark_categories (slug, title, benchmarks, position)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(slug) DO UPDATE SET
+                    title = excluded.title,
+                    benchmarks = excluded.benchmarks,
+                    position = excluded.position
+                WHERE (title, benchmarks, position)
+                   IS NOT (excluded.title, excluded.benchmarks, excluded.position)
+            """, categories, prune)
+        return {key: counts[key] + category_counts[key] for key in counts}
+
+    def _upsert(self, conn, table: str, sql: str, rows: List[tuple], prune: bool) -> Dict:
+        """Run an upsert keyed on slug (the first column) and optionally delete missing slugs."""
+        existing = {row[0] for row in conn.execute(f"SELECT slug FROM {table}")}
+        slugs = {row[0] for row in rows}
+        inserted = len(slugs - existing)
+        # rowcount counts inserts plus updates whose WHERE matched, not skipped rows
+        changed = conn.executemany(sql, rows).rowcount
+        deleted = 0
+        if prune and existing - slugs:
+            deleted = conn.executemany(
+                f"DELETE FROM {table} WHERE slug = ?", [(slug,) for slug in existing - slugs]
+            ).rowcount
+        return {
+            'inserted': inserted,
+            'updated': changed - inserted,
+            'deleted': deleted,
+            'unchanged': len(rows) - changed,
+        }
+
+    # --- Queries ---
+
+    def _term_from_row(self, row) -> Dict:
+        term = {'id': row['slug']}
+        for field in TERM_FIELDS:
+            term[field] = row[field]
+        term['related'] = json.loads(row['related'] or '[]')
+        return term
+
+    def get_term(self, slug: str) -> Optional[Dict]:
+        """Get one term by slug."""
+        with self.pool.reader() as conn:
+            row = conn.execute("SELECT * FROM glossary_terms WHERE slug = ?", (slug,)).fetchone()
+        return self._term_from_row(row) if row else None
+
+    def _term_filters(self, category: str = None, difficulty: str = None) -> Tuple[str, list]:
+        conditions, params = [], []
+        if category:
+            conditions.append("category = ?")
+            params.append(category)
+        if difficulty:
+            conditions.append("difficulty = ?")
+            params.append(difficulty)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, params
+
+    def get_terms(self, category: str = None, difficulty: str = None,
+                  limit: int = None, offset: int = 0) -> List[Dict]:
+        """Get terms in export order, optionally filtered by category and/or difficulty."""
+        where, params = self._term_filters(category, difficulty)
+        with self.pool.reader() as conn:
+            rows = conn.execute(f"""
+                SELECT * FROM glossary_terms {where}
+                ORDER BY position
+                LIMIT ? OFFSET ?
+            """, params + [-1 if limit is None else limit, offset]).fetchall()
+        return [self._term_from_row(row) for row in rows]
+
+    def count_terms(self, category: str = None, difficulty: str = None) -> int:
+        """Count terms matching the same filters as get_terms."""
+        where, params = self._term_filters(category, difficulty)
+        with self.pool.reader() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM glossary_terms {where}", params).fetchone()[0]
+
+    def get_term_facets(self) -> Dict[str, Dict[str, int]]:
+        """Term counts per category and per difficulty."""
+        facets = {}
+        with self.pool.reader() as conn:
+            for facet in ('category', 'difficulty'):
+                facets[facet] = {
+                    row[0]: row[1] for row in conn.execute(
+                        f"SELECT {facet}, COUNT(*) FROM glossary_terms GROUP BY {facet} ORDER BY {facet}"
+                    )
+                }
+        return facets
+
+    def search_terms(self, query: str, limit: int = 20) -> List[Dict]:
+        """Search terms by name, definition or analogy, ranked by BM25.
+
+        Accepts the same syntax as ArticleDatabase.search_articles; each
+        result carries a 'snippet' of its definition with <mark> highlights.
+        """
+        match = self.db.build_search_query(query)
+        if not match:
+            return []
+
+        with self.pool.reader() as conn:
+            rows = conn.execute("""
+                SELECT g.*, snippet(glossary_fts, 1, char(2), char(3), '…', 24) AS snippet
+                FROM glossary_fts
+                JOIN glossary_terms g ON g.id = glossary_fts.rowid
+                WHERE glossary_fts MATCH ?
+                ORDER BY bm25(glossary_fts, 10.0, 2.0, 1.0)
+                LIMIT ?
+            """, (match, limit)).fetchall()
+
+        terms = []
+        for row in rows:
+            term = self._term_from_row(row)
+            term['snippet'] = (
+                html.escape(row['snippet'] or '')
+                .replace('\x02', '<mark>')
+                .replace('\x03', '</mark>')
+            )
+            terms.append(term)
+        return terms
+
+    def get_benchmarks(self, category: str = None) -> List[Dict]:
+        """Get benchmark records in export order, optionally for one category title."""
+        where, params = ("WHERE category = ?", [category]) if category else ("", [])
+        with self.pool.reader() as conn:
+            rows = conn.execute(f"SELECT data FROM benchmarks {where} ORDER BY position", params)
+            return [json.loads(row['data']) for row in rows]
+
+    def rebuild_search_index(self):
+        """Rebuild the glossary full-text index from glossary_terms."""
+        with self.pool.writer() as conn:
+            conn.execute("INSERT INTO glossary_fts (glossary_fts) VALUES ('rebuild')")
+            conn.execute("INSERT INTO glossary_fts (glossary_fts) VALUES ('optimize')")
+
+    # --- Export ---
+
+    def dictionary_document(self) -> List[Dict]:
+        return self.get_terms()
+
+    def benchmarks_document(self) -> Dict:
+        with self.pool.reader() as conn:
+            benchmarks = {
+                row['slug']: json.loads(row['data'])
+                for row in conn.execute("SELECT slug, data FROM benchmarks ORDER BY position")
+            }
+            categories = [
+                {'id': row['slug'], 'title': row['title'], 'benchmarks': json.loads(row['benchmarks'] or '[]')}
+                for row in conn.execute("SELECT * FROM benchmark_categories ORDER BY position")
+            ]
+        return {'benchmarks': benchmarks, 'categories': categories}
+
+    def revision(self, name: str) -> Tuple[int, int]:
+        """Return (revision, exported_revision) for a dataset."""
+        with self.pool.reader() as conn:
+            row = conn.execute(
+                "SELECT revision, exported_revision FROM dataset_revisions WHERE name = ?", (name,)
+            ).fetchone()
+        return (row['revision'], row['exported_revision']) if row else (0, -1)
+
+    def export(self, name: str, paths: Iterable[str], force: bool = False) -> int:
+        """
+        Write a dataset's JSON to paths if its rows changed since the last
+        export (or a file is missing). Returns how many files were rewritten;
+        files whose bytes would not change are left alone.
+        """
+        paths = list(paths)
+        # Read the revision before the rows: a write in between only causes
+        # one redundant export next time, never a missed one
+        revision, exported = self.revision(name)
+        if not force and revision == exported and all(os.path.exists(path) for path in paths):
+            return 0
+
+        document = self.dictionary_document() if name == 'glossary' else self.benchmarks_document()
+        data = format_json(document).encode('utf-8')
+        written = 0
+        for path in paths:
+            try:
+                with open(path, 'rb') as f:
+                    if f.read() == data:
+                        continue
+            except FileNotFoundError:
+                pass
+            write_file_atomic(path, data)
+            written += 1
+
+        with self.pool.writer() as conn:
+            conn.execute(
+                "UPDATE dataset_revisions SET exported_revision = ? WHERE name = ?", (revision, name)
+            )
+        return written
+
+    def export_dictionary(self, paths: Iterable[str] = DICTIONARY_EXPORTS, force: bool = False) -> int:
+        return self.export('glossary', paths, force)
+
+    def export_benchmarks(self, paths: Iterable[str] = BENCHMARKS_EXPORTS, force: bool = False) -> int:
+        return self.export('benchmarks', paths, force)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the AI dictionary and benchmark tables")
+    parser.add_argument('--db', default="database/reasonpath.db", help="Path to the article database")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = commands.add_parser('import', help="Load the JSON files into the database")
+    import_parser.add_argument('--dictionary', default=DICTIONARY_SOURCE)
+    import_parser.add_argument('--benchmarks', default=BENCHMARKS_SOURCE)
+    import_parser.add_argument('--keep-missing', action='store_true',
+                               help="Don't delete rows that are missing from the files")
+
+    export_parser = commands.add_parser('export', help="Regenerate the public JSON files if rows changed")
+    export_parser.add_argument('--force', action='store_true', help="Export even if nothing changed")
+
+    search_parser = commands.add_parser('search', help="Search the glossary")
+    search_parser.add_argument('query')
+    search_parser.add_argument('--limit', type=int, default=10)
+
+    args = parser.parse_args()
+
+    with ArticleDatabase(args.db) as db:
+        glossary = GlossaryDatabase(db)
+        if args.command == 'import':
+            for label, path, load in (('dictionary', args.dictionary, glossary.import_terms),
+                                      ('benchmarks', args.benchmarks, glossary.import_benchmarks)):
+                with open(path, 'r', encoding='utf-8') as f:
+                    counts = load(json.load(f), prune=not args.keep_missing)
+                print(f"✓ {label}: {counts['inserted']} inserted, {counts['updated']} updated, "
+                      f"{counts['deleted']} deleted, {counts['unchanged']} unchanged")
+        elif args.command == 'export':
+            for label, export in (('dictionary', glossary.export_dictionary),
+                                  ('benchmarks', glossary.export_benchmarks)):
+                written = export(force=args.force)
+                if written:
+                    print(f"✓ {label}: {written} files written")
+                else:
+                    print(f"ℹ️  {label}: unchanged, nothing written")
+        else:
+            start = time.perf_counter()
+            results = glossary.search_terms(args.query, limit=args.limit)
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"{len(results)} results for {args.query!r} ({elapsed:.1f} ms)")
+            for term in results:
+                print(f"\n- {term['term']} ({term['id']}, {term['category']})")
+                print(f"  {term['snippet']}")
+
+
+if __name__ == "__main__":
+    main()
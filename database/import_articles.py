@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+"""
+ReasonPath Bulk Article Importer
+Streams articles from a JSONL file or a directory of Markdown files into the database
+
+Usage:
+    python database/import_articles.py archive.jsonl
+    python database/import_articles.py posts/ --status published
+
+JSONL: one object per line with the same keys as ArticleDatabase.create_article
+(plus optional slug and published_at).
+
+Markdown: one .md file per article with optional front matter:
+    ---
+    title: Understanding Context Windows
+    tags: [LLM, Tutorial]
+    categories: AI Fundamentals
+    featured: true
+    status: published
+    ---
+    # Understanding Context Windows
+    ...
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from typing import Dict, Iterator
+
+from article_manager import ArticleDatabase
+
+LIST_FIELDS = ('tags', 'categories', 'ai_sources')
+
+def read_jsonl(path: str) -> Iterator[Dict]:
+    """Yield articles from a JSON Lines file, one line at a time."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_number}: invalid JSON ({e})") from e
+
+def parse_front_matter_value(key: str, value: str):
+    """Convert a front matter string into the type the importer expects."""
+    value = value.strip()
+    if key in LIST_FIELDS:
+        value = value.strip('[]')
+        return [v.strip().strip('"\'') for v in value.split(',') if v.strip()]
+    if key == 'featured':
+        return value.lower() in ('true', 'yes', '1')
+    return value.strip('"\'')
+
+def read_markdown_file(path: str) -> Dict:
+    """Parse a Markdown article with optional front matter."""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+
+    article = {}
+    match = re.match(r'^---\s*\n(.*?)\n---\s*\n', text, re.DOTALL)
+    if match:
+        for line in match.group(1).splitlines():
+            if ':' in line:
+                key, value = line.split(':', 1)
+                key = key.strip()
+                article[key] = parse_front_matter_value(key, value)
+        text = text[match.end():]
+
+    article['content'] = text.strip()
+    if not article.get('title'):
+        heading = re.search(r'^#\s+(.+)$', text, re.MULTILINE)
+        if heading:
+            article['title'] = heading.group(1).strip()
+        else:
+            article['title'] = os.path.splitext(os.path.basename(path))[0].replace('-', ' ').title()
+    return article
+
+def read_markdown_dir(path: str) -> Iterator[Dict]:
+    """Yield articles from every .md file under a directory."""
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith('.md'):
+                yield read_markdown_file(os.path.join(root, name))
+
+def with_defaults(articles: Iterator[Dict], status: str) -> Iterator[Dict]:
+    """Apply command-line defaults to each article."""
+    for article in articles:
+        if status and 'status' not in article:
+            article['status'] = status
+        yield article
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import articles into the ReasonPath database")
+    parser.add_argument('source', help="JSONL file or directory of Markdown files")
+    parser.add_argument('--db', default="database/reasonpath.db", help="Path to the article database")
+    parser.add_argument('--status', choices=['draft', 'published', 'archived'],
+                        help="Status for articles that don't set one (default: draft)")
+    parser.add_argument('--batch-size', type=int, default=5000,
+                        help="Articles per transaction")
+    args = parser.parse_args()
+
+    if os.path.isdir(args.source):
+        articles = read_markdown_dir(args.source)
+    elif os.path.isfile(args.source):
+        articles = read_jsonl(args.source)
+    else:
+        print(f"Source not found: {args.source}")
+        sys.exit(1)
+
+    start = time.perf_counter()
+
+    def report(count):
+        elapsed = time.perf_counter() - start
+        print(f"  {count:,} articles imported ({count / elapsed:,.0f} articles/sec)")
+
+    print(f"Importing from {args.source}...")
+    with ArticleDatabase(args.db) as db:
+        count = db.bulk_create_articles(
+            with_defaults(articles, args.status),
+            batch_size=args.batch_size,
+            on_batch=report
+        )
+
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed else 0
+    print(f"✓ Imported {count:,} articles in {elapsed:.2f}s ({rate:,.0f} articles/sec)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,490 @@
+"""
+ReasonPath Instrumentation
+Timers, SQL tracing and a slow-query log for ArticleDatabase, exported as JSON or Prometheus text
+
+Nothing here runs until instrument() is called: the database's methods are
+the plain class methods and its pool hands out raw sqlite3 connections.
+Enabling method timing replaces the methods listed in
+article_manager.INSTRUMENTED_METHODS on that one instance, and installs a
+sqlite3 trace callback that counts the statements each call issues.
+Enabling SQL timing also makes the pool hand out TimedConnection wrappers,
+which time every statement (execute plus fetching its rows) and feed the
+slow-query log. MetricsServer serves the figures on a local port.
+"""
+
+import functools
+import http.server
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional
+
+METRICS_PORT = 9108
+
+# Statements slower than this are kept in the slow-query log
+SLOW_QUERY_MS = 100.0
+SLOW_LOG_SIZE = 200
+
+# Distinct statements tracked; later ones are counted under OTHER_STATEMENT
+MAX_STATEMENTS = 500
+OTHER_STATEMENT = '(other)'
+
+WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_sql(sql: str) -> str:
+    """Collapse whitespace so the same statement always gets the same key."""
+    return WHITESPACE.sub(' ', sql).strip()
+
+
+def count_rows(result) -> int:
+    """Rows an ArticleDatabase method returned: list length, a page's articles, or one dict."""
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, dict):
+        articles = result.get('articles')
+        return len(articles) if isinstance(articles, list) else 1
+    return 0
+
+
+class MethodStats:
+    __slots__ = ('calls', 'errors', 'seconds', 'max_seconds', 'rows', 'queries')
+
+    def __init__(self):
+        self.calls = self.errors = self.rows = self.queries = 0
+        self.seconds = self.max_seconds = 0.0
+
+
+class StatementStats:
+    __slots__ = ('calls', 'seconds', 'max_seconds', 'rows')
+
+    def __init__(self):
+        self.calls = self.rows = 0
+        self.seconds = self.max_seconds = 0.0
+
+
+class TimedCursor:
+    """
+    sqlite3.Cursor wrapper that times a statement from execute until its rows are read.
+
+    The statement is recorded once its rows are exhausted (or fetchall
+    returns), when the cursor runs another statement, or when it is closed
+    or dropped, so a fetchone() on a one-row lookup is still counted.
+    """
+
+    __slots__ = ('_cursor', '_instrumentation', '_sql', '_seconds', '_rows')
+
+    def __init__(self, cursor: sqlite3.Cursor, instrumentation: 'Instrumentation'):
+        object.__setattr__(self, '_cursor', cursor)
+        object.__setattr__(self, '_instrumentation', instrumentation)
+        object.__setattr__(self, '_sql', None)
+        object.__setattr__(self, '_seconds', 0.0)
+        object.__setattr__(self, '_rows', 0)
+
+    def _finish(self):
+        if self._sql is not None:
+            self._instrumentation.record_statement(self._sql, self._seconds, self._rows)
+            object.__setattr__(self, '_sql', None)
+
+    def _run(self, method, sql, *args):
+        self._finish()
+        # A new statement starts here, so identical text is not a trigger repeat
+        self._instrumentation._local.last_sql = None
+        start = time.perf_counter()
+        try:
+            method(sql, *args)
+        finally:
+            object.__setattr__(self, '_sql', sql)
+            object.__setattr__(self, '_seconds', time.perf_counter() - start)
+            object.__setattr__(self, '_rows', 0)
+        if self._cursor.description is None:
+            # Nothing to fetch (INSERT/UPDATE/DELETE without RETURNING)
+            self._finish()
+        return self
+
+    def execute(self, sql: str, parameters=()):
+        return self._run(self._cursor.execute, sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters):
+        return self._run(self._cursor.executemany, sql, seq_of_parameters)
+
+    def executescript(self, script: str):
+        return self._run(self._cursor.executescript, script)
+
+    def _timed_fetch(self, fetch, *args):
+        start = time.perf_counter()
+        try:
+            return fetch(*args)
+        finally:
+            object.__setattr__(self, '_seconds', self._seconds + time.perf_counter() - start)
+
+    def fetchone(self):
+        row = self._timed_fetch(self._cursor.fetchone)
+        if row is None:
+            self._finish()
+        else:
+            object.__setattr__(self, '_rows', self._rows + 1)
+        return row
+
+    def fetchmany(self, size: int = None):
+        rows = self._timed_fetch(self._cursor.fetchmany, size or self._cursor.arraysize)
+        object.__setattr__(self, '_rows', self._rows + len(rows))
+        if not rows:
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        rows = self._timed_fetch(self._cursor.fetchall)
+        object.__setattr__(self, '_rows', self._rows + len(rows))
+        self._finish()
+        return rows
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            row = self._timed_fetch(self._cursor.__next__)
+        except StopIteration:
+            self._finish()
+            raise
+        object.__setattr__(self, '_rows', self._rows + 1)
+        return row
+
+    def close(self):
+        self._finish()
+        self._cursor.close()
+
+    def __del__(self):
+        try:
+            self._finish()
+        except Exception:
+            pass
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        # row_factory, arraysize and the like belong to the real cursor
+        setattr(self._cursor, name, value)
+
+
+class TimedConnection:
+    """sqlite3.Connection wrapper whose cursors are TimedCursors; everything else passes through."""
+
+    __slots__ = ('_conn', '_instrumentation')
+
+    def __init__(self, conn: sqlite3.Connection, instrumentation: 'Instrumentation'):
+        object.__setattr__(self, '_conn', conn)
+        object.__setattr__(self, '_instrumentation', instrumentation)
+
+    def cursor(self) -> TimedCursor:
+        return TimedCursor(self._conn.cursor(), self._instrumentation)
+
+    def execute(self, sql: str, parameters=()) -> TimedCursor:
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters) -> TimedCursor:
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, script: str) -> TimedCursor:
+        return self.cursor().executescript(script)
+
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._conn.__exit__(*exc)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._conn, name, value)
+
+
+class Instrumentation:
+    """
+    Per-method and per-statement statistics for one ArticleDatabase.
+
+    Method figures are inclusive: a public method that calls another
+    counts that call's time and queries too. Queries are statements run
+    by SQLite on the calling thread, not counting trigger bodies.
+    """
+
+    def __init__(self, db, methods: Iterable[str], slow_query_ms: float = SLOW_QUERY_MS,
+                 slow_log_path: Optional[str] = None):
+        self.db = db
+        self.method_names = list(methods)
+        self.slow_query_seconds = slow_query_ms / 1000
+        self.slow_log_path = slow_log_path
+        self.slow_queries = deque(maxlen=SLOW_LOG_SIZE)
+        self.slow_total = 0
+        self.methods: Dict[str, MethodStats] = {}
+        self.statements: Dict[str, StatementStats] = {}
+        self.methods_enabled = False
+        self.sql_enabled = False
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._keys: Dict[str, str] = {}  # raw SQL -> normalize_sql(sql)
+
+    def enable(self, sql: bool = False) -> 'Instrumentation':
+        """Time the database's methods; sql=True also times every statement."""
+        if not self.methods_enabled:
+            for name in self.method_names:
+                setattr(self.db, name, self._wrap(name, getattr(type(self.db), name)))
+            self.db.pool.add_connect_hook(self._install_trace)
+            self.methods_enabled = True
+        if sql and not self.sql_enabled:
+            self.db.pool.wrapper = self._timed_connection
+            self.sql_enabled = True
+        return self
+
+    def disable(self):
+        """Restore the plain methods and connections; collected figures are kept."""
+        if self.sql_enabled:
+            self.db.pool.wrapper = None
+            self.sql_enabled = False
+        if self.methods_enabled:
+            for name in self.method_names:
+                self.db.__dict__.pop(name, None)
+            self.db.pool.remove_connect_hook(self._install_trace, undo=self._remove_trace)
+            self.methods_enabled = False
+
+    def reset(self):
+        """Forget everything collected so far."""
+        with self._lock:
+            self.methods.clear()
+            self.statements.clear()
+            self.slow_queries.clear()
+            self.slow_total = 0
+            self.started = time.time()
+
+    def _install_trace(self, conn: sqlite3.Connection):
+        conn.set_trace_callback(self._count_statement)
+
+    def _remove_trace(self, conn: sqlite3.Connection):
+        conn.set_trace_callback(None)
+
+    def _count_statement(self, sql: str):
+        # Trigger and FTS sub-statements arrive as "-- ..." lines, and the
+        # outer statement's text is repeated once per trigger it fires. The
+        # callback can't tell a repeat from a rerun, so _wrap and TimedCursor
+        # clear last_sql wherever a new statement must begin
+        if sql.startswith('--'):
+            return
+        local = self._local
+        if sql != getattr(local, 'last_sql', None):
+            local.statements = getattr(local, 'statements', 0) + 1
+            local.last_sql = sql
+
+    def _timed_connection(self, conn: sqlite3.Connection) -> TimedConnection:
+        return TimedConnection(conn, self)
+
+    def _wrap(self, name: str, function: Callable) -> Callable:
+        db = self.db
+        local = self._local
+
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            outer = getattr(local, 'method', None)
+            local.method = name
+            before = getattr(local, 'statements', 0)
+            local.last_sql = None
+            start = time.perf_counter()
+            failed = True
+            result = None
+            try:
+                result = function(db, *args, **kwargs)
+                failed = False
+                return result
+            finally:
+                elapsed = time.perf_counter() - start
+                local.method = outer
+                queries = getattr(local, 'statements', 0) - before
+                self.record_method(name, elapsed, count_rows(result), queries, failed)
+
+        return timed
+
+    def record_method(self, name: str, seconds: float, rows: int, queries: int, failed: bool = False):
+        with self._lock:
+            stats = self.methods.get(name)
+            if stats is None:
+                stats = self.methods[name] = MethodStats()
+            stats.calls += 1
+            stats.errors += failed
+            stats.seconds += seconds
+            stats.rows += rows
+            stats.queries += queries
+            if seconds > stats.max_seconds:
+                stats.max_seconds = seconds
+
+    def record_statement(self, sql: str, seconds: float, rows: int):
+        text = self._keys.get(sql)
+        if text is None:
+            text = normalize_sql(sql)
+            if len(self._keys) < MAX_STATEMENTS * 4:
+                self._keys[sql] = text
+        key = text
+        slow = seconds >= self.slow_query_seconds
+        with self._lock:
+            stats = self.statements.get(key)
+            if stats is None:
+                if len(self.statements) >= MAX_STATEMENTS:
+                    key = OTHER_STATEMENT
+                    stats = self.statements.get(key)
+                if stats is None:
+                    stats = self.statements[key] = StatementStats()
+            stats.calls += 1
+            stats.seconds += seconds
+            stats.rows += rows
+            if seconds > stats.max_seconds:
+                stats.max_seconds = seconds
+            if slow:
+                entry = {
+                    'at': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime()),
+                    'ms': round(seconds * 1000, 3),
+                    'rows': rows,
+                    'method': getattr(self._local, 'method', None),
+                    'sql': text,
+                }
+                self.slow_queries.append(entry)
+                self.slow_total += 1
+        if slow and self.slow_log_path:
+            with open(self.slow_log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
+
+    def snapshot(self, top: int = 50) -> Dict:
+        """Everything collected, as plain data (statements sorted by total time)."""
+        with self._lock:
+            methods = {
+                name: {
+                    'calls': s.calls, 'errors': s.errors, 'seconds': round(s.seconds, 6),
+                    'max_ms': round(s.max_seconds * 1000, 3),
+                    'avg_ms': round(s.seconds / s.calls * 1000, 3) if s.calls else 0.0,
+                    'rows': s.rows, 'queries': s.queries,
+                }
+                for name, s in sorted(self.methods.items())
+            }
+            statements = [
+                {'sql': sql, 'calls': s.calls, 'seconds': round(s.seconds, 6),
+                 'max_ms': round(s.max_seconds * 1000, 3), 'rows': s.rows}
+                for sql, s in sorted(self.statements.items(), key=lambda item: -item[1].seconds)[:top]
+            ]
+            slow = list(self.slow_queries)
+            slow_total = self.slow_total
+        return {
+            'since': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(self.started)),
+            'methods_enabled': self.methods_enabled,
+            'sql_enabled': self.sql_enabled,
+            'slow_query_ms': self.slow_query_seconds * 1000,
+            'methods': methods,
+            'statements': statements,
+            'slow_queries_total': slow_total,
+            'slow_queries': slow,
+        }
+
+    def to_json(self, top: int = 50) -> str:
+        return json.dumps(self.snapshot(top), indent=2)
+
+    def to_prometheus(self, top: int = 50) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        data = self.snapshot(top)
+        lines: List[str] = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_text = ','.join(f'{key}="{_escape_label(val)}"' for key, val in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+        methods = data['methods'].items()
+        metric('reasonpath_db_method_calls_total', 'counter', "ArticleDatabase method calls",
+               [({'method': m}, s['calls']) for m, s in methods])
+        metric('reasonpath_db_method_errors_total', 'counter', "ArticleDatabase method calls that raised",
+               [({'method': m}, s['errors']) for m, s in methods])
+        metric('reasonpath_db_method_seconds_total', 'counter', "Time spent in ArticleDatabase methods",
+               [({'method': m}, s['seconds']) for m, s in methods])
+        metric('reasonpath_db_method_max_seconds', 'gauge', "Slowest single call",
+               [({'method': m}, s['max_ms'] / 1000) for m, s in methods])
+        metric('reasonpath_db_method_rows_total', 'counter', "Rows (articles) returned",
+               [({'method': m}, s['rows']) for m, s in methods])
+        metric('reasonpath_db_method_queries_total', 'counter', "SQL statements issued",
+               [({'method': m}, s['queries']) for m, s in methods])
+        if data['sql_enabled'] or data['statements']:
+            statements = data['statements']
+            metric('reasonpath_db_statement_calls_total', 'counter', "Executions per statement",
+                   [({'sql': s['sql']}, s['calls']) for s in statements])
+            metric('reasonpath_db_statement_seconds_total', 'counter', "Time per statement, execute plus fetch",
+                   [({'sql': s['sql']}, s['seconds']) for s in statements])
+            metric('reasonpath_db_statement_rows_total', 'counter', "Rows fetched per statement",
+                   [({'sql': s['sql']}, s['rows']) for s in statements])
+        metric('reasonpath_db_slow_queries_total', 'counter',
+               f"Statements slower than {data['slow_query_ms']:g} ms",
+               [({}, data['slow_queries_total'])])
+        return '\n'.join(lines) + '\n'
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+class MetricsServer:
+    """
+    Local HTTP endpoint for an Instrumentation.
+
+    GET /metrics is Prometheus text, /metrics.json the JSON snapshot.
+    Binds to 127.0.0.1 by default and runs on a daemon thread.
+    """
+
+    def __init__(self, instrumentation: Instrumentation, host: str = '127.0.0.1',
+                 port: int = METRICS_PORT):
+        self.instrumentation = instrumentation
+        outer = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split('?', 1)[0]
+                if path == '/metrics':
+                    body = outer.instrumentation.to_prometheus().encode('utf-8')
+                    content_type = 'text/plain; version=0.0.4; charset=utf-8'
+                elif path == '/metrics.json':
+                    body = outer.instrumentation.to_json().encode('utf-8')
+                    content_type = 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('Cache-Control', 'no-store')
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = http.server.ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name='reasonpath-metrics',
+                                       daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self) -> 'MetricsServer':
+        self.thread.start()
+        return self
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
@@ -0,0 +1,319 @@
+#!/usr/bin/env python
+"""
+ReasonPath Markdown Renderer
+Converts article Markdown to HTML with heading anchors and a table of contents
+
+Supports the subset the articles use: ATX headings, paragraphs, bullet and
+numbered lists (nested by indentation), blockquotes, fenced code blocks,
+horizontal rules, and inline code, bold, italic, links, images and
+autolinks. Raw HTML in the source is escaped, not passed through.
+
+Usage:
+    python database/markdown_renderer.py article.md
+    python database/markdown_renderer.py --check
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import re
+import textwrap
+from typing import Dict, List, Tuple
+
+# Bump whenever the output changes; stored renders with an older version are redone
+RENDERER_VERSION = 3
+
+HEADING = re.compile(r'^(#{1,6})[ \t]+(.*?)(?:[ \t]+#+)?[ \t]*$')
+FENCE = re.compile(r'^(`{3,}|~{3,})[ \t]*([\w+-]*)')
+RULE = re.compile(r'^(?:(?:-[ \t]*){3,}|(?:\*[ \t]*){3,}|(?:_[ \t]*){3,})$')
+LIST_ITEM = re.compile(r'^([ \t]*)([-*+]|\d{1,9}[.)])[ \t]+(.*)$')
+QUOTE = re.compile(r'^[ \t]*>[ \t]?(.*)$')
+
+# Inline patterns start with a literal so the regex engine can skip ahead to
+# candidates; alternations (`!?[`, `**|__`) made rendering several times slower
+CODE_SPAN = re.compile(r'`(`*)(.+?)`\1', re.S)
+# Link destinations may hold one level of balanced parentheses: .../Foo_(bar)
+DESTINATION = r'((?:[^()\s]|\([^()\s]*\))+)'
+IMAGE = re.compile(r'!\[([^\]]*)\]\(\s*' + DESTINATION + r'(?:\s+"([^"]*)")?\s*\)')
+LINK = re.compile(r'\[([^\]]*)\]\(\s*' + DESTINATION + r'(?:\s+"([^"]*)")?\s*\)')
+AUTOLINK = re.compile(r'<((?:https?|mailto):[^>\s]+)>')
+STRONG_STAR = re.compile(r'\*\*(?=\S)(.+?)(?<=\S)\*\*')
+STRONG_UNDERSCORE = re.compile(r'\b__(?=\S)(.+?)(?<=\S)__\b')
+EMPHASIS_STAR = re.compile(r'\*(?=\S)(.+?)(?<=\S)\*')
+EMPHASIS_UNDERSCORE = re.compile(r'\b_(?=\S)(.+?)(?<=\S)_\b')
+HARD_BREAK = re.compile(r' {2,}\n')
+TAG = re.compile(r'<[^>]+>')
+PLACEHOLDER = re.compile('\x00(\\d+)\x00')
+
+SAFE_SCHEMES = ('http:', 'https:', 'mailto:')
+
+# Inline cases with known output, run by --check after changing the patterns
+CHECKS = (
+    ('**bold** and *em* `a*b*`', '<strong>bold</strong> and <em>em</em> <code>a*b*</code>'),
+    ('[a](https://x.io "T")', '<a href="https://x.io" title="T">a</a>'),
+    ('[a](https://en.wikipedia.org/wiki/Foo_(bar))', '<a href="https://en.wikipedia.org/wiki/Foo_(bar)">a</a>'),
+    ('![i](/img/f(1).png) end', '<img src="/img/f(1).png" alt="i"> end'),
+    ('[a](javascript:alert(1))', '<a href="#">a</a>'),
+    ('([a](/b)) <https://x.io>', '(<a href="/b">a</a>) <a href="https://x.io">https://x.io</a>'),
+)
+
+# Whole-document cases for --check
+BLOCK_CHECKS = (
+    ('first line  \nsecond line', '<p>first line<br>\nsecond line</p>'),
+    ('one\ntwo  \nthree  ', '<p>one\ntwo<br>\nthree</p>'),
+)
+
+
+def content_hash(content: str) -> str:
+    """Hash of the source plus the renderer version, stored next to each render."""
+    return hashlib.sha1(f"{RENDERER_VERSION}\x00{content}".encode('utf-8')).hexdigest()
+
+
+def safe_url(url: str) -> str:
+    """The URL, escaped for an attribute, or '#' for schemes like javascript:."""
+    scheme = re.match(r'^([a-zA-Z][\w+.-]*):', url)
+    if scheme and scheme.group(0).lower() not in SAFE_SCHEMES:
+        return '#'
+    return html.escape(url)
+
+
+def render_inline(text: str) -> str:
+    """Render inline Markdown in one block of text."""
+    stash = []
+
+    def keep(markup):
+        stash.append(markup)
+        return f'\x00{len(stash) - 1}\x00'
+
+    def code(match):
+        return keep(f'<code>{html.escape(match.group(2).strip())}</code>')
+
+    def image(match):
+        alt, url, title = match.groups()
+        title = f' title="{html.escape(title)}"' if title else ''
+        return keep(f'<img src="{safe_url(url)}" alt="{html.escape(alt)}"{title}>')
+
+    def link(match):
+        label, url, title = match.groups()
+        title = f' title="{html.escape(title)}"' if title else ''
+        return keep(f'<a href="{safe_url(url)}"{title}>{render_inline(label)}</a>')
+
+    def autolink(match):
+        url = match.group(1)
+        return keep(f'<a href="{safe_url(url)}">{html.escape(url)}</a>')
+
+    # Each pattern only runs if its marker character is present at all
+    if '`' in text:
+        text = CODE_SPAN.sub(code, text)
+    if '](' in text:
+        if '![' in text:
+            text = IMAGE.sub(image, text)
+        text = LINK.sub(link, text)
+    if '<' in text:
+        text = AUTOLINK.sub(autolink, text)
+    text = html.escape(text, quote=False)
+    if '*' in text:
+        text = STRONG_STAR.sub(r'<strong>\1</strong>', text)
+        text = EMPHASIS_STAR.sub(r'<em>\1</em>', text)
+    if '_' in text:
+        text = STRONG_UNDERSCORE.sub(r'<strong>\1</strong>', text)
+        text = EMPHASIS_UNDERSCORE.sub(r'<em>\1</em>', text)
+    if '  \n' in text:
+        text = HARD_BREAK.sub('<br>\n', text)
+    # Placeholders can nest (a link label with code), so restore until none are left
+    while stash and PLACEHOLDER.search(text):
+        text = PLACEHOLDER.sub(lambda m: stash[int(m.group(1))], text)
+    return text
+
+
+def heading_anchor(inline_html: str, used: Dict[str, int]) -> str:
+    """GitHub-style anchor for a heading, suffixed -1, -2... when repeated."""
+    text = html.unescape(TAG.sub('', inline_html)).lower()
+    anchor = re.sub(r'[\s]+', '-', re.sub(r'[^\w\s-]', '', text).strip()) or 'section'
+    count = used.get(anchor, 0)
+    used[anchor] = count + 1
+    return anchor if count == 0 else f"{anchor}-{count}"
+
+
+class _Renderer:
+    """One document's block-level pass."""
+
+    def __init__(self):
+        self.toc: List[Dict] = []
+        self.anchors: Dict[str, int] = {}
+
+    def blocks(self, lines: List[str]) -> List[str]:
+        out = []
+        i = 0
+        while i < len(lines):
+            line = lines[i]
+            stripped = line.strip()
+            if not stripped:
+                i += 1
+                continue
+
+            fence = FENCE.match(stripped)
+            if fence:
+                marker = fence.group(1)
+                language = fence.group(2)
+                code = []
+                i += 1
+                while i < len(lines) and not lines[i].strip().startswith(marker):
+                    code.append(lines[i])
+                    i += 1
+                i += 1
+                css = f' class="language-{html.escape(language)}"' if language else ''
+                code_html = html.escape(textwrap.dedent('\n'.join(code)))
+                out.append(f'<pre><code{css}>{code_html}</code></pre>')
+                continue
+
+            heading = HEADING.match(stripped)
+            if heading:
+                out.append(self.heading(len(heading.group(1)), heading.group(2)))
+                i += 1
+                continue
+
+            if RULE.match(stripped):
+                out.append('<hr>')
+                i += 1
+                continue
+
+            if QUOTE.match(line):
+                quoted = []
+                while i < len(lines) and lines[i].strip():
+                    match = QUOTE.match(lines[i])
+                    quoted.append(match.group(1) if match else lines[i])
+                    i += 1
+                out.append('<blockquote>\n' + '\n'.join(self.blocks(quoted)) + '\n</blockquote>')
+                continue
+
+            if LIST_ITEM.match(line):
+                i = self.list(lines, i, out)
+                continue
+
+            # Paragraph: runs until a blank line or the start of another block
+            # Keep trailing spaces: two or more before a newline are a hard break
+            paragraph = [line.lstrip()]
+            i += 1
+            while i < len(lines):
+                following = lines[i].strip()
+                if (not following or HEADING.match(following) or FENCE.match(following)
+                        or QUOTE.match(lines[i]) or LIST_ITEM.match(lines[i]) or RULE.match(following)):
+                    break
+                paragraph.append(lines[i].lstrip())
+                i += 1
+            out.append(f'<p>{render_inline(chr(10).join(paragraph).rstrip())}</p>')
+        return out
+
+    def heading(self, level: int, text: str) -> str:
+        inline = render_inline(text)
+        anchor = heading_anchor(inline, self.anchors)
+        self.toc.append({
+            'level': level,
+            'text': html.unescape(TAG.sub('', inline)),
+            'anchor': anchor,
+        })
+        return f'<h{level} id="{anchor}">{inline}</h{level}>'
+
+    def list(self, lines: List[str], i: int, out: List[str]) -> int:
+        """Render the list starting at lines[i]; returns the index after it."""
+        first = LIST_ITEM.match(lines[i])
+        indent = len(first.group(1))
+        ordered = first.group(2)[0].isdigit()
+
+        def sibling(line):
+            match = LIST_ITEM.match(line)
+            return bool(match) and len(match.group(1)) == indent and match.group(2)[0].isdigit() == ordered
+
+        items = []
+        loose = False
+        while i < len(lines) and sibling(lines[i]):
+            body = [LIST_ITEM.match(lines[i]).group(3)]
+            i += 1
+            # Continuation lines, nested lists and indented blocks after blank lines
+            while i < len(lines):
+                line = lines[i]
+                if not line.strip():
+                    j = i
+                    while j < len(lines) and not lines[j].strip():
+                        j += 1
+                    following = lines[j] if j < len(lines) else ''
+                    if following.strip() and _indent(following) > indent:
+                        body.extend([''] * (j - i))
+                        loose = True
+                        i = j
+                        continue
+                    if following and sibling(following):
+                        loose = True
+                        i = j
+                    break
+                nested = LIST_ITEM.match(line)
+                if nested and len(nested.group(1)) <= indent:
+                    break
+                stripped = line.strip()
+                if not nested and _indent(line) <= indent and (
+                        HEADING.match(stripped) or FENCE.match(stripped) or RULE.match(stripped)):
+                    break
+                body.append(line)
+                i += 1
+            items.append(body)
+
+        tag = 'ol' if ordered else 'ul'
+        start = ''
+        if ordered:
+            number = int(first.group(2)[:-1])
+            start = f' start="{number}"' if number != 1 else ''
+        rendered = []
+        for body in items:
+            lines = [body[0]]
+            if len(body) > 1:
+                lines += textwrap.dedent('\n'.join(body[1:])).split('\n')
+            inner = self.blocks(lines)
+            if not loose:
+                # Tight lists keep their text out of <p> elements
+                inner = [block[3:-4] if block.startswith('<p>') else block for block in inner]
+            rendered.append(f"<li>{chr(10).join(inner)}</li>")
+        out.append(f'<{tag}{start}>\n' + '\n'.join(rendered) + f'\n</{tag}>')
+        return i
+
+
+def _indent(line: str) -> int:
+    return len(line) - len(line.lstrip())
+
+
+def render_markdown(content: str) -> Tuple[str, List[Dict]]:
+    """Render Markdown to (html, toc); toc lists every heading's level, text and anchor."""
+    renderer = _Renderer()
+    # NUL marks inline placeholders, so it is replaced like CommonMark does
+    content = content.replace('\x00', '\ufffd').replace('\r\n', '\n').expandtabs(4)
+    lines = textwrap.dedent(content).split('\n')
+    return '\n'.join(renderer.blocks(lines)), renderer.toc
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a Markdown file to HTML")
+    parser.add_argument('path', nargs='?', help="Markdown file")
+    parser.add_argument('--toc', action='store_true', help="Print the table of contents as JSON")
+    parser.add_argument('--check', action='store_true', help="Run the built-in inline rendering checks")
+    args = parser.parse_args()
+
+    if args.check:
+        failed = 0
+        cases = [(source, expected, render_inline(source)) for source, expected in CHECKS]
+        cases += [(source, expected, render_markdown(source)[0]) for source, expected in BLOCK_CHECKS]
+        for source, expected, actual in cases:
+            if actual != expected:
+                failed += 1
+                print(f"✗ {source!r}\n    expected {expected!r}\n    got      {actual!r}")
+        print(f"{'✗' if failed else '✓'} {len(cases) - failed}/{len(cases)} checks passed")
+        raise SystemExit(1 if failed else 0)
+    if not args.path:
+        parser.error("a Markdown file is required")
+    with open(args.path, 'r', encoding='utf-8') as f:
+        rendered, toc = render_markdown(f.read())
+    print(json.dumps(toc, indent=2) if args.toc else rendered)
+
+
+if __name__ == "__main__":
+    main()
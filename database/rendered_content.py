@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+"""
+ReasonPath Rendered Content
+Render stored article Markdown to HTML once and inspect the results
+
+Usage:
+    python database/rendered_content.py build [--force]
+    python database/rendered_content.py show <slug> [--toc]
+"""
+
+import argparse
+import json
+import sys
+import time
+from article_manager import ArticleDatabase
+
+def build(db: ArticleDatabase, force: bool):
+    """Render every article with a missing or stale render."""
+    start = time.perf_counter()
+    report = db.render_all_content(force=force)
+    elapsed = time.perf_counter() - start
+    print(f"✓ Rendered {report['rendered']:,} articles, "
+          f"{report['unchanged']:,} unchanged in {elapsed:.2f}s")
+
+def show(db: ArticleDatabase, slug: str, toc: bool) -> bool:
+    """Print an article's rendered HTML or table of contents; returns False if not found."""
+    article = db.get_article_by_slug(slug, record_view=False)
+    if article is None:
+        print(f"✗ No article {slug!r}")
+        return False
+    db.attach_rendered_content([article])
+    print(json.dumps(article['toc'], indent=2) if toc else article['content_html'])
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage rendered article HTML")
+    parser.add_argument('--db', default="database/reasonpath.db", help="Path to the article database")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = commands.add_parser('build', help="Render articles whose Markdown changed")
+    build_parser.add_argument('--force', action='store_true', help="Re-render every article")
+    show_parser = commands.add_parser('show', help="Print one article's rendered HTML")
+    show_parser.add_argument('slug')
+    show_parser.add_argument('--toc', action='store_true', help="Print the table of contents instead")
+
+    args = parser.parse_args()
+
+    with ArticleDatabase(args.db) as db:
+        if args.command == 'build':
+            build(db, args.force)
+        elif not show(db, args.slug, args.toc):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -99,14 +99,327 @@ CREATE TABLE IF NOT EXISTS article_metrics (
     UNIQUE(article_id, date)
 );
 
+-- Rendered article content, redone only when the content hash changes
+-- (hash covers the Markdown source and the renderer version)
+CREATE TABLE IF NOT EXISTS article_html (
+    article_id INTEGER PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    html TEXT NOT NULL,
+    toc TEXT NOT NULL, -- JSON list of {level, text, anchor}
+    rendered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (article_id) REFERENCES articles(id) ON DELETE CASCADE
+);
+
+-- Full-text search index over article text (external content: rows live in articles)
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title,
+    excerpt,
+    content,
+    content='articles',
+    content_rowid='id',
+    tokenize='porter unicode61'
+);
+
+-- Keep the search index in sync with articles
+CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts (rowid, title, excerpt, content)
+    VALUES (new.id, new.title, new.excerpt, new.content);
+END;
+
+CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, excerpt, content)
+    VALUES ('delete', old.id, old.title, old.excerpt, old.content);
+END;
+
+CREATE TRIGGER IF NOT EXISTS articles_fts_update
+AFTER UPDATE OF title, excerpt, content ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, excerpt, content)
+    VALUES ('delete', old.id, old.title, old.excerpt, old.content);
+    INSERT INTO articles_fts (rowid, title, excerpt, content)
+    VALUES (new.id, new.title, new.excerpt, new.content);
+END;
+
+-- AI dictionary terms (exported to data/dictionary.json and public/data/dictionary.json)
+CREATE TABLE IF NOT EXISTS glossary_terms (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    slug TEXT UNIQUE NOT NULL, -- the term's "id" in the JSON export
+    term TEXT NOT NULL,
+    category TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    definition TEXT NOT NULL,
+    analogy TEXT,
+    example TEXT,
+    related TEXT, -- JSON array of related term slugs
+    position INTEGER NOT NULL DEFAULT 0, -- order in the JSON export
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Full-text search over term names and definitions (external content)
+CREATE VIRTUAL TABLE IF NOT EXISTS glossary_fts USING fts5(
+    term,
+    definition,
+    analogy,
+    content='glossary_terms',
+    content_rowid='id',
+    tokenize='porter unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS glossary_fts_insert AFTER INSERT ON glossary_terms BEGIN
+    INSERT INTO glossary_fts (rowid, term, definition, analogy)
+    VALUES (new.id, new.term, new.definition, new.analogy);
+END;
+
+CREATE TRIGGER IF NOT EXISTS glossary_fts_delete AFTER DELETE ON glossary_terms BEGIN
+    INSERT INTO glossary_fts (glossary_fts, rowid, term, definition, analogy)
+    VALUES ('delete', old.id, old.term, old.definition, old.analogy);
+END;
+
+CREATE TRIGGER IF NOT EXISTS glossary_fts_update
+AFTER UPDATE OF term, definition, analogy ON glossary_terms BEGIN
+    INSERT INTO glossary_fts (glossary_fts, rowid, term, definition, analogy)
+    VALUES ('delete', old.id, old.term, old.definition, old.analogy);
+    INSERT INTO glossary_fts (rowid, term, definition, analogy)
+    VALUES (new.id, new.term, new.definition, new.analogy);
+END;
+
+-- Benchmark results (exported to public/data/benchmarks.json)
+CREATE TABLE IF NOT EXISTS benchmarks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    slug TEXT UNIQUE NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT,
+    category TEXT,
+    data TEXT NOT NULL, -- the full JSON record, exported as-is
+    position INTEGER NOT NULL DEFAULT 0,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS benchmark_categories (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    slug TEXT UNIQUE NOT NULL,
+    title TEXT NOT NULL,
+    benchmarks TEXT, -- JSON array of benchmark slugs
+    position INTEGER NOT NULL DEFAULT 0
+);
+
+-- Bumped by triggers on every row change, so exports can skip unchanged datasets
+CREATE TABLE IF NOT EXISTS dataset_revisions (
+    name TEXT PRIMARY KEY,
+    revision INTEGER NOT NULL DEFAULT 0,
+    exported_revision INTEGER NOT NULL DEFAULT -1
+);
+
+INSERT OR IGNORE INTO dataset_revisions (name) VALUES ('glossary'), ('benchmarks'), ('articles'), ('dimensions');
+
+CREATE TRIGGER IF NOT EXISTS glossary_revision_insert AFTER INSERT ON glossary_terms BEGIN
+    UPDATE dataset_revisions SET revision = revision + 1 WHERE name = 'glossary';
+END;
+
+CREATE TRIGGER IF NOT EXISTS glossary_revision_update AFTER UPDATE ON glossary_terms BEGIN
+    UPDATE dataset_revisions SET revision = revision + 1 WHERE name = 'glossary';
+END;
+
+CREATE TRIGGER IF NOT EXISTS glossary_revision_delete AFTER DELETE ON glossary_terms BEGIN
+    UPDATE dataset_revisions SET revision = revision + 1 WHERE name = 'glossary';
+END;
+
+CREATE TRIGGER IF NOT EXISTS benchmarks_revision_insert AFTER INSERT ON benchmarks BEGIN
+    UPDATE dataset_revisions SET revision = revision + 1 WHERE name = 'benchmarks';
+END;
+
+CREATE TRIGGER IF NOT EXISTS benchmarks_revision_update AFTER UPDATE ON benchmarks BEGIN
+    UPDATE dataset_revisions SET revision = revision + 1 WHERE name = 'benchmarks';
+END;
+
+CREATE TRIGGER IF NOT EXISTS benchmarks_revision_delete AFTER DELETE ON benchmarks BEGIN
+    UPDATE dataset_revisions SET revision = revision + 1 WHERE name = 'benchmarks';
+END;
+
+CREATE TRIGGER IF NOT EXISTS benchmark_categories_revision_insert AFTER INSERT ON benchmark_categories BEGIN
+    UPDATE dataset_revisions SET revision = revision + 1 WHERE name = 'benchmarks';
+END;
+
+CREATE TRIGGER IF NOT EXISTS benchmark_categories_revision_update AFTER UPDATE ON benchmark_categories BEGIN
+    UPDATE dataset_revisions SET revision = revision + 1 WHERE name = 'benchmarks';
+END;
+
+CREATE TRIGGER IF NOT EXISTS benchmark_categories_revision_delete AFTER DELETE ON benchmark_categories BEGIN
+    UPDATE dataset_revisions SET revision = revision + 1 WHERE name = 'benchmarks';
+END;
+
+-- Article content revision, keyed on by the feed cache. View counting only
+-- touches view_count, which is left out of the update trigger's column list.
+CREATE TRIGGER IF NOT EXISTS articles_revision_insert AFTER INSERT ON articles BEGIN
+    UPDATE dataset_revisions SET revision = revision + 1 WHERE name = 'articles';
+END;
+
+CREATE TRIGGER IF NOT EXISTS articles_revision_update
+AFTER UPDATE OF slug, title, subtitle, excerpt, content, author, status, featured, hero_image,
+                thumbnail_image, reading_time, ai_sources, published_at, updated_at,
+                meta_description, meta_keywords ON articles BEGIN
+    UPDATE dataset_revisions SET revision = revision + 1 WHERE name = 'articles';
+END;
+
+CREATE TRIGGER IF NOT EXISTS articles_revision_delete AFTER DELETE ON articles BEGIN
+    UPDATE dataset_revisions SET revision = revision + 1 WHERE name = 'articles';
+END;
+
+CREATE TRIGGER IF NOT EXISTS tags_revision_insert AFTER INSERT ON tags BEGIN
+    UPDATE dataset_revisions SET revision = revision + 1 WHERE name = 'articles';
+END;
+
+CREATE TRIGGER IF NOT EXISTS tags_revision_update AFTER UPDATE ON tags BEGIN
+    UPDATE dataset_revisions SET revision = revision + 1 WHERE name = 'articles';
+END;
+
+CREATE TRIGGER IF NOT EXISTS tags_revision_delete AFTER DELETE ON tags BEGIN
+    UPDATE dataset_revisions SET revision = revision + 1 WHERE name = 'articles';
+END;
+
+CREATE TRIGGER IF NOT EXISTS article_tags_revision_insert AFTER INSERT ON article_tags BEGIN
+    UPDATE dataset_revisions SET revision = revision + 1 WHERE name = 'articles';
+END;
+
+CREATE TRIGGER IF NOT EXISTS article_tags_revision_update AFTER UPDATE ON article_tags BEGIN
+    UPDATE dataset_revisions SET revision = revision + 1 WHERE name = 'articles';
+END;
+
+CREATE TRIGGER IF NOT EXISTS article_tags_revision_delete AFTER DELETE ON article_tags BEGIN
+    UPDATE dataset_revisions SET revision = revision + 1 WHERE name = 'articles';
+END;
+
+CREATE TRIGGER IF NOT EXISTS categories_revision_insert AFTER INSERT ON categories BEGIN
+    UPDATE dataset_revisions SET revision = revision + 1 WHERE name = 'articles';
+END;
+
+CREATE TRIGGER IF NOT EXISTS categories_revision_update AFTER UPDATE ON categories BEGIN
+    UPDATE dataset_revisions SET revision = revision + 1 WHERE name = 'articles';
+END;
+
+CREATE TRIGGER IF NOT EXISTS categories_revision_delete AFTER DELETE ON categories BEGIN
+    UPDATE dataset_revisions SET revision = revision + 1 WHERE name = 'articles';
+END;
+
+CREATE TRIGGER IF NOT EXISTS article_categories_revision_insert AFTER INSERT ON article_categories BEGIN
+    UPDATE dataset_revisions SET revision = revision + 1 WHERE name = 'articles';
+END;
+
+CREATE TRIGGER IF NOT EXISTS article_categories_revision_update AFTER UPDATE ON article_categories BEGIN
+    UPDATE dataset_revisions SET revision = revision + 1 WHERE name = 'articles';
+END;
+
+CREATE TRIGGER IF NOT EXISTS article_categories_revision_delete AFTER DELETE ON article_categories BEGIN
+    UPDATE dataset_revisions SET revision = revision + 1 WHERE name = 'articles';
+END;
+
+-- Tag/category revision, checked by the in-process dimension cache
+
+CREATE TRIGGER IF NOT EXISTS tags_dimensions_insert AFTER INSERT ON tags BEGIN
+    UPDATE dataset_revisions SET revision = revision + 1 WHERE name = 'dimensions';
+END;
+
+CREATE TRIGGER IF NOT EXISTS tags_dimensions_update AFTER UPDATE ON tags BEGIN
+    UPDATE dataset_revisions SET revision = revision + 1 WHERE name = 'dimensions';
+END;
+
+CREATE TRIGGER IF NOT EXISTS tags_dimensions_delete AFTER DELETE ON tags BEGIN
+    UPDATE dataset_revisions SET revision = revision + 1 WHERE name = 'dimensions';
+END;
+
+CREATE TRIGGER IF NOT EXISTS categories_dimensions_insert AFTER INSERT ON categories BEGIN
+    UPDATE dataset_revisions SET revision = revision + 1 WHERE name = 'dimensions';
+END;
+
+CREATE TRIGGER IF NOT EXISTS categories_dimensions_update AFTER UPDATE ON categories BEGIN
+    UPDATE dataset_revisions SET revision = revision + 1 WHERE name = 'dimensions';
+END;
+
+CREATE TRIGGER IF NOT EXISTS categories_dimensions_delete AFTER DELETE ON categories BEGIN
+    UPDATE dataset_revisions SET revision = revision + 1 WHERE name = 'dimensions';
+END;
+
+-- Site-wide counters for get_stats, one row kept current by the triggers below.
+-- Seeded from the tables once; `python database/site_stats.py rebuild` recounts.
+CREATE TABLE IF NOT EXISTS site_stats (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    total_articles INTEGER NOT NULL DEFAULT 0,
+    published_articles INTEGER NOT NULL DEFAULT 0,
+    draft_articles INTEGER NOT NULL DEFAULT 0,
+    total_views INTEGER NOT NULL DEFAULT 0,
+    total_tags INTEGER NOT NULL DEFAULT 0,
+    total_categories INTEGER NOT NULL DEFAULT 0
+);
+
+-- The WHERE keeps the counting subqueries from running once the row exists
+INSERT OR IGNORE INTO site_stats (id, total_articles, published_articles, draft_articles,
+                                  total_views, total_tags, total_categories)
+SELECT 1,
+       (SELECT COUNT(*) FROM articles),
+       (SELECT COUNT(*) FROM articles WHERE status = 'published'),
+       (SELECT COUNT(*) FROM articles WHERE status = 'draft'),
+       (SELECT IFNULL(SUM(view_count), 0) FROM articles),
+       (SELECT COUNT(*) FROM tags),
+       (SELECT COUNT(*) FROM categories)
+WHERE NOT EXISTS (SELECT 1 FROM site_stats);
+
+CREATE TRIGGER IF NOT EXISTS articles_stats_insert AFTER INSERT ON articles BEGIN
+    UPDATE site_stats SET
+        total_articles = total_articles + 1,
+        published_articles = published_articles + (new.status IS 'published'),
+        draft_articles = draft_articles + (new.status IS 'draft'),
+        total_views = total_views + IFNULL(new.view_count, 0)
+    WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS articles_stats_update AFTER UPDATE OF status, view_count ON articles BEGIN
+    UPDATE site_stats SET
+        published_articles = published_articles + (new.status IS 'published') - (old.status IS 'published'),
+        draft_articles = draft_articles + (new.status IS 'draft') - (old.status IS 'draft'),
+        total_views = total_views + IFNULL(new.view_count, 0) - IFNULL(old.view_count, 0)
+    WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS articles_stats_delete AFTER DELETE ON articles BEGIN
+    UPDATE site_stats SET
+        total_articles = total_articles - 1,
+        published_articles = published_articles - (old.status IS 'published'),
+        draft_articles = draft_articles - (old.status IS 'draft'),
+        total_views = total_views - IFNULL(old.view_count, 0)
+    WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS tags_stats_insert AFTER INSERT ON tags BEGIN
+    UPDATE site_stats SET total_tags = total_tags + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS tags_stats_delete AFTER DELETE ON tags BEGIN
+    UPDATE site_stats SET total_tags = total_tags - 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS categories_stats_insert AFTER INSERT ON categories BEGIN
+    UPDATE site_stats SET total_categories = total_categories + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS categories_stats_delete AFTER DELETE ON categories BEGIN
+    UPDATE site_stats SET total_categories = total_categories - 1 WHERE id = 1;
+END;
+
 -- Create indexes for better performance
 CREATE INDEX IF NOT EXISTS idx_articles_slug ON articles(slug);
 CREATE INDEX IF NOT EXISTS idx_articles_status ON articles(status);
 CREATE INDEX IF NOT EXISTS idx_articles_published_at ON articles(published_at);
 CREATE INDEX IF NOT EXISTS idx_articles_featured ON articles(featured);
+CREATE INDEX IF NOT EXISTS idx_articles_status_published ON articles(status, published_at, id);
+-- Covers the site builder's change-detection scan without reading article bodies
+CREATE INDEX IF NOT EXISTS idx_articles_build_signature ON articles(status, published_at, id, updated_at, featured, slug);
 CREATE INDEX IF NOT EXISTS idx_tags_slug ON tags(slug);
 CREATE INDEX IF NOT EXISTS idx_categories_slug ON categories(slug);
 CREATE INDEX IF NOT EXISTS idx_series_slug ON series(slug);
+-- Glossary pages filtered by category or difficulty, in export order
+CREATE INDEX IF NOT EXISTS idx_glossary_category ON glossary_terms(category, position);
+CREATE INDEX IF NOT EXISTS idx_glossary_difficulty ON glossary_terms(difficulty, position);
+CREATE INDEX IF NOT EXISTS idx_glossary_position ON glossary_terms(position);
+CREATE INDEX IF NOT EXISTS idx_benchmarks_category ON benchmarks(category, position);
 
 -- Insert default categories
 INSERT OR IGNORE INTO categories (name, slug, description, sort_order) VALUES
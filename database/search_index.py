@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+"""
+ReasonPath Search Index
+Backfill and query the full-text article search index
+
+Usage:
+    python database/search_index.py rebuild
+    python database/search_index.py search "context window"
+"""
+
+import argparse
+import time
+from article_manager import ArticleDatabase
+
+def rebuild(db: ArticleDatabase):
+    """Rebuild the index from the articles table and report timing."""
+    start = time.perf_counter()
+    db.rebuild_search_index()
+    elapsed = time.perf_counter() - start
+    
+    stats = db.get_stats()
+    print(f"✓ Indexed {stats['total_articles']} articles in {elapsed:.2f}s")
+
+def search(db: ArticleDatabase, query: str, limit: int):
+    """Print ranked search results with highlighted snippets."""
+    start = time.perf_counter()
+    results = db.search_articles(query, limit=limit)
+    elapsed = (time.perf_counter() - start) * 1000
+    
+    print(f"{len(results)} results for {query!r} ({elapsed:.1f} ms)")
+    for article in results:
+        print(f"\n- {article['title']} ({article['slug']})")
+        print(f"  {article['snippet']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the article full-text search index")
+    parser.add_argument('--db', default="database/reasonpath.db", help="Path to the article database")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    commands.add_parser('rebuild', help="Backfill the index from existing articles")
+    
+    search_parser = commands.add_parser('search', help="Run a search query")
+    search_parser.add_argument('query')
+    search_parser.add_argument('--limit', type=int, default=10)
+    
+    args = parser.parse_args()
+    
+    with ArticleDatabase(args.db) as db:
+        if args.command == 'rebuild':
+            rebuild(db)
+        else:
+            search(db, args.query, args.limit)
+
+if __name__ == "__main__":
+    main()
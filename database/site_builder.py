@@ -0,0 +1,507 @@
+#!/usr/bin/env python
+"""
+ReasonPath Static Site Builder
+Renders the blog index, article, category and tag pages from the article database.
+
+Every page's inputs (the articles it shows plus the templates) are hashed and
+recorded in a build manifest; later builds only re-render pages whose hash
+changed and delete pages that no longer exist. Pages are rendered in chunks
+across worker processes and written atomically.
+
+Stylesheets linked from the layout are copied to content-hashed names
+(assets/css/styles.<hash>.css) and listed in asset-manifest.json, so they
+can be cached for a year and still change the moment their contents do.
+
+Usage:
+    python database/site_builder.py [--output public] [--force] [--jobs N]
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+import feed_generator
+import markdown_renderer
+import templating
+from article_manager import ArticleDatabase
+from feed_generator import generate_article_card, render_article_feed
+
+LISTING_PAGE_SIZE = 20
+# Pages per work unit handed to a render worker
+RENDER_CHUNK_SIZE = 250
+MANIFEST_NAME = '.build-manifest.json'
+ASSET_MANIFEST_NAME = 'asset-manifest.json'
+
+WEBSITE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Assets referenced by the layout, relative to the website root
+FINGERPRINTED_ASSETS = [
+    'assets/css/styles.css',
+    'assets/css/article-feed.css',
+]
+
+# URL -> fingerprinted URL, set by SiteBuilder.build (and in each worker)
+_asset_urls: Dict[str, str] = {}
+
+# Files whose contents shape the rendered HTML; editing one rebuilds everything
+TEMPLATE_SOURCES = [
+    os.path.abspath(__file__),
+    os.path.abspath(feed_generator.__file__),
+    os.path.abspath(templating.__file__),
+    os.path.abspath(markdown_renderer.__file__),
+]
+
+def template_hash() -> str:
+    """Hash the template sources so template edits invalidate every page."""
+    paths = TEMPLATE_SOURCES + sorted(
+        os.path.join(templating.TEMPLATE_DIR, name)
+        for name in os.listdir(templating.TEMPLATE_DIR)
+    )
+    digest = hashlib.sha1()
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def load_site_inputs(db: ArticleDatabase) -> Dict:
+    """Load what the build needs to decide which pages changed.
+
+    Each published article gets a signature of its slug, featured flag,
+    dates and tag/category IDs, read from a covering index so no article
+    bodies are touched. Content edits are detected through updated_at,
+    which update_article bumps on every change. View counts are deliberately
+    left out: they change constantly and would rebuild every listing page.
+    Tag and category names are hashed once for the whole site.
+    """
+    with db.read_connection() as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = None
+
+        tag_links = {}
+        for article_id, tag_id in cursor.execute("SELECT article_id, tag_id FROM article_tags"):
+            tag_links.setdefault(article_id, []).append(tag_id)
+        category_links = {}
+        for article_id, category_id in cursor.execute(
+            "SELECT article_id, category_id FROM article_categories"
+        ):
+            category_links.setdefault(article_id, []).append(category_id)
+
+        tags = {row[0]: (row[1], row[2]) for row in cursor.execute("SELECT id, slug, name FROM tags")}
+        categories = {
+            row[0]: (row[1], row[2]) for row in cursor.execute("SELECT id, slug, name FROM categories")
+        }
+
+        signatures = []
+        for row in cursor.execute("""
+            SELECT id, slug, featured, published_at, updated_at
+            FROM articles
+            WHERE status = 'published'
+            ORDER BY published_at DESC, id DESC
+        """):
+            article_tags = tag_links.get(row[0], ())
+            article_categories = category_links.get(row[0], ())
+            signatures.append({
+                'id': row[0],
+                'slug': row[1],
+                'featured': bool(row[2]),
+                'tags': article_tags,
+                'categories': article_categories,
+                'signature': f"{row}{article_tags}{article_categories}",
+            })
+
+    return {
+        'articles': signatures,
+        'tags': tags,
+        'categories': categories,
+        'names_hash': page_hash(sorted(tags.items()), sorted(categories.items())),
+    }
+
+def fingerprint_assets(output_dir: str, previous: Dict[str, str] = None) -> Dict[str, str]:
+    """Copy each asset to a content-hashed name and return {URL: fingerprinted URL}.
+
+    Copies from earlier builds that are no longer current are removed.
+    """
+    urls = {}
+    for asset in FINGERPRINTED_ASSETS:
+        source = os.path.join(WEBSITE_ROOT, asset)
+        if not os.path.exists(source):
+            continue
+        with open(source, 'rb') as f:
+            data = f.read()
+        stem, ext = os.path.splitext(asset)
+        fingerprinted = f"{stem}.{hashlib.sha1(data).hexdigest()[:10]}{ext}"
+        target = os.path.join(output_dir, fingerprinted)
+        if not os.path.exists(target):
+            write_file_atomic(target, data)
+        urls['/' + asset] = '/' + fingerprinted
+
+    for old in set((previous or {}).values()) - set(urls.values()):
+        try:
+            os.remove(os.path.join(output_dir, old.lstrip('/')))
+        except FileNotFoundError:
+            pass
+    return urls
+
+def asset_url(url: str) -> str:
+    """Return the fingerprinted URL for an asset, or the URL itself."""
+    return _asset_urls.get(url, url)
+
+def page_hash(*parts) -> str:
+    """Combine the inputs of a page into one hash."""
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+def render_layout(title: str, description: str, body: str) -> str:
+    """Wrap page content in the shared site layout."""
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="utf-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <meta name="description" content="{html.escape(description or '')}">
+    <title>{html.escape(title)} | ReasonPath</title>
+    <link rel="stylesheet" href="{asset_url('/assets/css/styles.css')}">
+    <link rel="stylesheet" href="{asset_url('/assets/css/article-feed.css')}">
+</head>
+<body>
+    <header class="header">
+        <nav class="nav">
+            <a class="logo" href="/">ReasonPath™</a>
+            <ul class="nav-links">
+                <li><a href="/blog/" class="nav-link">ARTICLES</a></li>
+            </ul>
+        </nav>
+    </header>
+    <main class="main">
+{body}
+    </main>
+</body>
+</html>
+"""
+
+def render_article_body(content: str) -> str:
+    """Render article Markdown to HTML (for content with no stored render)."""
+    return markdown_renderer.render_markdown(content)[0]
+
+# Heading levels listed in an article's table of contents
+TOC_LEVELS = (2, 3)
+
+def render_table_of_contents(toc: List[Dict]) -> str:
+    """Render links to the article's section headings, if it has a few."""
+    entries = [entry for entry in toc if entry['level'] in TOC_LEVELS]
+    if len(entries) < 2:
+        return ''
+    items = ''.join(
+        f'<li class="toc-level-{entry["level"]}"><a href="#{entry["anchor"]}">{html.escape(entry["text"])}</a></li>'
+        for entry in entries
+    )
+    return f'<nav class="article-toc"><ul>{items}</ul></nav>'
+
+def render_article_page(article: Dict) -> str:
+    """Render a full article page."""
+    tags = ''.join(
+        f'<a class="article-tag" href="/tag/{tag["slug"]}/">{html.escape(tag["name"])}</a>'
+        for tag in article['tags']
+    )
+    category = ''
+    if article['categories']:
+        cat = article['categories'][0]
+        category = f'<a class="article-category-badge" href="/category/{cat["slug"]}/">{html.escape(cat["name"])}</a>'
+    subtitle = ''
+    if article['subtitle']:
+        subtitle = f'<p class="article-subtitle">{html.escape(article["subtitle"])}</p>'
+
+    body = f"""
+        <article class="article-container" data-slug="{article['slug']}">
+            <header class="article-header">
+                <div class="article-meta-top">
+                    {category}
+                    <span class="article-date">{html.escape(article['published_at'] or '')[:10]}</span>
+                    <span class="article-reading-time">📖 {article['reading_time']} min read</span>
+                </div>
+                <h1 class="article-title">{html.escape(article['title'])}</h1>
+                {subtitle}
+            </header>
+            {render_table_of_contents(article['toc'])}
+            <div class="article-content">
+                {article['content_html']}
+            </div>
+            <footer class="article-tags">{tags}</footer>
+        </article>"""
+    return render_layout(article['title'], article['meta_description'] or article['excerpt'], body)
+
+def render_pagination(base_url: str, page: int, total_pages: int) -> str:
+    """Render previous/next links for a paginated listing."""
+    if total_pages <= 1:
+        return ''
+
+    def page_url(number):
+        return base_url if number == 1 else f"{base_url}page/{number}/"
+
+    links = []
+    if page > 1:
+        links.append(f'<a class="pagination-btn" href="{page_url(page - 1)}">&laquo; Prev</a>')
+    links.append(f'<span class="pagination-info">Page {page} of {total_pages}</span>')
+    if page < total_pages:
+        links.append(f'<a class="pagination-btn" href="{page_url(page + 1)}">Next &raquo;</a>')
+    return f'<nav class="pagination">{"".join(links)}</nav>'
+
+def render_listing_page(heading: str, articles: List[Dict], base_url: str,
+                        page: int, total_pages: int) -> str:
+    """Render one page of a category or tag listing."""
+    cards = '\n'.join(generate_article_card(article) for article in articles)
+    body = f"""
+        <section class="frame">
+            <div class="frame-toolbar">
+                <div class="frame-title">{html.escape(heading)}</div>
+            </div>
+            <div class="frame-content">
+                <div class="articles-grid">
+                    {cards}
+                </div>
+                {render_pagination(base_url, page, total_pages)}
+            </div>
+        </section>"""
+    return render_layout(heading, f"{heading} articles on ReasonPath", body)
+
+def render_blog_index(featured: List[Dict], recent: List[Dict]) -> str:
+    """Render the blog homepage with the hero article and latest articles."""
+    return render_layout(
+        "Articles",
+        "Analysis, tutorials and research on AI from ReasonPath",
+        render_article_feed(featured, recent)
+    )
+
+def load_articles(db: ArticleDatabase, specs: List[tuple]) -> Dict[int, Dict]:
+    """Hydrate every article the given page specs need."""
+    ids = set()
+    for spec in specs:
+        if spec[0] == 'article':
+            ids.add(spec[1])
+        elif spec[0] == 'home':
+            ids.update(spec[1])
+            ids.update(spec[2])
+        else:
+            ids.update(spec[5])
+
+    ids = sorted(ids)
+    # Only article pages show the body, rendered once and stored in article_html
+    page_ids = {spec[1] for spec in specs if spec[0] == 'article'}
+    articles = {}
+    for start in range(0, len(ids), 500):
+        chunk = db.hydrate_articles(ids[start:start + 500])
+        db.attach_rendered_content([article for article in chunk if article['id'] in page_ids])
+        for article in chunk:
+            articles[article['id']] = article
+    return articles
+
+def render_page(spec: tuple, articles: Dict[int, Dict]) -> str:
+    """Render one page from its spec."""
+    if spec[0] == 'article':
+        return render_article_page(articles[spec[1]])
+    if spec[0] == 'home':
+        return render_blog_index(
+            [articles[i] for i in spec[1]],
+            [articles[i] for i in spec[2]]
+        )
+    _, heading, base_url, page, total_pages, ids = spec
+    return render_listing_page(heading, [articles[i] for i in ids], base_url, page, total_pages)
+
+def write_file_atomic(path: str, content):
+    """Write a file via a temp file and rename so readers never see it half-written."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path), suffix='.tmp')
+    try:
+        if isinstance(content, bytes):
+            f = os.fdopen(fd, 'wb')
+        else:
+            f = os.fdopen(fd, 'w', encoding='utf-8')
+        with f:
+            f.write(content)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+def render_chunk(db: ArticleDatabase, output_dir: str, items: List[tuple]) -> int:
+    """Render and write one work unit of (path, spec) pairs; returns pages written."""
+    articles = load_articles(db, [spec for _, spec in items])
+    for path, spec in items:
+        write_file_atomic(os.path.join(output_dir, path), render_page(spec, articles))
+    return len(items)
+
+# Each worker process keeps its own read-only database connection
+_worker_db = None
+
+def _init_worker(db_path: str, asset_urls: Dict[str, str]):
+    global _worker_db
+    _worker_db = ArticleDatabase(db_path, read_only=True)
+    _asset_urls.update(asset_urls)
+
+def _render_chunk_in_worker(output_dir: str, items: List[tuple]) -> int:
+    return render_chunk(_worker_db, output_dir, items)
+
+class SiteBuilder:
+    """Incrementally renders the static site into an output directory."""
+
+    def __init__(self, db: ArticleDatabase, output_dir: str = "public", jobs: int = None):
+        self.db = db
+        self.output_dir = output_dir
+        self.jobs = jobs or os.cpu_count() or 1
+        self.manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+        self.asset_manifest_path = os.path.join(output_dir, ASSET_MANIFEST_NAME)
+
+    def load_manifest(self) -> Dict[str, str]:
+        """Return {page path: input hash} from the previous build."""
+        try:
+            with open(self.manifest_path, 'r') as f:
+                return json.load(f)['pages']
+        except (OSError, ValueError, KeyError):
+            return {}
+
+    def save_manifest(self, pages: Dict[str, str]):
+        """Record the input hash of every page in this build."""
+        write_file_atomic(self.manifest_path, json.dumps({'pages': pages}, separators=(',', ':')))
+
+    def load_asset_manifest(self) -> Dict[str, str]:
+        """Return {URL: fingerprinted URL} from the previous build."""
+        try:
+            with open(self.asset_manifest_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def update_assets(self) -> bool:
+        """Fingerprint the layout's assets; returns True if any URL changed."""
+        previous = self.load_asset_manifest()
+        urls = fingerprint_assets(self.output_dir, previous)
+        _asset_urls.clear()
+        _asset_urls.update(urls)
+        if urls == previous:
+            return False
+        write_file_atomic(self.asset_manifest_path, json.dumps(urls, indent=2, sort_keys=True))
+        return True
+
+    def plan(self) -> Dict[str, tuple]:
+        """Work out every page of the site as {path: (input hash, spec)}.
+
+        A spec is a tuple describing how to render the page; only the
+        article IDs it needs are loaded when it is actually rendered.
+        """
+        inputs = load_site_inputs(self.db)
+        signatures = inputs['articles']
+        templates = page_hash(template_hash(), inputs['names_hash'], sorted(_asset_urls.items()))
+        pages = {}
+
+        # Article pages
+        for sig in signatures:
+            pages[f"blog/{sig['slug']}.html"] = (
+                page_hash(templates, sig['signature']),
+                ('article', sig['id'])
+            )
+
+        # Blog homepage: same selection as the homepage feed
+        featured = [s for s in signatures if s['featured']][:1]
+        recent = signatures[:9]
+        pages["blog/index.html"] = (
+            page_hash(templates, [s['signature'] for s in featured], [s['signature'] for s in recent]),
+            ('home', [s['id'] for s in featured], [s['id'] for s in recent])
+        )
+
+        # Category and tag listings, paginated
+        for kind, key in (('category', 'categories'), ('tag', 'tags')):
+            members = {}
+            for sig in signatures:
+                for dim_id in sig[key]:
+                    members.setdefault(dim_id, []).append(sig)
+            for dim_id, sigs in members.items():
+                slug, name = inputs[key][dim_id]
+                total_pages = -(-len(sigs) // LISTING_PAGE_SIZE)
+                base_url = f"/{kind}/{slug}/"
+                for page in range(1, total_pages + 1):
+                    chunk = sigs[(page - 1) * LISTING_PAGE_SIZE:page * LISTING_PAGE_SIZE]
+                    path = f"{kind}/{slug}/index.html" if page == 1 else f"{kind}/{slug}/page/{page}/index.html"
+                    pages[path] = (
+                        page_hash(templates, page, total_pages, [s['signature'] for s in chunk]),
+                        ('listing', name, base_url, page, total_pages, [s['id'] for s in chunk])
+                    )
+
+        return pages
+
+    def render_pages(self, items: List[tuple]):
+        """Render (path, spec) pairs, across worker processes when worthwhile."""
+        chunks = [items[i:i + RENDER_CHUNK_SIZE] for i in range(0, len(items), RENDER_CHUNK_SIZE)]
+        if self.jobs <= 1 or len(chunks) <= 1:
+            for chunk in chunks:
+                render_chunk(self.db, self.output_dir, chunk)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=min(self.jobs, len(chunks)),
+            initializer=_init_worker,
+            initargs=(self.db.db_path, dict(_asset_urls))
+        ) as executor:
+            futures = [
+                executor.submit(_render_chunk_in_worker, self.output_dir, chunk)
+                for chunk in chunks
+            ]
+            for future in futures:
+                future.result()
+
+    def build(self, force: bool = False) -> Dict:
+        """Render changed pages, remove stale ones and return a build report."""
+        start = time.perf_counter()
+        previous = self.load_manifest()
+        # A changed stylesheet gets a new URL, which re-renders every page
+        self.update_assets()
+        pages = self.plan()
+
+        # The manifest is trusted; use force to repair a hand-edited output dir
+        changed = [
+            path for path, (digest, _) in pages.items()
+            if force or previous.get(path) != digest
+        ]
+
+        self.render_pages([(path, pages[path][1]) for path in changed])
+
+        removed = [path for path in previous if path not in pages]
+        for path in removed:
+            try:
+                os.remove(os.path.join(self.output_dir, path))
+            except FileNotFoundError:
+                pass
+
+        if changed or removed:
+            self.save_manifest({path: digest for path, (digest, _) in pages.items()})
+
+        return {
+            'pages': len(pages),
+            'rendered': len(changed),
+            'removed': len(removed),
+            'seconds': time.perf_counter() - start,
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the static article pages")
+    parser.add_argument('--db', default="database/reasonpath.db", help="Path to the article database")
+    parser.add_argument('--output', default="public", help="Output directory")
+    parser.add_argument('--force', action='store_true', help="Re-render every page")
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                        help="Worker processes for rendering (default: CPU count)")
+    args = parser.parse_args()
+
+    with ArticleDatabase(args.db) as db:
+        report = SiteBuilder(db, args.output, jobs=args.jobs).build(force=args.force)
+
+    print(f"✓ {report['pages']} pages: {report['rendered']} rendered, "
+          f"{report['removed']} removed in {report['seconds']:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""
+ReasonPath Site Statistics
+Show, verify and rebuild the trigger-maintained statistics counters
+
+Usage:
+    python database/site_stats.py show
+    python database/site_stats.py verify
+    python database/site_stats.py rebuild
+"""
+
+import argparse
+import sys
+import time
+from article_manager import ArticleDatabase
+
+def show(db: ArticleDatabase):
+    """Print the stored counters."""
+    for key, value in db.get_stats().items():
+        print(f"{key:>20}: {value:,}")
+
+def verify(db: ArticleDatabase) -> bool:
+    """Compare the counters with a full recount; returns True if they match."""
+    start = time.perf_counter()
+    drift = db.verify_stats()
+    elapsed = time.perf_counter() - start
+
+    if not drift:
+        print(f"✓ All counters match ({elapsed:.2f}s)")
+        return True
+    for key, (stored, actual) in drift.items():
+        print(f"✗ {key}: stored {stored:,}, actual {actual:,}")
+    print("ℹ️  Run `python database/site_stats.py rebuild` to fix them")
+    return False
+
+def rebuild(db: ArticleDatabase):
+    """Recount every counter from the tables."""
+    start = time.perf_counter()
+    stats = db.rebuild_stats()
+    elapsed = time.perf_counter() - start
+    print(f"✓ Rebuilt counters for {stats['total_articles']:,} articles in {elapsed:.2f}s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the site statistics counters")
+    parser.add_argument('--db', default="database/reasonpath.db", help="Path to the article database")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('show', help="Print the stored counters")
+    commands.add_parser('verify', help="Recount and report counters that drifted (exit 1 if any)")
+    commands.add_parser('rebuild', help="Recount every counter from the tables")
+
+    args = parser.parse_args()
+
+    with ArticleDatabase(args.db) as db:
+        if args.command == 'show':
+            show(db)
+        elif args.command == 'verify':
+            if not verify(db):
+                sys.exit(1)
+        else:
+            rebuild(db)
+
+if __name__ == "__main__":
+    main()
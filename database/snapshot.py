@@ -0,0 +1,358 @@
+#!/usr/bin/env python
+"""
+ReasonPath Content Snapshot
+Exports published articles to a memory-mapped binary file for read serving
+
+Usage:
+    python database/snapshot.py build [--output database/snapshot.bin] [--force]
+    python database/snapshot.py get ai-context-frontier
+
+Readers map the file and decode only the records they are asked for: one
+fixed-width record per article in feed order (published_at DESC, id DESC),
+so position n is a single offset, and an open-addressing hash table of
+record numbers keyed by slug. All text lives in one string table that
+records point into. A build writes a temp file and renames it over the
+old one; SnapshotReader notices the new file and maps it, while lookups
+already running finish on the old mapping. The build is skipped when the
+article revision recorded in the header hasn't moved.
+
+File layout (little-endian):
+    header        HEADER
+    articles      ARTICLE records, feed order
+    slots         u32 per slot: record number + 1, 0 when empty
+    tags          NAMED records (name, slug)
+    categories    NAMED records (name, slug)
+    links         u32 tag/category indexes, referenced by (start, count)
+    strings       UTF-8 text, referenced by (offset, length)
+"""
+
+import argparse
+import json
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from typing import Dict, List, Optional
+
+from article_manager import ArticleDatabase
+from feed_cache import REVISION_NAME
+
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snapshot.bin')
+
+MAGIC = b'RPSNAP\x00\x00'
+VERSION = 1
+
+# Text columns stored per article, in record order
+STRING_FIELDS = ('slug', 'title', 'subtitle', 'excerpt', 'content', 'author', 'published_at',
+                 'updated_at', 'hero_image', 'thumbnail_image', 'meta_description', 'meta_keywords',
+                 'ai_sources')
+
+# magic, version, articles, tags, categories, slots, revision,
+# then the byte offset of each section after the header
+HEADER = struct.Struct('<8sIIIIIQQQQQQQ')
+# id, (offset, length) per string field, featured, reading_time,
+# (start, count) of its tag links and of its category links
+ARTICLE = struct.Struct('<I' + 'QI' * len(STRING_FIELDS) + 'BHIIII')
+NAMED = struct.Struct('<QIQI')
+U32 = struct.Struct('<I')
+
+# String length marking a NULL column
+NULL_LENGTH = 0xFFFFFFFF
+
+# ai_sources is stored as its items joined by this, not as JSON
+LIST_SEPARATOR = '\x1f'
+
+
+def slug_slot(slug: bytes, slot_count: int) -> int:
+    return zlib.crc32(slug) & (slot_count - 1)
+
+
+class StringTable:
+    """Appends strings to a temp file and hands out (offset, length) references."""
+
+    def __init__(self):
+        self.file = tempfile.TemporaryFile()
+        self.size = 0
+
+    def add(self, value: Optional[str]):
+        if value is None:
+            return 0, NULL_LENGTH
+        data = str(value).encode('utf-8')
+        offset = self.size
+        self.file.write(data)
+        self.size += len(data)
+        return offset, len(data)
+
+
+def read_revision(path: str) -> Optional[int]:
+    """The article revision in an existing snapshot's header, or None."""
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(HEADER.size)
+    except FileNotFoundError:
+        return None
+    if len(header) < HEADER.size:
+        return None
+    fields = HEADER.unpack(header)
+    return fields[6] if fields[0] == MAGIC and fields[1] == VERSION else None
+
+
+def build_snapshot(db: ArticleDatabase, path: str = DEFAULT_OUTPUT, force: bool = False) -> Dict:
+    """Write a snapshot of the published articles; returns what was done."""
+    with db.read_connection() as conn:
+        # Read the revision before the rows: a write in between only causes
+        # one extra build next time
+        row = conn.execute(
+            "SELECT revision FROM dataset_revisions WHERE name = ?", (REVISION_NAME,)
+        ).fetchone()
+        revision = row[0] if row else 0
+        if not force and read_revision(path) == revision:
+            return {'written': False, 'revision': revision}
+
+        tags = conn.execute("SELECT id, name, slug FROM tags ORDER BY id").fetchall()
+        categories = conn.execute("SELECT id, name, slug FROM categories ORDER BY sort_order, id").fetchall()
+        tag_index = {tag['id']: i for i, tag in enumerate(tags)}
+        category_index = {category['id']: i for i, category in enumerate(categories)}
+
+        article_tags: Dict[int, List[int]] = {}
+        for article_id, tag_id in conn.execute(
+                "SELECT article_id, tag_id FROM article_tags ORDER BY article_id, tag_id"):
+            article_tags.setdefault(article_id, []).append(tag_index[tag_id])
+        article_categories: Dict[int, List[int]] = {}
+        for article_id, category_id in conn.execute(
+                "SELECT article_id, category_id FROM article_categories ORDER BY article_id, category_id"):
+            article_categories.setdefault(article_id, []).append(category_index[category_id])
+
+        strings = StringTable()
+        records = bytearray()
+        links: List[int] = []
+        slugs: List[bytes] = []
+        cursor = conn.execute(f"""
+            SELECT id, featured, reading_time, {', '.join(STRING_FIELDS)} FROM articles
+            WHERE status = 'published'
+            ORDER BY published_at DESC, id DESC
+        """)
+        for article in cursor:
+            values = dict(article)
+            if values['ai_sources']:
+                values['ai_sources'] = LIST_SEPARATOR.join(json.loads(values['ai_sources']))
+            refs = []
+            for field in STRING_FIELDS:
+                refs.extend(strings.add(values[field]))
+            tag_links = article_tags.get(article['id'], [])
+            category_links = article_categories.get(article['id'], [])
+            records += ARTICLE.pack(
+                article['id'], *refs, 1 if article['featured'] else 0, article['reading_time'] or 0,
+                len(links), len(tag_links), len(links) + len(tag_links), len(category_links)
+            )
+            links.extend(tag_links)
+            links.extend(category_links)
+            slugs.append(values['slug'].encode('utf-8'))
+
+    count = len(slugs)
+    slot_count = 8
+    while slot_count < count * 2:
+        slot_count *= 2
+    slots = [0] * slot_count
+    for number, slug in enumerate(slugs):
+        slot = slug_slot(slug, slot_count)
+        while slots[slot]:
+            slot = (slot + 1) & (slot_count - 1)
+        slots[slot] = number + 1
+
+    named = bytearray()
+    for item in list(tags) + list(categories):
+        named += NAMED.pack(*strings.add(item['name']), *strings.add(item['slug']))
+
+    articles_offset = HEADER.size
+    slots_offset = articles_offset + len(records)
+    tags_offset = slots_offset + 4 * slot_count
+    categories_offset = tags_offset + NAMED.size * len(tags)
+    links_offset = categories_offset + NAMED.size * len(categories)
+    strings_offset = links_offset + 4 * len(links)
+    header = HEADER.pack(MAGIC, VERSION, count, len(tags), len(categories), slot_count, revision,
+                         articles_offset, slots_offset, tags_offset, categories_offset,
+                         links_offset, strings_offset)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.snapshot-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(header)
+            f.write(records)
+            f.write(struct.pack(f'<{slot_count}I', *slots))
+            f.write(named)
+            f.write(struct.pack(f'<{len(links)}I', *links))
+            strings.file.seek(0)
+            shutil.copyfileobj(strings.file, f, 1024 * 1024)
+            size = f.tell()
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    finally:
+        strings.file.close()
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+
+    return {'written': True, 'revision': revision, 'articles': count, 'bytes': size}
+
+
+class Snapshot:
+    """One mapped snapshot file. Lookups decode only the records they return."""
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.map) < HEADER.size:
+            self.map.close()
+            raise ValueError(f"{path} is not a content snapshot")
+        (magic, version, self.count, self.tag_count, self.category_count, self.slot_count,
+         self.revision, self.articles_offset, self.slots_offset, self.tags_offset,
+         self.categories_offset, self.links_offset, self.strings_offset) = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != VERSION:
+            self.map.close()
+            raise ValueError(f"{path} is not a version {VERSION} content snapshot")
+        self._tags = [self._named(self.tags_offset, i) for i in range(self.tag_count)]
+        self._categories = [self._named(self.categories_offset, i) for i in range(self.category_count)]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self):
+        self.map.close()
+
+    def _string(self, offset: int, length: int) -> Optional[str]:
+        if length == NULL_LENGTH:
+            return None
+        start = self.strings_offset + offset
+        return self.map[start:start + length].decode('utf-8')
+
+    def _named(self, section: int, index: int) -> Dict:
+        name_offset, name_length, slug_offset, slug_length = NAMED.unpack_from(
+            self.map, section + index * NAMED.size)
+        return {'name': self._string(name_offset, name_length),
+                'slug': self._string(slug_offset, slug_length)}
+
+    def _links(self, start: int, count: int) -> List[int]:
+        return list(struct.unpack_from(f'<{count}I', self.map, self.links_offset + 4 * start))
+
+    def article(self, position: int) -> Dict:
+        """The article at a feed position (0 is the newest)."""
+        if not 0 <= position < self.count:
+            raise IndexError(position)
+        fields = ARTICLE.unpack_from(self.map, self.articles_offset + position * ARTICLE.size)
+        article = {'id': fields[0]}
+        for i, field in enumerate(STRING_FIELDS):
+            article[field] = self._string(fields[1 + 2 * i], fields[2 + 2 * i])
+        (article['featured'], article['reading_time'], tags_start, tags_count,
+         categories_start, categories_count) = fields[1 + 2 * len(STRING_FIELDS):]
+        article['status'] = 'published'
+        if article['ai_sources'] is not None:
+            article['ai_sources'] = article['ai_sources'].split(LIST_SEPARATOR) if article['ai_sources'] else []
+        article['tags'] = [dict(self._tags[i]) for i in self._links(tags_start, tags_count)]
+        article['categories'] = [dict(self._categories[i])
+                                 for i in self._links(categories_start, categories_count)]
+        return article
+
+    def position_of(self, slug: str) -> Optional[int]:
+        """Feed position of the article with this slug, or None."""
+        wanted = slug.encode('utf-8')
+        mask = self.slot_count - 1
+        slot = slug_slot(wanted, self.slot_count)
+        while True:
+            number = U32.unpack_from(self.map, self.slots_offset + 4 * slot)[0]
+            if not number:
+                return None
+            # The slug is the first string of the record
+            offset, length = struct.unpack_from(
+                '<QI', self.map, self.articles_offset + (number - 1) * ARTICLE.size + 4)
+            start = self.strings_offset + offset
+            if length == len(wanted) and self.map[start:start + length] == wanted:
+                return number - 1
+            slot = (slot + 1) & mask
+
+    def get_article_by_slug(self, slug: str) -> Optional[Dict]:
+        position = self.position_of(slug)
+        return None if position is None else self.article(position)
+
+    def articles(self, offset: int = 0, limit: int = 10) -> List[Dict]:
+        """A page of articles in feed order."""
+        return [self.article(position) for position in range(max(offset, 0), min(offset + limit, self.count))]
+
+
+class SnapshotReader:
+    """
+    Serves lookups from the newest snapshot at path.
+
+    The file is re-checked at most every check_interval seconds; when a
+    build has replaced it, the new file is mapped and swapped in. The old
+    mapping is released once no lookup holds it.
+    """
+
+    def __init__(self, path: str = DEFAULT_OUTPUT, check_interval: float = 1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._snapshot = None
+        self._identity = None
+        self._checked = 0.0
+
+    def snapshot(self) -> Snapshot:
+        now = time.monotonic()
+        if self._snapshot is None or now - self._checked >= self.check_interval:
+            self._checked = now
+            stat = os.stat(self.path)
+            identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            if identity != self._identity:
+                # Assignment is atomic; concurrent lookups see the old or the new snapshot
+                self._snapshot = Snapshot(self.path)
+                self._identity = identity
+        return self._snapshot
+
+    def __len__(self) -> int:
+        return len(self.snapshot())
+
+    def get_article_by_slug(self, slug: str) -> Optional[Dict]:
+        return self.snapshot().get_article_by_slug(slug)
+
+    def articles(self, offset: int = 0, limit: int = 10) -> List[Dict]:
+        return self.snapshot().articles(offset, limit)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the published content snapshot")
+    parser.add_argument('--db', default="database/reasonpath.db", help="Path to the article database")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="Snapshot file")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = commands.add_parser('build', help="Export published articles to the snapshot")
+    build_parser.add_argument('--force', action='store_true', help="Rebuild even if nothing changed")
+
+    get_parser = commands.add_parser('get', help="Look up an article by slug")
+    get_parser.add_argument('slug')
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        with ArticleDatabase(args.db, read_only=True) as db:
+            start = time.perf_counter()
+            result = build_snapshot(db, args.output, force=args.force)
+            elapsed = time.perf_counter() - start
+        if result['written']:
+            print(f"✓ Snapshot of {result['articles']:,} articles, {result['bytes']:,} bytes "
+                  f"in {elapsed:.2f}s (revision {result['revision']})")
+        else:
+            print(f"ℹ️  Snapshot already at revision {result['revision']}, nothing to do")
+    else:
+        snapshot = Snapshot(args.output)
+        article = snapshot.get_article_by_slug(args.slug)
+        if article is None:
+            print(f"No published article {args.slug!r} in the snapshot")
+            sys.exit(1)
+        print(json.dumps(article, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,401 @@
+#!/usr/bin/env python
+"""
+ReasonPath Syndication
+Streams the RSS 2.0 feed, Atom feed and sitemaps from the article database
+
+Rows are read from a cursor and written through an incremental XML writer,
+so memory stays flat however many articles there are. The sitemap is always
+a sitemap index (sitemap.xml) pointing at child sitemaps of at most 50,000
+URLs each (sitemap-1.xml, ...). Dates come from the articles themselves
+(lastmod is updated_at), so regenerating an unchanged site produces the
+same bytes; files are only replaced when their content hash changed.
+
+Usage:
+    python database/syndication.py [--output .] [--site-url https://reasonpath.com]
+"""
+
+import argparse
+import email.utils
+import hashlib
+import io
+import os
+import re
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterator, Optional, Tuple
+from xml.sax.saxutils import XMLGenerator
+
+from article_manager import ArticleDatabase
+from markdown_renderer import content_hash
+from site_builder import WEBSITE_ROOT, render_article_body
+
+SITE_URL = 'https://reasonpath.com'
+SITE_TITLE = 'ReasonPath AI Education'
+SITE_DESCRIPTION = 'AI Education Platform'
+
+# Articles in rss.xml and atom.xml
+FEED_SIZE = 50
+
+# Sitemap protocol limit per file
+SITEMAP_MAX_URLS = 50000
+
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+CHILD_SITEMAP_RE = re.compile(r'^sitemap-\d+\.xml$')
+
+# Category names packed into one column by the feed query
+NAME_SEPARATOR = '\x1f'
+
+FEED_QUERY = f"""
+    SELECT a.slug, a.title, a.excerpt, a.content, a.author, a.published_at, a.updated_at,
+           (SELECT group_concat(c.name, char({ord(NAME_SEPARATOR)}))
+            FROM article_categories ac JOIN categories c ON c.id = ac.category_id
+            WHERE ac.article_id = a.id) AS category_names,
+           h.content_hash, h.html
+    FROM articles a
+    LEFT JOIN article_html h ON h.article_id = a.id
+    WHERE a.status = 'published'
+    ORDER BY a.published_at DESC, a.id DESC
+    LIMIT ?
+"""
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse a stored SQLite timestamp, treating it as UTC."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+    return parsed.replace(tzinfo=timezone.utc) if parsed.tzinfo is None else parsed
+
+
+def w3c_date(value: Optional[str]) -> Optional[str]:
+    """Timestamp in the W3C/RFC 3339 form used by Atom and sitemaps."""
+    parsed = parse_timestamp(value)
+    return parsed.replace(microsecond=0).isoformat() if parsed else None
+
+
+def rfc822_date(value: Optional[str]) -> Optional[str]:
+    parsed = parse_timestamp(value)
+    return email.utils.format_datetime(parsed.replace(microsecond=0), usegmt=True) if parsed else None
+
+
+def article_url(site_url: str, slug: str) -> str:
+    # Same path the site builder writes
+    return f"{site_url}/blog/{slug}.html"
+
+
+class HashingWriter(io.TextIOBase):
+    """
+    Text sink for XMLGenerator that encodes, hashes and writes in batches.
+
+    XMLGenerator emits many tiny strings; collecting a few thousand of them
+    before encoding keeps memory flat without paying for a hash update and
+    a file write per tag.
+    """
+
+    def __init__(self, f, batch: int = 4096):
+        self.f = f
+        self.digest = hashlib.sha256()
+        self.batch = batch
+        self._pending = []
+
+    def write(self, text: str) -> int:
+        pending = self._pending
+        pending.append(text)
+        if len(pending) >= self.batch:
+            self.flush()
+        return len(text)
+
+    def flush(self):
+        if self._pending:
+            data = ''.join(self._pending).encode('utf-8', 'xmlcharrefreplace')
+            self._pending.clear()
+            self.digest.update(data)
+            self.f.write(data)
+
+
+def file_digest(path: str) -> Optional[str]:
+    """sha256 of an existing file, read in chunks, or None if it doesn't exist."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(65536), b''):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+class XMLFile:
+    """
+    Context manager that streams an XML document into a temp file.
+
+    Yields an XMLWriter; on a clean exit the temp file replaces path
+    only if its hash differs from the current file. `changed` says
+    whether it did.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.changed = False
+
+    def __enter__(self) -> 'XMLWriter':
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, self.temp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(self.path),
+                                              suffix='.tmp')
+        self.file = os.fdopen(fd, 'wb')
+        self.sink = HashingWriter(self.file)
+        self.writer = XMLWriter(self.sink)
+        return self.writer
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.writer.finish()
+                self.sink.flush()
+            self.file.close()
+            if exc_type is None and self.sink.digest.hexdigest() != file_digest(self.path):
+                os.chmod(self.temp_path, 0o644)
+                os.replace(self.temp_path, self.path)
+                self.changed = True
+        finally:
+            if os.path.exists(self.temp_path):
+                os.unlink(self.temp_path)
+
+
+class XMLWriter:
+    """Thin indenting wrapper around xml.sax.saxutils.XMLGenerator."""
+
+    def __init__(self, out):
+        self.gen = XMLGenerator(out, encoding='utf-8', short_empty_elements=True)
+        self.gen.startDocument()
+        self.depth = 0
+        self.started = False
+
+    def _newline(self):
+        # startDocument() already ended the XML declaration's line
+        if self.started:
+            self.gen.ignorableWhitespace('\n' + '  ' * self.depth)
+        self.started = True
+
+    def start(self, name: str, attrs: Dict[str, str] = None):
+        self._newline()
+        self.gen.startElement(name, attrs or {})
+        self.depth += 1
+
+    def end(self, name: str):
+        self.depth -= 1
+        self._newline()
+        self.gen.endElement(name)
+
+    def element(self, name: str, text: Optional[str] = None, attrs: Dict[str, str] = None):
+        """Write <name attrs>text</name>; skipped entirely when text and attrs are both empty."""
+        if text is None and not attrs:
+            return
+        self._newline()
+        self.gen.startElement(name, attrs or {})
+        if text:
+            self.gen.characters(text)
+        self.gen.endElement(name)
+
+    def finish(self):
+        self.gen.ignorableWhitespace('\n')
+        self.gen.endDocument()
+
+
+def feed_body(row) -> str:
+    """The stored render of an article's content, or a fresh one if it is missing or stale."""
+    if row['html'] is not None and row['content_hash'] == content_hash(row['content']):
+        return row['html']
+    return render_article_body(row['content'])
+
+
+def latest_update(conn) -> Optional[str]:
+    return conn.execute(
+        "SELECT MAX(updated_at) FROM articles WHERE status = 'published'"
+    ).fetchone()[0]
+
+
+def write_rss(db: ArticleDatabase, path: str, site_url: str = SITE_URL, limit: int = FEED_SIZE) -> bool:
+    """Write an RSS 2.0 feed of the newest published articles; returns True if the file changed."""
+    target = XMLFile(path)
+    with db.read_connection() as conn, target as xml:
+        xml.start('rss', {
+            'version': '2.0',
+            'xmlns:content': 'http://purl.org/rss/1.0/modules/content/',
+            'xmlns:atom': 'http://www.w3.org/2005/Atom',
+        })
+        xml.start('channel')
+        xml.element('title', SITE_TITLE)
+        xml.element('link', site_url + '/')
+        xml.element('description', SITE_DESCRIPTION)
+        xml.element('language', 'en')
+        xml.element('atom:link', attrs={'href': f"{site_url}/rss.xml", 'rel': 'self',
+                                        'type': 'application/rss+xml'})
+        # The newest change, not the wall clock, so unchanged content hashes the same
+        xml.element('lastBuildDate', rfc822_date(latest_update(conn)))
+        for row in conn.execute(FEED_QUERY, (limit,)):
+            url = article_url(site_url, row['slug'])
+            xml.start('item')
+            xml.element('title', row['title'])
+            xml.element('link', url)
+            xml.element('guid', url, {'isPermaLink': 'true'})
+            xml.element('pubDate', rfc822_date(row['published_at']))
+            xml.element('description', row['excerpt'])
+            for name in (row['category_names'] or '').split(NAME_SEPARATOR):
+                if name:
+                    xml.element('category', name)
+            xml.element('content:encoded', feed_body(row))
+            xml.end('item')
+        xml.end('channel')
+        xml.end('rss')
+    return target.changed
+
+
+def write_atom(db: ArticleDatabase, path: str, site_url: str = SITE_URL, limit: int = FEED_SIZE) -> bool:
+    """Write an Atom 1.0 feed of the newest published articles; returns True if the file changed."""
+    target = XMLFile(path)
+    with db.read_connection() as conn, target as xml:
+        xml.start('feed', {'xmlns': 'http://www.w3.org/2005/Atom'})
+        xml.element('title', SITE_TITLE)
+        xml.element('subtitle', SITE_DESCRIPTION)
+        xml.element('id', site_url + '/')
+        xml.element('link', attrs={'href': site_url + '/'})
+        xml.element('link', attrs={'href': f"{site_url}/atom.xml", 'rel': 'self'})
+        # Atom requires <updated>; fall back to the epoch for an empty site
+        xml.element('updated', w3c_date(latest_update(conn)) or '1970-01-01T00:00:00+00:00')
+        for row in conn.execute(FEED_QUERY, (limit,)):
+            url = article_url(site_url, row['slug'])
+            xml.start('entry')
+            xml.element('title', row['title'])
+            xml.element('id', url)
+            xml.element('link', attrs={'href': url})
+            xml.element('published', w3c_date(row['published_at']))
+            xml.element('updated', w3c_date(row['updated_at'] or row['published_at']))
+            xml.start('author')
+            xml.element('name', row['author'] or 'ReasonPath Team')
+            xml.end('author')
+            for name in (row['category_names'] or '').split(NAME_SEPARATOR):
+                if name:
+                    xml.element('category', attrs={'term': name})
+            xml.element('summary', row['excerpt'])
+            xml.element('content', feed_body(row), {'type': 'html'})
+            xml.end('entry')
+        xml.end('feed')
+    return target.changed
+
+
+def sitemap_urls(conn, site_url: str) -> Iterator[Tuple[str, Optional[str]]]:
+    """Yield (loc, lastmod) for every public page, streaming from the database."""
+    newest = w3c_date(latest_update(conn))
+    yield site_url + '/', newest
+    yield site_url + '/blog/', newest
+
+    # Served from the covering build-signature index; no article bodies are read
+    cursor = conn.execute("""
+        SELECT slug, updated_at FROM articles
+        WHERE status = 'published'
+        ORDER BY published_at DESC, id DESC
+    """)
+    for slug, updated_at in cursor:
+        yield article_url(site_url, slug), w3c_date(updated_at)
+
+    for kind, table, links, column in (('category', 'categories', 'article_categories', 'category_id'),
+                                       ('tag', 'tags', 'article_tags', 'tag_id')):
+        cursor = conn.execute(f"""
+            SELECT d.slug, MAX(a.updated_at)
+            FROM {table} d
+            JOIN {links} l ON l.{column} = d.id
+            JOIN articles a ON a.id = l.article_id AND a.status = 'published'
+            GROUP BY d.id
+            ORDER BY d.slug
+        """)
+        for slug, updated_at in cursor:
+            yield f"{site_url}/{kind}/{slug}/", w3c_date(updated_at)
+
+
+def write_sitemaps(db: ArticleDatabase, output_dir: str, site_url: str = SITE_URL,
+                   max_urls: int = SITEMAP_MAX_URLS) -> Dict:
+    """
+    Write sitemap.xml (an index) and sitemap-N.xml children of at most
+    max_urls URLs each, deleting children left over from a larger site.
+    """
+    children = []  # (file name, newest lastmod, changed)
+    urls = 0
+    with db.read_connection() as conn:
+        pages = sitemap_urls(conn, site_url)
+        page = next(pages, None)
+        # An empty site still gets one (empty) child
+        while page is not None or not children:
+            name = f"sitemap-{len(children) + 1}.xml"
+            target = XMLFile(os.path.join(output_dir, name))
+            newest = None
+            count = 0
+            with target as xml:
+                xml.start('urlset', {'xmlns': SITEMAP_NS})
+                while page is not None and count < max_urls:
+                    loc, lastmod = page
+                    xml.start('url')
+                    xml.element('loc', loc)
+                    xml.element('lastmod', lastmod)
+                    xml.end('url')
+                    if lastmod and (newest is None or lastmod > newest):
+                        newest = lastmod
+                    count += 1
+                    page = next(pages, None)
+                xml.end('urlset')
+            urls += count
+            children.append((name, newest, target.changed))
+
+    index = XMLFile(os.path.join(output_dir, 'sitemap.xml'))
+    with index as xml:
+        xml.start('sitemapindex', {'xmlns': SITEMAP_NS})
+        for name, newest, _ in children:
+            xml.start('sitemap')
+            xml.element('loc', f"{site_url}/{name}")
+            xml.element('lastmod', newest)
+            xml.end('sitemap')
+        xml.end('sitemapindex')
+
+    current = {name for name, _, _ in children}
+    removed = 0
+    for name in os.listdir(output_dir):
+        if CHILD_SITEMAP_RE.match(name) and name not in current:
+            os.remove(os.path.join(output_dir, name))
+            removed += 1
+
+    return {
+        'urls': urls,
+        'files': len(children) + 1,
+        'written': sum(changed for _, _, changed in children) + index.changed,
+        'removed': removed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate rss.xml, atom.xml and sitemaps")
+    parser.add_argument('--db', default="database/reasonpath.db", help="Path to the article database")
+    parser.add_argument('--output', default=WEBSITE_ROOT, help="Output directory (default: website root)")
+    parser.add_argument('--site-url', default=SITE_URL, help="Absolute site URL, without a trailing slash")
+    parser.add_argument('--feed-size', type=int, default=FEED_SIZE, help="Articles per feed")
+    args = parser.parse_args()
+    site_url = args.site_url.rstrip('/')
+
+    start = time.perf_counter()
+    with ArticleDatabase(args.db) as db:
+        rss = write_rss(db, os.path.join(args.output, 'rss.xml'), site_url, args.feed_size)
+        atom = write_atom(db, os.path.join(args.output, 'atom.xml'), site_url, args.feed_size)
+        sitemaps = write_sitemaps(db, args.output, site_url)
+    elapsed = time.perf_counter() - start
+
+    print(f"✓ rss.xml {'written' if rss else 'unchanged'}, atom.xml {'written' if atom else 'unchanged'}")
+    print(f"✓ {sitemaps['urls']} URLs in {sitemaps['files']} sitemap files: "
+          f"{sitemaps['written']} written, {sitemaps['removed']} removed in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
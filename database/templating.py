@@ -0,0 +1,288 @@
+"""
+ReasonPath Templates
+A small compiled HTML template engine for the feed and site generators
+
+Syntax:
+    {{ expr }}          Python expression, HTML-escaped (None renders as '')
+    {{ expr|safe }}     Python expression inserted as-is
+    {% if expr %} ... {% elif expr %} ... {% else %} ... {% endif %}
+    {% for name in expr %} ... {% endfor %}
+    {# comment #}
+
+Templates are compiled once into Python functions that append to a list
+buffer, and recompiled only when the file's mtime changes.
+"""
+
+import ast
+import builtins
+import html
+import os
+import re
+import threading
+import time
+from typing import Callable, Dict
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+
+TOKEN_RE = re.compile(r'(\{\{.*?\}\}|\{%.*?%\}|\{#.*?#\})', re.DOTALL)
+SAFE_RE = re.compile(r'\|\s*safe\s*$')
+FOR_RE = re.compile(r'^for\s+(.+?)\s+in\s+(.+)$', re.DOTALL)
+
+BUILTIN_NAMES = set(dir(builtins))
+
+
+class TemplateSyntaxError(ValueError):
+    """Raised when a template cannot be compiled."""
+
+
+class Markup(str):
+    """A string that is already safe HTML and must not be escaped again."""
+
+
+def escape(value) -> str:
+    """HTML-escape a value for insertion into a template."""
+    cls = type(value)
+    if cls is str:
+        # Most values (slugs, names, dates) contain nothing to escape; five
+        # substring tests are cheaper than a regex search or html.escape
+        if '&' in value or '<' in value or '>' in value or '"' in value or "'" in value:
+            return html.escape(value, quote=True)
+        return value
+    if cls is int:
+        return str(value)
+    if value is None:
+        return ''
+    if isinstance(value, Markup):
+        return value
+    return html.escape(str(value), quote=True)
+
+
+def _names_in(source: str) -> set:
+    """Return the names an expression reads."""
+    tree = ast.parse(source.strip(), mode='eval')
+    return {
+        node.id for node in ast.walk(tree)
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load)
+    }
+
+
+def _targets_in(target: str) -> set:
+    """Return the names a for-loop target binds."""
+    tree = ast.parse(f"for {target} in (): pass")
+    return {
+        node.id for node in ast.walk(tree.body[0].target)
+        if isinstance(node, ast.Name)
+    }
+
+
+def _str(value) -> str:
+    return '' if value is None else str(value)
+
+
+def _repeated_expressions(source: str) -> set:
+    """Return the escaped {{ expr }} texts that occur more than once."""
+    seen, repeated = set(), set()
+    for token in TOKEN_RE.findall(source):
+        if token.startswith('{{') and not SAFE_RE.search(token[2:-2].strip()):
+            expr = token[2:-2].strip()
+            (repeated if expr in seen else seen).add(expr)
+    return repeated
+
+
+def compile_template(source: str, name: str = '<template>') -> Callable[[Dict], str]:
+    """Compile template source into a function taking a context dict."""
+    lines = []
+    indent = 1
+    blocks = []
+    used = set()
+    bound = set()
+    pending = []
+    # An expression escaped more than once is escaped the first time and kept in
+    # a local. Each block gets its own scope, since its code may not run; a for
+    # scope hides outer values that read its loop targets.
+    repeated = _repeated_expressions(source)
+    scopes = [({}, set())]
+    temporaries = 0
+
+    def escaped(expr):
+        nonlocal temporaries
+        if expr not in repeated:
+            return f"_escape({expr})"
+        names = _names_in(expr)
+        for cache, targets in reversed(scopes):
+            if expr in cache:
+                return cache[expr]
+            if targets & names:
+                break
+        var = f"_e{temporaries}"
+        temporaries += 1
+        scopes[-1][0][expr] = var
+        return f"({var} := _escape({expr}))"
+
+    def flush():
+        # Straight-line output becomes a single extend() call
+        if len(pending) == 1:
+            lines.append('    ' * indent + f"_append({pending[0]})")
+        elif pending:
+            lines.append('    ' * indent + f"_extend(({', '.join(pending)}))")
+        pending.clear()
+
+    def emit(code):
+        flush()
+        lines.append('    ' * indent + code)
+
+    def line_of(position):
+        return source.count('\n', 0, position) + 1
+
+    def check(expr, position):
+        try:
+            used.update(_names_in(expr))
+        except SyntaxError as e:
+            raise TemplateSyntaxError(
+                f"{name}, line {line_of(position)}: invalid expression {expr.strip()!r}"
+            ) from e
+
+    position = 0
+    for token in TOKEN_RE.split(source):
+        if not token:
+            continue
+        start = position
+        position += len(token)
+
+        if token.startswith('{#'):
+            continue
+
+        if token.startswith('{{'):
+            expr = token[2:-2].strip()
+            if SAFE_RE.search(expr):
+                expr = SAFE_RE.sub('', expr)
+                check(expr, start)
+                pending.append(f"_str({expr})")
+            else:
+                check(expr, start)
+                pending.append(escaped(expr))
+            continue
+
+        if token.startswith('{%'):
+            tag = token[2:-2].strip()
+            keyword = tag.split(None, 1)[0] if tag else ''
+
+            if keyword == 'if':
+                check(tag[2:], start)
+                emit(f"if {tag[2:].strip()}:")
+                blocks.append('if')
+                scopes.append(({}, set()))
+                indent += 1
+            elif keyword == 'elif':
+                if not blocks or blocks[-1] != 'if':
+                    raise TemplateSyntaxError(f"{name}, line {line_of(start)}: elif outside if")
+                check(tag[4:], start)
+                emit("pass")
+                indent -= 1
+                emit(f"elif {tag[4:].strip()}:")
+                indent += 1
+                scopes[-1] = ({}, set())
+            elif keyword == 'else':
+                if not blocks or blocks[-1] != 'if':
+                    raise TemplateSyntaxError(f"{name}, line {line_of(start)}: else outside if")
+                emit("pass")
+                indent -= 1
+                emit("else:")
+                indent += 1
+                scopes[-1] = ({}, set())
+            elif keyword == 'for':
+                match = FOR_RE.match(tag)
+                if not match:
+                    raise TemplateSyntaxError(f"{name}, line {line_of(start)}: malformed for")
+                target, iterable = match.groups()
+                check(iterable, start)
+                try:
+                    targets = _targets_in(target)
+                except SyntaxError as e:
+                    raise TemplateSyntaxError(
+                        f"{name}, line {line_of(start)}: invalid loop target {target!r}"
+                    ) from e
+                bound.update(targets)
+                emit(f"for {target} in {iterable}:")
+                blocks.append('for')
+                scopes.append(({}, targets))
+                indent += 1
+            elif keyword in ('endif', 'endfor'):
+                if not blocks or blocks[-1] != keyword[3:]:
+                    raise TemplateSyntaxError(f"{name}, line {line_of(start)}: unexpected {keyword}")
+                blocks.pop()
+                scopes.pop()
+                emit("pass")
+                indent -= 1
+            else:
+                raise TemplateSyntaxError(f"{name}, line {line_of(start)}: unknown tag {keyword!r}")
+            continue
+
+        pending.append(repr(token))
+
+    flush()
+    if blocks:
+        raise TemplateSyntaxError(f"{name}: unclosed {blocks[-1]} block")
+
+    # Pull every free name out of the context once, up front
+    header = [
+        f"    {var} = _ctx.get({var!r})"
+        for var in sorted(used - bound - BUILTIN_NAMES)
+    ]
+    # Helpers are bound as default arguments so the body reads them as locals
+    code = "\n".join(
+        ["def _render(_ctx, _escape=_escape, _str=_str):", "    _out = []",
+         "    _append = _out.append", "    _extend = _out.extend"]
+        + header + lines + ["    return ''.join(_out)"]
+    )
+
+    namespace = {'_escape': escape, '_str': _str}
+    exec(compile(code, name, 'exec'), namespace)
+    return namespace['_render']
+
+
+class TemplateLoader:
+    """
+    Loads templates from a directory and caches them by file mtime.
+
+    The mtime is re-checked at most every check_interval seconds, so hot
+    render loops don't pay a stat() per call.
+    """
+
+    def __init__(self, directory: str = TEMPLATE_DIR, check_interval: float = 1.0):
+        self.directory = directory
+        self.check_interval = check_interval
+        self._cache: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Callable[[Dict], str]:
+        """Return the compiled render function for a template file."""
+        now = time.monotonic()
+        cached = self._cache.get(name)
+        if cached and now - cached[1] < self.check_interval:
+            return cached[2]
+
+        path = os.path.join(self.directory, name)
+        mtime = os.stat(path).st_mtime_ns
+        if cached and cached[0] == mtime:
+            render = cached[2]
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                render = compile_template(f.read(), name)
+        with self._lock:
+            self._cache[name] = (mtime, now, render)
+        return render
+
+    def render(self, name: str, **context) -> str:
+        """Render a template file with the given context."""
+        return self.get(name)(context)
+
+
+default_loader = TemplateLoader()
+
+
+def render_template(name: str, **context) -> str:
+    """Render a template from database/templates/."""
+    # Skips TemplateLoader.render: repacking the keyword arguments costs
+    # about as much as a small template's body
+    return default_loader.get(name)(context)
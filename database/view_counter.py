@@ -0,0 +1,119 @@
+"""
+ReasonPath View Counter
+Buffers article view counts in memory and writes them in batches
+"""
+
+import atexit
+import threading
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Tuple
+
+from connection_pool import ConnectionPool
+
+
+class ViewCounter:
+    """
+    In-process aggregator for article page views.
+
+    record() only touches a dict under a lock. Pending counts are written
+    to articles.view_count and the daily article_metrics rows in one
+    transaction, either every flush_interval seconds or as soon as
+    flush_threshold views are waiting. Pending views are flushed on
+    close() and at interpreter exit.
+    """
+
+    def __init__(self, pool: ConnectionPool, flush_interval: float = 5.0,
+                 flush_threshold: int = 1000):
+        self.pool = pool
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self._pending: Dict[Tuple[int, str], int] = defaultdict(int)
+        self._pending_total = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = None
+
+    def record(self, article_id: int, views: int = 1):
+        """Count views for an article without touching the database."""
+        with self._lock:
+            self._pending[(article_id, date.today().isoformat())] += views
+            self._pending_total += views
+            full = self._pending_total >= self.flush_threshold
+            if self._thread is None and not self._stopping:
+                self._start()
+        if full:
+            self._wake.set()
+
+    @property
+    def pending(self) -> int:
+        """Number of views recorded but not yet written."""
+        with self._lock:
+            return self._pending_total
+
+    def flush(self) -> int:
+        """Write all pending views in a single transaction and return how many."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, defaultdict(int)
+                self._pending_total = 0
+            if not batch:
+                return 0
+
+            try:
+                with self.pool.writer() as conn:
+                    totals = defaultdict(int)
+                    for (article_id, _), views in batch.items():
+                        totals[article_id] += views
+                    conn.executemany("""
+                        UPDATE articles SET view_count = view_count + ? WHERE id = ?
+                    """, [(views, article_id) for article_id, views in totals.items()])
+
+                    # Roll into the daily metrics, skipping articles deleted meanwhile
+                    conn.executemany("""
+                        INSERT INTO article_metrics (article_id, date, views)
+                        SELECT ?, ?, ? WHERE EXISTS (SELECT 1 FROM articles WHERE id = ?)
+                        ON CONFLICT (article_id, date) DO UPDATE SET views = views + excluded.views
+                    """, [(article_id, day, views, article_id)
+                          for (article_id, day), views in batch.items()])
+            except Exception:
+                # Put the counts back so the next flush retries them
+                with self._lock:
+                    for key, views in batch.items():
+                        self._pending[key] += views
+                        self._pending_total += views
+                raise
+
+            return sum(batch.values())
+
+    def _start(self):
+        """Start the background flush thread (called with _lock held)."""
+        self._thread = threading.Thread(
+            target=self._run, name="reasonpath-view-counter", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self):
+        while not self._stopping:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if self._stopping:
+                break
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"View counter flush failed, will retry: {e}")
+
+    def close(self):
+        """Stop the flush thread and write any remaining views."""
+        with self._lock:
+            self._stopping = True
+            thread = self._thread
+        if thread is not None:
+            self._wake.set()
+            thread.join()
+            atexit.unregister(self.close)
+        self.flush()
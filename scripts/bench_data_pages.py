@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+ReasonPath Data Pages Benchmark
+Glossary first-paint bytes per loading strategy, and /api/data/ throughput
+
+Usage:
+    python scripts/bench_data_pages.py [--terms 139,2000,10000] [--seconds 3]
+
+First paint is what the glossary must download before showing its first
+10 terms: the whole dictionary.json, the search index plus one term shard,
+or the page manifest plus one page. Sizes are gzipped. The endpoint is
+then hit with random ?page=/&category= queries over one keep-alive
+connection to an in-process test server.
+"""
+
+import argparse
+import functools
+import gzip
+import http.client
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+import urllib.parse
+
+from bench_dictionary_index import synthesise
+from bench_static_cache import load_server_module
+from build_data_pages import DATASETS, build_pages
+from build_dictionary_index import build_index
+
+
+def gzipped(data):
+    return len(gzip.compress(data, 6))
+
+
+def encode(value):
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--terms', default='139,2000,10000', help="Comma-separated dictionary sizes")
+    parser.add_argument('--seconds', type=float, default=3.0, help="Seconds of endpoint load per size")
+    args = parser.parse_args()
+
+    with open(DATASETS['dictionary'], 'r', encoding='utf-8') as f:
+        source = json.load(f)
+    rng = random.Random(42)
+    server_module = load_server_module()
+    handler = functools.partial(server_module.CustomHandler, directory=server_module.WEBSITE_DIR)
+
+    print(f"{'terms':>6}  {'full json':>9}  {'index+shard':>11}  {'manifest+page':>13}  "
+          f"{'api req/s':>9}  {'api p99 ms':>10}")
+    for count in [int(n) for n in args.terms.split(',')]:
+        terms = synthesise(source, count, rng)
+        full = gzipped(json.dumps(terms, indent=2, ensure_ascii=False).encode('utf-8'))
+        index, shards = build_index(terms)
+        indexed = gzipped(encode(index)) + gzipped(shards[index['shards'][0]])
+        manifest, pages = build_pages('dictionary', terms)
+        paged = gzipped(encode(manifest)) + gzipped(pages[manifest['pages'][0]])
+
+        with tempfile.TemporaryDirectory() as data_dir:
+            with open(os.path.join(data_dir, 'dictionary.json'), 'w', encoding='utf-8') as f:
+                json.dump(terms, f)
+            data_pages = server_module.DataPages(data_dir, sources={'dictionary': 'dictionary.json'})
+            httpd = server_module.PooledHTTPServer(('127.0.0.1', 0), handler, workers=2, quiet=True,
+                                                   data_pages=data_pages)
+            threading.Thread(target=httpd.serve_forever, daemon=True).start()
+            categories = sorted({term['category'] for term in terms})
+            conn = http.client.HTTPConnection('127.0.0.1', httpd.server_port)
+            latencies = []
+            try:
+                deadline = time.perf_counter() + args.seconds
+                while time.perf_counter() < deadline:
+                    if rng.random() < 0.5:
+                        query = {'page': rng.randint(1, -(-count // 10))}
+                    else:
+                        query = {'category': rng.choice(categories)}
+                    start = time.perf_counter()
+                    conn.request('GET', '/api/data/dictionary?' + urllib.parse.urlencode(query),
+                                 headers={'Accept-Encoding': 'gzip'})
+                    conn.getresponse().read()
+                    latencies.append(time.perf_counter() - start)
+            finally:
+                conn.close()
+                httpd.drain()
+        latencies.sort()
+        p99 = latencies[int(len(latencies) * 0.99)] * 1000
+
+        print(f"{count:>6}  {full:>9,}  {indexed:>11,}  {paged:>13,}  "
+              f"{len(latencies) / args.seconds:>9,.0f}  {p99:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+ReasonPath Dictionary Index Benchmark
+Bytes before first paint and per-keystroke search cost, full dictionary.json vs the prebuilt index
+
+Usage:
+    python scripts/bench_dictionary_index.py [--terms 139,2000,10000] [--queries 200]
+
+Larger dictionaries are synthesised from the real one by reusing its words,
+so token frequencies stay realistic. Search is timed in Python on both
+paths (the old substring filter over every definition vs a trie walk plus
+postings intersection); the browser does the same work in the same shape.
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import tempfile
+import time
+
+from build_dictionary_index import DEFAULT_SOURCE, STOPWORDS, build_index, tokenize, write_outputs
+
+
+def synthesise(terms, count, rng):
+    """Grow the real dictionary to count terms, drawing words from its own text."""
+    if count <= len(terms):
+        return terms[:count]
+    words = [word for term in terms for word in term['definition'].split()]
+    names = [word for term in terms for word in term['term'].split()]
+    result = list(terms)
+    for n in range(len(terms), count):
+        template = terms[n % len(terms)]
+        result.append(dict(
+            template,
+            id=f"{template['id']}-{n}",
+            term=' '.join(rng.choices(names, k=rng.randint(1, 3))) + f" {n}",
+            definition=' '.join(rng.choices(words, k=len(template['definition'].split()))),
+        ))
+    return result
+
+
+def linear_filter(terms, search):
+    """What the glossary page did before: substring test on every term."""
+    return [term for term in terms
+            if search in term['term'].lower() or search in term['definition'].lower()]
+
+
+def decode(gaps):
+    position = 0
+    result = []
+    for gap in gaps:
+        position += gap
+        result.append(position)
+    return result
+
+
+def match_prefix(index, prefix):
+    """Python mirror of matchPrefix() in src/js/app.js."""
+    node = index['trie']
+    rest = prefix
+    while rest:
+        for label, child in node.items():
+            if label and (label.startswith(rest) or rest.startswith(label)):
+                node = child
+                rest = rest[min(len(label), len(rest)):]
+                break
+        else:
+            return set()
+    positions = set()
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        for label, child in current.items():
+            if label == '':
+                positions.update(decode(index['postings'][child]))
+            else:
+                stack.append(child)
+    return positions
+
+
+def index_search(index, search):
+    tokens = tokenize(search)
+    tokens = [token for token in tokens if token not in STOPWORDS] or tokens
+    matches = None
+    for token in tokens:
+        found = match_prefix(index, token)
+        matches = found if matches is None else matches & found
+    return matches
+
+
+def gzipped(data):
+    return len(gzip.compress(data, 6))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--terms', default='139,2000,10000', help="Comma-separated dictionary sizes")
+    parser.add_argument('--queries', type=int, default=200, help="Searches timed per size")
+    args = parser.parse_args()
+
+    with open(DEFAULT_SOURCE, 'r', encoding='utf-8') as f:
+        source = json.load(f)
+    rng = random.Random(42)
+    vocabulary = sorted({token for term in source for token in tokenize(term['term'])})
+
+    print(f"{'terms':>6}  {'build ms':>8}  {'full json gz':>12}  {'index gz':>9}  {'first paint gz':>14}  "
+          f"{'linear us/q':>11}  {'index us/q':>10}")
+    for count in [int(n) for n in args.terms.split(',')]:
+        terms = synthesise(source, count, rng)
+        full = json.dumps(terms, indent=2, ensure_ascii=False).encode('utf-8')
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            start = time.perf_counter()
+            index, shards = build_index(terms)
+            write_outputs(output_dir, index, shards)
+            build_ms = (time.perf_counter() - start) * 1000
+            with open(os.path.join(output_dir, 'index.json'), 'rb') as f:
+                index_gz = gzipped(f.read())
+        first_shard_gz = gzipped(shards[index['shards'][0]])
+
+        # Typed prefixes of real words, like a user mid-keystroke
+        queries = [rng.choice(vocabulary)[:rng.randint(2, 6)] for _ in range(args.queries)]
+        start = time.perf_counter()
+        for query in queries:
+            linear_filter(terms, query)
+        linear_us = (time.perf_counter() - start) / len(queries) * 1e6
+        start = time.perf_counter()
+        for query in queries:
+            index_search(index, query)
+        index_us = (time.perf_counter() - start) / len(queries) * 1e6
+
+        print(f"{count:>6}  {build_ms:>8,.0f}  {gzipped(full):>12,}  {index_gz:>9,}  "
+              f"{index_gz + first_shard_gz:>14,}  {linear_us:>11,.0f}  {index_us:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+ReasonPath Range Streaming Benchmark
+Peak server memory per download and bytes saved by resuming with Range
+
+Usage:
+    python scripts/bench_range_streaming.py [--sizes 2,32,128] [--connections 8]
+
+Writes throwaway files of each size (MB) into public/, downloads them over
+several concurrent connections from an in-process server, and reports the
+peak Python heap growth seen by tracemalloc. Each download is then
+"interrupted" halfway and resumed with Range + If-Range.
+"""
+
+import argparse
+import functools
+import http.client
+import os
+import threading
+import time
+import tracemalloc
+
+from bench_static_cache import ROOT, load_server_module
+
+
+def download(port, path, headers=None):
+    conn = http.client.HTTPConnection('127.0.0.1', port)
+    conn.request('GET', path, headers=headers or {})
+    response = conn.getresponse()
+    received = 0
+    while True:
+        chunk = response.read(65536)
+        if not chunk:
+            break
+        received += len(chunk)
+    etag = response.getheader('ETag')
+    conn.close()
+    return response.status, received, etag
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--sizes', default='2,32,128', help="Comma-separated file sizes in MB")
+    parser.add_argument('--connections', type=int, default=8, help="Concurrent downloads per size")
+    args = parser.parse_args()
+
+    server_module = load_server_module()
+    handler = functools.partial(server_module.CustomHandler, directory=server_module.WEBSITE_DIR)
+    httpd = server_module.PooledHTTPServer(('127.0.0.1', 0), handler, workers=args.connections, quiet=True)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    port = httpd.server_port
+    # Warm up threads and the route table so the first size isn't penalised
+    for _ in range(args.connections):
+        download(port, '/index.html')
+
+    rows = []
+    try:
+        for size_mb in [int(s) for s in args.sizes.split(',')]:
+            name = f".bench-range-{size_mb}mb.bin"
+            file_path = os.path.join(ROOT, 'public', name)
+            with open(file_path, 'wb') as f:
+                f.write(os.urandom(1024 * 1024) * size_mb)
+            try:
+                url = f"/{name}"
+                tracemalloc.start()
+                baseline = tracemalloc.get_traced_memory()[0]
+                start = time.perf_counter()
+                threads = [threading.Thread(target=download, args=(port, url))
+                           for _ in range(args.connections)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                elapsed = time.perf_counter() - start
+                peak = tracemalloc.get_traced_memory()[1] - baseline
+                tracemalloc.stop()
+
+                # Resume a download that stopped halfway
+                size = size_mb * 1024 * 1024
+                _, _, etag = download(port, url, {'Range': 'bytes=0-0'})
+                status, resumed, _ = download(
+                    port, url, {'Range': f'bytes={size // 2}-', 'If-Range': etag}
+                )
+                rows.append((size_mb, peak, args.connections * size / elapsed, status, resumed, size))
+            finally:
+                os.remove(file_path)
+    finally:
+        httpd.drain()
+
+    print(f"{'file MB':>7}  {'peak heap KB':>12}  {'MB/sec':>7}  {'resume status':>13}  {'resume bytes':>12}")
+    for size_mb, peak, rate, status, resumed, size in rows:
+        print(f"{size_mb:>7}  {peak / 1024:>12,.0f}  {rate / 1e6:>7,.0f}  {status:>13}  "
+              f"{resumed:>12,} ({resumed / size:.0%})")
+
+
+if __name__ == "__main__":
+    main()
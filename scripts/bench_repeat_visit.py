@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+ReasonPath Repeat-Visit Benchmark
+Counts bytes transferred when a browser with a warm cache visits the site again
+
+Usage:
+    python scripts/bench_repeat_visit.py                        # starts its own server
+    python scripts/bench_repeat_visit.py --page /blog/index.html
+    python scripts/bench_repeat_visit.py --url http://localhost:8000
+
+Each page is fetched together with the stylesheets and scripts it links
+and the dictionary data app.js loads. The repeat visit follows browser
+cache rules: responses still fresh under Cache-Control max-age are not
+requested at all, and everything else is revalidated with the ETag or
+Last-Modified from the first visit.
+"""
+
+import argparse
+import http.client
+import re
+import time
+from urllib.parse import urljoin, urlsplit
+
+from load_test_server import free_port, start_server, stop_server
+
+DEFAULT_PAGES = ('/index.html', '/blog/ais-next-frontier-isnt-intelligence-its-context.html')
+# Fetched by src/js/app.js rather than linked from the HTML
+EXTRA_RESOURCES = ('/data/dictionary.json',)
+
+LINK_RE = re.compile(r'<(?:link[^>]+href|script[^>]+src)="([^"]+)"')
+MAX_AGE_RE = re.compile(r'max-age=(\d+)')
+
+
+def fetch(conn, path, headers):
+    """GET a path; return (status, response headers, body, bytes on the wire)."""
+    conn.request('GET', path, headers=headers)
+    response = conn.getresponse()
+    body = response.read()
+    header_bytes = len(f"HTTP/1.1 {response.status} {response.reason}\r\n") + 2
+    header_bytes += sum(len(f"{name}: {value}\r\n") for name, value in response.getheaders())
+    if response.getheader('Connection', '').lower() == 'close' or response.version == 10:
+        conn.close()
+    return response.status, response, body, header_bytes + len(body)
+
+
+def first_visit(conn, pages):
+    """Fetch every page and its resources; return the resulting cache."""
+    cache = {}
+    queue = list(pages) + list(EXTRA_RESOURCES)
+    while queue:
+        path = queue.pop(0)
+        if path in cache:
+            continue
+        status, response, body, size = fetch(conn, path, {'Accept-Encoding': 'gzip'})
+        match = MAX_AGE_RE.search(response.getheader('Cache-Control', ''))
+        cache[path] = {
+            'status': status,
+            'bytes': size,
+            'etag': response.getheader('ETag'),
+            'last_modified': response.getheader('Last-Modified'),
+            'fresh_until': time.time() + int(match.group(1)) if match else 0,
+        }
+        if path.endswith('.html') and status == 200:
+            for link in LINK_RE.findall(body.decode('utf-8', 'replace')):
+                url = urlsplit(urljoin(path, link))
+                if not url.netloc:
+                    queue.append(url.path)
+    return cache
+
+
+def repeat_visit(conn, cache):
+    """Revisit with a warm cache; return (requests sent, bytes, 304s)."""
+    requests = transferred = not_modified = 0
+    for path, entry in cache.items():
+        if entry['status'] != 200 or entry['fresh_until'] > time.time():
+            continue
+        headers = {'Accept-Encoding': 'gzip'}
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        status, _, _, size = fetch(conn, path, headers)
+        requests += 1
+        transferred += size
+        not_modified += status == 304
+    return requests, transferred, not_modified
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--url', help="Benchmark an already running server instead of starting one")
+    parser.add_argument('--page', action='append', dest='pages',
+                        help="Page to visit (repeatable, default: homepage and a blog article)")
+    args = parser.parse_args()
+
+    process = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        host, port = '127.0.0.1', free_port()
+        process = start_server(port, workers=4)
+
+    try:
+        conn = http.client.HTTPConnection(host, port)
+        cache = first_visit(conn, args.pages or DEFAULT_PAGES)
+        first_bytes = sum(entry['bytes'] for entry in cache.values())
+        requests, repeat_bytes, not_modified = repeat_visit(conn, cache)
+        conn.close()
+    finally:
+        if process is not None:
+            stop_server(process)
+
+    print(f"First visit:  {len(cache)} requests, {first_bytes:,} bytes")
+    print(f"Repeat visit: {requests} requests ({not_modified} × 304, "
+          f"{len(cache) - requests} served from cache), {repeat_bytes:,} bytes")
+    if first_bytes:
+        print(f"Repeat visit transfers {repeat_bytes / first_bytes:.1%} of the first visit")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+ReasonPath Static File Cache Benchmark
+Filesystem calls per request and requests/sec with and without the route table and hot file cache
+
+Usage:
+    python scripts/bench_static_cache.py [--seconds 3] [--path /index.html ...]
+
+The server runs in-process so os.stat/os.fstat/open calls made by its
+worker threads can be counted (a stand-in for strace -c, which only sees
+them as stat/fstat/openat). One keep-alive client requests each path back
+to back.
+"""
+
+import argparse
+import builtins
+import functools
+import http.client
+import importlib.util
+import os
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PATHS = ('/index.html', '/data/dictionary.json')
+COUNTED = ('stat', 'lstat', 'fstat', 'open', 'scandir', 'listdir')
+
+
+def load_server_module():
+    spec = importlib.util.spec_from_file_location('test_server', os.path.join(ROOT, 'test-server.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class CallCounter:
+    """Counts filesystem calls made from the server's worker threads."""
+
+    def __init__(self):
+        self.calls = 0
+        self._originals = []
+
+    def _wrap(self, owner, name):
+        original = getattr(owner, name)
+
+        @functools.wraps(original)
+        def counted(*args, **kwargs):
+            if threading.current_thread().name.startswith('reasonpath-http'):
+                self.calls += 1
+            return original(*args, **kwargs)
+
+        self._originals.append((owner, name, original))
+        setattr(owner, name, counted)
+
+    def install(self):
+        for name in COUNTED:
+            self._wrap(os, name)
+        self._wrap(builtins, 'open')
+
+    def uninstall(self):
+        for owner, name, original in reversed(self._originals):
+            setattr(owner, name, original)
+        self._originals.clear()
+
+
+def measure(server_module, files, path, seconds, counter):
+    handler = functools.partial(server_module.CustomHandler, directory=server_module.WEBSITE_DIR)
+    httpd = server_module.PooledHTTPServer(('127.0.0.1', 0), handler, workers=2, quiet=True, files=files)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    conn = http.client.HTTPConnection('127.0.0.1', httpd.server_port)
+    try:
+        # Warm the route table and hot cache
+        conn.request('GET', path)
+        conn.getresponse().read()
+
+        counter.calls = 0
+        requests = 0
+        start = time.perf_counter()
+        deadline = start + seconds
+        while time.perf_counter() < deadline:
+            conn.request('GET', path)
+            conn.getresponse().read()
+            requests += 1
+        elapsed = time.perf_counter() - start
+        calls = counter.calls
+    finally:
+        conn.close()
+        httpd.drain()
+    return calls / requests, requests / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--seconds', type=float, default=3.0, help="Seconds per measurement")
+    parser.add_argument('--path', action='append', dest='paths',
+                        help="Path to request (repeatable, default: homepage and dictionary.json)")
+    args = parser.parse_args()
+
+    server_module = load_server_module()
+    counter = CallCounter()
+    counter.install()
+    try:
+        rows = []
+        for path in args.paths or DEFAULT_PATHS:
+            for label, options in (('uncached', {'hot_cache_bytes': 0, 'cache_routes': False}),
+                                   ('route table + hot cache', {})):
+                files = server_module.StaticFiles(server_module.WEBSITE_DIR, **options)
+                calls, rate = measure(server_module, files, path, args.seconds, counter)
+                rows.append((path, label, calls, rate))
+    finally:
+        counter.uninstall()
+
+    print(f"{'path':<24}  {'mode':<24}  {'fs calls/req':>12}  {'req/sec':>8}")
+    for path, label, calls, rate in rows:
+        print(f"{path:<24}  {label:<24}  {calls:>12.1f}  {rate:>8,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+ReasonPath Data Page Builder
+Splits the dictionary and benchmark datasets into fixed-size JSON pages with a manifest
+
+Usage:
+    python scripts/build_data_pages.py
+    python scripts/build_data_pages.py --dataset dictionary --page-size 10
+
+Output, per dataset, in public/data/pages/<dataset>/ (all minified JSON):
+    manifest.json                     record count, page size, page file names
+                                      for the whole dataset and for every
+                                      category / difficulty value
+    all-<n>.<hash>.json               page n of every record
+    category-<slug>-<n>.<hash>.json   page n of one category
+    difficulty-<slug>-<n>.<hash>.json page n of one difficulty
+
+Every page file is {"page", "pages", "total", "items"}, the same shape the
+test server's /api/data/<dataset> endpoint answers with, so the glossary
+paints its first screen from the manifest and one page file. Page names
+carry a content hash and are only rewritten when their contents change.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from typing import Dict, List, Tuple
+
+from build_dictionary_index import write_if_changed
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUTPUT = os.path.join(ROOT, 'public', 'data', 'pages')
+DEFAULT_PAGE_SIZE = 10  # dictionaryItemsPerPage in src/js/app.js
+
+# Dataset name -> source file. A source is either a list of records or an
+# object whose <dataset name> key maps ids to records (benchmarks.json);
+# its other keys are copied into the manifest as "meta".
+DATASETS = {
+    'dictionary': os.path.join(ROOT, 'data', 'dictionary.json'),
+    'benchmarks': os.path.join(ROOT, 'public', 'data', 'benchmarks.json'),
+}
+
+# Record fields that get their own page sets, when present
+FACETS = ('category', 'difficulty')
+
+PAGE_RE = re.compile(r'^[a-z0-9-]+-\d+\.[0-9a-f]{10}\.json$')
+
+
+def slugify(value: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', value.lower()).strip('-') or 'none'
+
+
+def load_records(name: str, data) -> Tuple[List[Dict], Dict]:
+    """Return (records, meta) for a parsed source file."""
+    if isinstance(data, list):
+        return data, {}
+    records = list(data[name].values())
+    meta = {key: value for key, value in data.items() if key != name}
+    return records, meta
+
+
+def paginate(records: List[Dict], prefix: str, page_size: int, files: Dict[str, bytes]) -> List[str]:
+    """Add the page files for records to files and return their names in order."""
+    pages = max(1, -(-len(records) // page_size))
+    names = []
+    for number in range(1, pages + 1):
+        page = {
+            'page': number,
+            'pages': pages,
+            'total': len(records),
+            'items': records[(number - 1) * page_size:number * page_size],
+        }
+        data = json.dumps(page, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        name = f"{prefix}-{number}.{hashlib.sha1(data).hexdigest()[:10]}.json"
+        files[name] = data
+        names.append(name)
+    return names
+
+
+def build_pages(name: str, data, page_size: int = DEFAULT_PAGE_SIZE) -> Tuple[Dict, Dict[str, bytes]]:
+    """Build the manifest and {file name: contents} for every page of one dataset."""
+    records, meta = load_records(name, data)
+    files: Dict[str, bytes] = {}
+    manifest = {
+        'dataset': name,
+        'count': len(records),
+        'pageSize': page_size,
+        'pages': paginate(records, 'all', page_size, files),
+        'facets': {},
+    }
+    for facet in FACETS:
+        groups: Dict[str, List[Dict]] = {}
+        for record in records:
+            if record.get(facet):
+                groups.setdefault(record[facet], []).append(record)
+        if not groups:
+            continue
+        manifest['facets'][facet] = {
+            value: {
+                'count': len(members),
+                'pages': paginate(members, f"{facet}-{slugify(value)}", page_size, files),
+            }
+            for value, members in sorted(groups.items())
+        }
+    if meta:
+        manifest['meta'] = meta
+    return manifest, files
+
+
+def write_pages(output_dir: str, manifest: Dict, files: Dict[str, bytes]) -> Dict:
+    """Write pages then the manifest, and remove pages no longer referenced."""
+    os.makedirs(output_dir, exist_ok=True)
+    written = 0
+    # Pages first: the old manifest must never point at a page that isn't there yet
+    for name, data in files.items():
+        written += write_if_changed(os.path.join(output_dir, name), data)
+    manifest_data = json.dumps(manifest, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    written += write_if_changed(os.path.join(output_dir, 'manifest.json'), manifest_data)
+
+    removed = 0
+    for name in os.listdir(output_dir):
+        if PAGE_RE.match(name) and name not in files:
+            os.remove(os.path.join(output_dir, name))
+            removed += 1
+
+    return {
+        'written': written,
+        'removed': removed,
+        'manifest_bytes': len(manifest_data),
+        'largest_page': max(len(data) for data in files.values()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Split the dictionary and benchmark data into JSON pages")
+    parser.add_argument('--dataset', action='append', choices=sorted(DATASETS),
+                        help="Dataset to build (repeatable, default: all)")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="Output directory")
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE, help="Records per page")
+    args = parser.parse_args()
+
+    for name in args.dataset or sorted(DATASETS):
+        source = DATASETS[name]
+        try:
+            with open(source, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not read {source}: {e}")
+            sys.exit(1)
+
+        start = time.perf_counter()
+        manifest, files = build_pages(name, data, args.page_size)
+        report = write_pages(os.path.join(args.output, name), manifest, files)
+        elapsed = time.perf_counter() - start
+
+        print(f"✓ {name}: {manifest['count']} records, {len(files)} pages in {elapsed * 1000:.0f}ms "
+              f"({report['written']} files written, {report['removed']} removed)")
+        print(f"  manifest.json {report['manifest_bytes']:,} bytes, largest page {report['largest_page']:,} bytes")
+
+
+if __name__ == "__main__":
+    main()
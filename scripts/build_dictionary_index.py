@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+ReasonPath Dictionary Index Builder
+Turns data/dictionary.json into a small search index plus sharded term files
+
+Usage:
+    python scripts/build_dictionary_index.py
+    python scripts/build_dictionary_index.py --source data/dictionary.json --output public/data/dictionary
+
+Output (all minified JSON):
+    index.json              term ids and names, category/difficulty facets,
+                            stopwords, a radix trie of search tokens and
+                            their postings
+    terms-<n>.<hash>.json   full term records, shard_size terms per file
+
+The glossary page loads index.json, answers searches and filters from it,
+and fetches only the shards holding the terms on the current page. Shard
+names carry a content hash, so the server can cache them for a year.
+Files are only rewritten when their contents change.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SOURCE = os.path.join(ROOT, 'data', 'dictionary.json')
+DEFAULT_OUTPUT = os.path.join(ROOT, 'public', 'data', 'dictionary')
+DEFAULT_SHARD_SIZE = 20
+
+# Fields whose words are searchable
+INDEXED_FIELDS = ('term', 'definition', 'category')
+
+# Too common to narrow a search; dropping them keeps the postings small
+STOPWORDS = frozenset("""
+a an and are as at be by for from has in is it its of on or that the their this to was
+which with can into than then these they when where while how what who will
+""".split())
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+SHARD_RE = re.compile(r'^terms-\d+\.[0-9a-f]{10}\.json$')
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric words, matching tokenize() in src/js/app.js."""
+    return TOKEN_RE.findall(text.lower())
+
+
+def delta_encode(ids: List[int]) -> List[int]:
+    """Store a sorted id list as gaps, which are small numbers and compress well."""
+    previous = 0
+    gaps = []
+    for doc_id in ids:
+        gaps.append(doc_id - previous)
+        previous = doc_id
+    return gaps
+
+
+def build_trie(tokens: List[str]) -> Dict:
+    """
+    Build a radix trie over tokens.
+
+    Each node maps an edge label to a child node; the key '' holds the
+    index of the token ending at that node. Chains of single-child nodes
+    are merged into one edge so the JSON stays small.
+    """
+    root: Dict = {}
+    for index, token in enumerate(tokens):
+        node = root
+        for char in token:
+            node = node.setdefault(char, {})
+        node[''] = index
+
+    def compress(node):
+        compressed = {}
+        for label, child in node.items():
+            if label == '':
+                compressed[''] = child
+                continue
+            while len(child) == 1 and '' not in child:
+                (next_label, child), = child.items()
+                label += next_label
+            compressed[label] = compress(child)
+        return compressed
+
+    return compress(root)
+
+
+def build_index(terms: List[Dict], shard_size: int = DEFAULT_SHARD_SIZE) -> Tuple[Dict, Dict[str, bytes]]:
+    """Build the index document and {file name: contents} for every shard."""
+    postings: Dict[str, set] = {}
+    facets: Dict[str, Dict[str, List[int]]] = {'category': {}, 'difficulty': {}}
+
+    for doc_id, term in enumerate(terms):
+        for field in INDEXED_FIELDS:
+            for token in tokenize(term.get(field) or ''):
+                if token not in STOPWORDS:
+                    postings.setdefault(token, set()).add(doc_id)
+        for facet, values in facets.items():
+            values.setdefault(term.get(facet) or 'Uncategorized', []).append(doc_id)
+
+    tokens = sorted(postings)
+    shards = {}
+    shard_names = []
+    for start in range(0, len(terms), shard_size):
+        data = json.dumps(terms[start:start + shard_size], separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        name = f"terms-{start // shard_size}.{hashlib.sha1(data).hexdigest()[:10]}.json"
+        shards[name] = data
+        shard_names.append(name)
+
+    index = {
+        'count': len(terms),
+        'shardSize': shard_size,
+        'shards': shard_names,
+        'terms': [[term['id'], term['term']] for term in terms],
+        'stopwords': sorted(STOPWORDS),
+        'facets': {
+            facet: {value: delta_encode(ids) for value, ids in sorted(values.items())}
+            for facet, values in facets.items()
+        },
+        'trie': build_trie(tokens),
+        'postings': [delta_encode(sorted(postings[token])) for token in tokens],
+    }
+    return index, shards
+
+
+def write_if_changed(path: str, data: bytes) -> bool:
+    """Atomically write a file unless it already has these contents."""
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.' + os.path.basename(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return True
+
+
+def write_outputs(output_dir: str, index: Dict, shards: Dict[str, bytes]) -> Dict:
+    """Write shards then the index, and remove shards no longer referenced."""
+    os.makedirs(output_dir, exist_ok=True)
+    written = 0
+    # Shards first: the old index must never point at a shard that isn't there yet
+    for name, data in shards.items():
+        written += write_if_changed(os.path.join(output_dir, name), data)
+    index_data = json.dumps(index, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    written += write_if_changed(os.path.join(output_dir, 'index.json'), index_data)
+
+    removed = 0
+    for name in os.listdir(output_dir):
+        if SHARD_RE.match(name) and name not in shards:
+            os.remove(os.path.join(output_dir, name))
+            removed += 1
+
+    return {
+        'written': written,
+        'removed': removed,
+        'index_bytes': len(index_data),
+        'shard_bytes': sum(len(data) for data in shards.values()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the AI dictionary search index and term shards")
+    parser.add_argument('--source', default=DEFAULT_SOURCE, help="Dictionary JSON (a list of terms)")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="Output directory")
+    parser.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE, help="Terms per shard")
+    args = parser.parse_args()
+
+    try:
+        with open(args.source, 'r', encoding='utf-8') as f:
+            terms = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Could not read {args.source}: {e}")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    index, shards = build_index(terms, args.shard_size)
+    report = write_outputs(args.output, index, shards)
+    elapsed = time.perf_counter() - start
+
+    print(f"✓ {index['count']} terms, {len(index['postings'])} tokens, {len(shards)} shards "
+          f"in {elapsed * 1000:.0f}ms ({report['written']} files written, {report['removed']} removed)")
+    print(f"  index.json {report['index_bytes']:,} bytes, shards {report['shard_bytes']:,} bytes total")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+ReasonPath Test Server Load Test
+Measures p50/p99 latency and requests/sec against test-server.py
+
+Usage:
+    python scripts/load_test_server.py                       # starts its own server
+    python scripts/load_test_server.py --concurrency 1,16,128 --duration 5
+    python scripts/load_test_server.py --url http://localhost:8000   # existing server
+
+Each simulated client keeps one connection open (reconnecting when the
+server closes it, as HTTP/1.0 servers do) and requests a mix of site
+assets back to back. The client is asyncio-based, so it can hold 128
+connections without 128 threads; on small machines it shares the CPU
+with the server, which caps the numbers it can report.
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_PATHS = ('/index.html', '/js/app.js', '/css/styles.css', '/data/dictionary.json')
+
+
+class ServerClosed(Exception):
+    """The server closed the connection before sending a full response."""
+
+
+async def read_response(reader) -> bool:
+    """Read one response; return True if the connection can be reused."""
+    status = await reader.readline()
+    if not status:
+        raise ServerClosed()
+    keep_alive = status.startswith(b'HTTP/1.1')
+    length = None
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        name = name.strip().lower()
+        if name == 'content-length':
+            length = int(value)
+        elif name == 'connection':
+            keep_alive = value.strip().lower() != 'close'
+
+    if length is None:
+        await reader.read()
+        return False
+    await reader.readexactly(length)
+    return keep_alive
+
+
+async def client(host, port, paths, headers, deadline, latencies, errors):
+    """Request paths round-robin on one connection until the deadline."""
+    reader = writer = None
+    i = 0
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        request = f"GET {path} HTTP/1.1\r\nHost: {host}\r\n{headers}\r\n".encode()
+        start = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            writer.write(request)
+            keep_alive = await read_response(reader)
+        except (ServerClosed, ConnectionError, asyncio.IncompleteReadError):
+            errors.append(path)
+            keep_alive = False
+        else:
+            latencies.append(time.perf_counter() - start)
+        if not keep_alive and writer is not None:
+            writer.close()
+            reader = writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def run_level(host, port, concurrency, duration, paths, headers):
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(host, port, paths, headers, deadline, latencies, errors)
+        for _ in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+    return latencies, errors, elapsed
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int, workers: int) -> subprocess.Popen:
+    """Start test-server.py and wait until it accepts connections."""
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, 'test-server.py'), '--port', str(port),
+         '--bind', '127.0.0.1', '--workers', str(workers), '--quiet'],
+        stdout=subprocess.DEVNULL
+    )
+    for _ in range(100):
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.1).close()
+            return process
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("test-server.py did not start")
+
+
+def stop_server(process: subprocess.Popen):
+    """Ask the server to shut down gracefully and report how long it took."""
+    start = time.perf_counter()
+    process.send_signal(signal.SIGINT)
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        print("Server did not shut down within 30s")
+        return
+    print(f"Graceful shutdown took {time.perf_counter() - start:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--url', help="Load-test an already running server instead of starting one")
+    parser.add_argument('--concurrency', default='1,16,128', help="Comma-separated connection counts")
+    parser.add_argument('--duration', type=float, default=5.0, help="Seconds per concurrency level")
+    parser.add_argument('--workers', type=int, default=64, help="Worker threads for the spawned server")
+    parser.add_argument('--gzip', action='store_true', help="Send Accept-Encoding: gzip, br")
+    parser.add_argument('--path', action='append', dest='paths',
+                        help="Path to request (repeatable, default: a mix of site assets)")
+    args = parser.parse_args()
+
+    paths = args.paths or list(DEFAULT_PATHS)
+    headers = "Accept-Encoding: gzip, br\r\n" if args.gzip else ""
+    levels = [int(c) for c in args.concurrency.split(',')]
+
+    process = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        host, port = '127.0.0.1', free_port()
+        process = start_server(port, args.workers)
+
+    try:
+        print(f"{'connections':>11}  {'requests':>8}  {'errors':>6}  {'req/sec':>9}  {'p50 ms':>7}  {'p99 ms':>7}")
+        for concurrency in levels:
+            latencies, errors, elapsed = asyncio.run(
+                run_level(host, port, concurrency, args.duration, paths, headers)
+            )
+            print(f"{concurrency:>11}  {len(latencies):>8,}  {len(errors):>6}  "
+                  f"{len(latencies) / elapsed:>9,.0f}  "
+                  f"{percentile(latencies, 0.50) * 1000:>7.2f}  "
+                  f"{percentile(latencies, 0.99) * 1000:>7.2f}")
+    finally:
+        if process is not None:
+            stop_server(process)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+ReasonPath Asset Precompressor
+Writes .gz and .br siblings for text assets so test-server.py can serve them as-is
+
+Usage:
+    python scripts/precompress_assets.py              # src/, public/ and blog/
+    python scripts/precompress_assets.py public/blog  # specific directories
+
+Variants are written at maximum compression, and only when the source changed:
+each variant's mtime is set to its source's mtime, and a variant whose mtime
+matches is left alone. Brotli needs the optional `brotli` package
+(pip install brotli); without it only gzip variants are written.
+"""
+
+import argparse
+import gzip
+import os
+import sys
+import tempfile
+import time
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DIRS = ('src', 'public', 'blog')
+
+# Formats that compress well; images, fonts and archives are already compressed
+COMPRESSIBLE = ('.html', '.css', '.js', '.mjs', '.json', '.svg', '.xml', '.txt', '.map', '.ts', '.ico')
+
+# Below this the headers outweigh the savings
+MIN_SIZE = 256
+
+ENCODINGS = ('br', 'gzip')
+SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compress bytes at the highest level the encoding supports."""
+    if encoding == 'br':
+        return brotli.compress(data, quality=11)
+    # mtime=0 keeps the output byte-identical across runs
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def is_compressible(path: str) -> bool:
+    """True for text assets worth precompressing."""
+    return path.endswith(COMPRESSIBLE)
+
+
+def is_fresh(variant: str, source_mtime: int) -> bool:
+    """True if a variant exists and was written from the current source."""
+    try:
+        return os.stat(variant).st_mtime_ns == source_mtime
+    except FileNotFoundError:
+        return False
+
+
+def remove_variant(variant: str):
+    """Delete a stale or useless variant if there is one."""
+    try:
+        os.remove(variant)
+    except FileNotFoundError:
+        pass
+
+
+def write_variant(variant: str, data: bytes, source_stat: os.stat_result):
+    """Atomically write a variant and stamp it with the source's mtime."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(variant), prefix='.precompress-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.utime(tmp_path, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+        os.replace(tmp_path, variant)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def iter_assets(directories):
+    """Yield every compressible file under the given directories."""
+    for directory in directories:
+        for root, dirs, files in os.walk(directory):
+            dirs.sort()
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                if is_compressible(path):
+                    yield path
+
+
+def precompress(directories, encodings=ENCODINGS, force: bool = False) -> dict:
+    """
+    Write compressed variants for every asset whose source changed.
+
+    Returns totals: files seen, variants written, original bytes and the
+    bytes a client would receive using the best variant available.
+    """
+    stats = {'files': 0, 'written': 0, 'skipped': 0, 'original': 0, 'transferred': 0}
+
+    for path in iter_assets(directories):
+        source_stat = os.stat(path)
+        stats['files'] += 1
+        stats['original'] += source_stat.st_size
+        best = source_stat.st_size
+
+        data = None
+        for encoding in encodings:
+            variant = path + SUFFIXES[encoding]
+
+            if source_stat.st_size < MIN_SIZE:
+                remove_variant(variant)
+                continue
+
+            if not force and is_fresh(variant, source_stat.st_mtime_ns):
+                stats['skipped'] += 1
+                best = min(best, os.path.getsize(variant))
+                continue
+
+            if data is None:
+                with open(path, 'rb') as f:
+                    data = f.read()
+            compressed = compress(data, encoding)
+            if len(compressed) >= len(data):
+                # Not worth serving; make sure an old variant isn't either
+                remove_variant(variant)
+                continue
+
+            write_variant(variant, compressed, source_stat)
+            stats['written'] += 1
+            best = min(best, len(compressed))
+
+        stats['transferred'] += best
+
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompress ReasonPath text assets with gzip and brotli")
+    parser.add_argument('directories', nargs='*',
+                        help="Directories to walk (default: src, public, blog)")
+    parser.add_argument('--force', action='store_true', help="Recompress everything")
+    args = parser.parse_args()
+
+    directories = args.directories or [
+        os.path.join(ROOT, d) for d in DEFAULT_DIRS if os.path.isdir(os.path.join(ROOT, d))
+    ]
+    missing = [d for d in directories if not os.path.isdir(d)]
+    if missing:
+        print(f"Directory not found: {', '.join(missing)}")
+        sys.exit(1)
+
+    encodings = ENCODINGS
+    if brotli is None:
+        print("ℹ️ brotli not installed (pip install brotli); writing gzip variants only")
+        encodings = ('gzip',)
+
+    start = time.perf_counter()
+    stats = precompress(directories, encodings, force=args.force)
+    elapsed = time.perf_counter() - start
+
+    saved = stats['original'] - stats['transferred']
+    percent = saved / stats['original'] * 100 if stats['original'] else 0
+    print(f"✓ {stats['files']} assets: {stats['written']} variants written, "
+          f"{stats['skipped']} up to date ({elapsed:.2f}s)")
+    print(f"  {stats['original']:,} bytes → {stats['transferred']:,} bytes over the wire "
+          f"({saved:,} bytes saved, {percent:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,9 +5,17 @@ class ReasonPathApp {
         this.mobileMenuOpen = false;
         this.currentPage = 'home';
         
-        // Dictionary state
-        this.dictionaryData = [];
-        this.filteredDictionary = [];
+        // Dictionary state: browsing reads prebuilt pages, searching loads the index
+        this.dictionaryManifest = null;   // scripts/build_data_pages.py
+        this.dictionaryIndex = null;      // scripts/build_dictionary_index.py, loaded on demand
+        this.dictionaryIndexRequest = null;
+        this.dictionaryData = [];         // [{ id, term }] for every term, from the index
+        this.termNames = new Map();       // term id -> display name, for related terms
+        this.jsonRequests = new Map();    // URL -> Promise of parsed JSON
+        this.dictionarySearch = '';
+        this.filteredDictionary = [];     // search results, as positions into dictionaryData
+        this.dictionaryResultCount = 0;
+        this.dictionaryRenderId = 0;
         this.dictionaryDataLoaded = false;
         this.dictionaryCurrentPage = 1;
         this.dictionaryItemsPerPage = 10; // Show 10 terms per page
@@ -141,21 +149,22 @@ class ReasonPathApp {
         }
 
         try {
-            const response = await fetch(config.apiBasePath + config.dictionaryPath);
-            if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
-            
-            this.dictionaryData = await response.json();
+            // First paint needs only the page manifest and the first page
+            this.dictionaryManifest = await this.fetchJSON(config.apiBasePath + config.dictionaryPagesPath + 'manifest.json');
             this.dictionaryDataLoaded = true;
-            this.filteredDictionary = [...this.dictionaryData];
             
             if (config.logLevel === 'debug') {
-                console.log(`Successfully loaded ${this.dictionaryData.length} glossary terms`);
+                console.log(`Successfully loaded manifest for ${this.dictionaryManifest.count} glossary terms`);
             }
 
             this.dictionaryCurrentPage = 1;
-            this.updateDictionaryDisplay();
-            this.updateResultsCount();
-            this.showToast(`AI Glossary loaded: ${this.dictionaryData.length} terms ready`, 'success');
+            await this.updateDictionaryDisplay();
+            this.showToast(`AI Glossary loaded: ${this.dictionaryManifest.count} terms ready`, 'success');
+
+            // Search index next; once it arrives related terms can be named
+            this.loadDictionaryIndex().then(() => {
+                if (!this.dictionarySearch) this.updateDictionaryDisplay();
+            }).catch(error => console.error('Glossary index loading failed:', error));
 
         } catch (error) {
             console.error('Glossary loading failed:', error);
@@ -168,36 +177,110 @@ class ReasonPathApp {
         }
     }
 
-    updateDictionaryDisplay() {
+    async updateDictionaryDisplay() {
         const dictionaryGrid = document.querySelector('#dictionary-grid');
         if (!dictionaryGrid) return;
 
         if (!this.dictionaryDataLoaded) return;
 
-        if (this.filteredDictionary.length === 0) {
+        // Ignore responses for a page the user has already moved past
+        const renderId = ++this.dictionaryRenderId;
+        let pageItems;
+        let total;
+        try {
+            if (this.dictionarySearch) {
+                // Pagination Calculations
+                const startIndex = (this.dictionaryCurrentPage - 1) * this.dictionaryItemsPerPage;
+                const endIndex = startIndex + this.dictionaryItemsPerPage;
+                pageItems = await this.loadTerms(this.filteredDictionary.slice(startIndex, endIndex));
+                total = this.filteredDictionary.length;
+            } else {
+                const page = await this.loadPage(this.currentCategory, this.dictionaryCurrentPage);
+                pageItems = page.items;
+                total = page.total;
+            }
+        } catch (error) {
+            console.error('Glossary page loading failed:', error);
+            dictionaryGrid.innerHTML = `<div class="no-results"><p>🚫 Could not load these terms. Please try again.</p></div>`;
+            return;
+        }
+        if (renderId !== this.dictionaryRenderId) return;
+
+        this.dictionaryResultCount = total;
+        this.updateResultsCount();
+
+        if (total === 0) {
             dictionaryGrid.innerHTML = `<div class="no-results"><p>🔍 No terms found. Try adjusting your search.</p></div>`;
             document.querySelector('#pagination-controls').innerHTML = ''; // Clear pagination
             return;
         }
 
-        // Pagination Calculations
-        const startIndex = (this.dictionaryCurrentPage - 1) * this.dictionaryItemsPerPage;
-        const endIndex = startIndex + this.dictionaryItemsPerPage;
-        const pageItems = this.filteredDictionary.slice(startIndex, endIndex);
-
         const termsHTML = pageItems.map(term => this.renderTerm(term)).join('');
         dictionaryGrid.innerHTML = termsHTML;
 
         this.renderPaginationControls();
     }
 
+    // One prebuilt page of the whole glossary or of one category
+    loadPage(category, pageNumber) {
+        const manifest = this.dictionaryManifest;
+        const files = category === 'all'
+            ? manifest.pages
+            : (manifest.facets.category[category] || { pages: [] }).pages;
+        if (files.length === 0) {
+            return Promise.resolve({ page: 1, pages: 1, total: 0, items: [] });
+        }
+        return this.fetchJSON(config.apiBasePath + config.dictionaryPagesPath + files[pageNumber - 1]);
+    }
+
+    loadDictionaryIndex() {
+        if (!this.dictionaryIndexRequest) {
+            this.dictionaryIndexRequest = this.fetchJSON(config.apiBasePath + config.dictionaryIndexPath).then(index => {
+                index.stopwords = new Set(index.stopwords);
+                this.dictionaryIndex = index;
+                this.dictionaryData = index.terms.map(([id, term]) => ({ id, term }));
+                this.termNames = new Map(index.terms);
+            }).catch(error => {
+                this.dictionaryIndexRequest = null; // Retry on the next search
+                throw error;
+            });
+        }
+        return this.dictionaryIndexRequest;
+    }
+
+    // Full records for the given term positions, fetching only the shards that hold them
+    async loadTerms(positions) {
+        const { shardSize, shards } = this.dictionaryIndex;
+        const shardNumbers = [...new Set(positions.map(position => Math.floor(position / shardSize)))];
+        const loaded = new Map(await Promise.all(shardNumbers.map(async number => [
+            number,
+            await this.fetchJSON(config.apiBasePath + config.dictionaryShardPath + shards[number])
+        ])));
+        return positions.map(position => loaded.get(Math.floor(position / shardSize))[position % shardSize]);
+    }
+
+    // Each URL is fetched once; failures are forgotten so the next render retries
+    fetchJSON(url) {
+        if (!this.jsonRequests.has(url)) {
+            const request = fetch(url).then(response => {
+                if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
+                return response.json();
+            }).catch(error => {
+                this.jsonRequests.delete(url);
+                throw error;
+            });
+            this.jsonRequests.set(url, request);
+        }
+        return this.jsonRequests.get(url);
+    }
+
     renderTerm(term) {
         const escape = this.escapeHTML;
         const analogyHTML = term.analogy ? `<div class="term-analogy"><h4>💡 Think of it this way:</h4><p>${escape(term.analogy)}</p></div>` : '';
         const exampleHTML = term.example ? `<div class="term-example"><h4>Example:</h4><p><code>${escape(term.example)}</code></p></div>` : '';
         const relatedHTML = term.related && term.related.length > 0 ? `<div class="term-related"><h4>Related terms:</h4><div class="related-tags">${term.related.map(id => {
-            const relatedTerm = this.dictionaryData.find(t => t.id === id);
-            return relatedTerm ? `<span class="related-tag" data-related="${escape(id)}">${escape(relatedTerm.term)}</span>` : '';
+            const relatedName = this.termNames.get(id);
+            return relatedName ? `<span class="related-tag" data-related="${escape(id)}">${escape(relatedName)}</span>` : '';
         }).join('')}</div></div>` : '';
 
         return `
@@ -221,7 +304,7 @@ class ReasonPathApp {
         const controlsContainer = document.querySelector('#pagination-controls');
         if (!controlsContainer) return;
 
-        const totalPages = Math.ceil(this.filteredDictionary.length / this.dictionaryItemsPerPage);
+        const totalPages = Math.ceil(this.dictionaryResultCount / this.dictionaryItemsPerPage);
         if (totalPages <= 1) {
             controlsContainer.innerHTML = '';
             return;
@@ -244,20 +327,87 @@ class ReasonPathApp {
         controlsContainer.innerHTML = html;
     }
 
-    filterDictionary(searchTerm = '', category = 'all') {
+    async filterDictionary(searchTerm = '', category = 'all') {
         if (!this.dictionaryDataLoaded) return;
 
-        this.filteredDictionary = this.dictionaryData.filter(term => {
-            const matchesSearch = !searchTerm || 
-                term.term.toLowerCase().includes(searchTerm) ||
-                term.definition.toLowerCase().includes(searchTerm);
-            const matchesCategory = category === 'all' || term.category === category;
-            return matchesSearch && matchesCategory;
-        });
-
         this.dictionaryCurrentPage = 1; // Reset to first page on new filter
-        this.updateDictionaryDisplay();
-        this.updateResultsCount();
+        const tokens = this.tokenize(searchTerm);
+        this.dictionarySearch = tokens.length ? searchTerm : '';
+        if (!this.dictionarySearch) {
+            // Plain browsing is served from prebuilt pages
+            return this.updateDictionaryDisplay();
+        }
+
+        try {
+            await this.loadDictionaryIndex();
+        } catch (error) {
+            console.error('Glossary index loading failed:', error);
+            return;
+        }
+        // A newer search started while the index was loading
+        if (this.dictionarySearch !== searchTerm || this.currentCategory !== category) return;
+
+        // Every word must prefix-match a word of the term, definition or category
+        let matches = null;
+        const meaningful = tokens.filter(token => !this.dictionaryIndex.stopwords.has(token));
+        for (const token of (meaningful.length ? meaningful : tokens)) {
+            const tokenMatches = this.matchPrefix(token);
+            matches = matches === null
+                ? tokenMatches
+                : new Set([...matches].filter(position => tokenMatches.has(position)));
+        }
+
+        if (category !== 'all') {
+            const inCategory = new Set(this.decodePostings(this.dictionaryIndex.facets.category[category] || []));
+            matches = new Set([...(matches || inCategory)].filter(position => inCategory.has(position)));
+        }
+
+        // Terms whose name contains the search come first, then dictionary order
+        const rank = position => (this.dictionaryData[position].term.toLowerCase().includes(searchTerm) ? 0 : 1);
+        this.filteredDictionary = [...matches].sort((a, b) => (rank(a) - rank(b)) || (a - b));
+
+        return this.updateDictionaryDisplay();
+    }
+
+    // Must match tokenize() in scripts/build_dictionary_index.py
+    tokenize(text) {
+        return text.toLowerCase().match(/[a-z0-9]+/g) || [];
+    }
+
+    decodePostings(gaps) {
+        let position = 0;
+        return gaps.map(gap => (position += gap));
+    }
+
+    // Term positions for every indexed word starting with prefix, via the radix trie
+    matchPrefix(prefix) {
+        let node = this.dictionaryIndex.trie;
+        let rest = prefix;
+        while (rest) {
+            let next = null;
+            for (const label of Object.keys(node)) {
+                if (label && (label.startsWith(rest) || rest.startsWith(label))) {
+                    next = node[label];
+                    rest = rest.slice(Math.min(label.length, rest.length));
+                    break;
+                }
+            }
+            if (!next) return new Set();
+            node = next;
+        }
+
+        const positions = new Set();
+        const collect = current => {
+            for (const [label, child] of Object.entries(current)) {
+                if (label === '') {
+                    this.decodePostings(this.dictionaryIndex.postings[child]).forEach(p => positions.add(p));
+                } else {
+                    collect(child);
+                }
+            }
+        };
+        collect(node);
+        return positions;
     }
 
     filterByCategory(category) {
@@ -270,8 +420,8 @@ class ReasonPathApp {
     updateResultsCount() {
         const countElement = document.querySelector('#results-count');
         if (countElement) {
-            const count = this.filteredDictionary.length;
-            const total = this.dictionaryData.length;
+            const count = this.dictionaryResultCount;
+            const total = this.dictionaryManifest ? this.dictionaryManifest.count : 0;
             countElement.textContent = total > 0 ? `Showing ${count} of ${total} terms` : 'Loading...';
         }
     }
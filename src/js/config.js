@@ -4,12 +4,18 @@ const config = {
     development: {
         logLevel: 'debug',
         apiBasePath: '/', // Served from the root of the dev server
-        dictionaryPath: 'data/dictionary.json'
+        dictionaryPath: 'data/dictionary.json',
+        dictionaryIndexPath: 'data/dictionary/index.json',
+        dictionaryShardPath: 'data/dictionary/',
+        dictionaryPagesPath: 'data/pages/dictionary/'
     },
     production: {
         logLevel: 'info',
         apiBasePath: 'https://your-production-domain.com/',
-        dictionaryPath: 'data/dictionary.json'
+        dictionaryPath: 'data/dictionary.json',
+        dictionaryIndexPath: 'data/dictionary/index.json',
+        dictionaryShardPath: 'data/dictionary/',
+        dictionaryPagesPath: 'data/pages/dictionary/'
     }
 };
 
@@ -3,76 +3,844 @@
 Simple HTTP server for testing ReasonPath
 - Serves from a /src directory for source files and /public for static assets.
 - Implements basic caching headers.
-- Serves pre-compressed .gz files if available.
+- Serves precompressed .br/.gz variants (see scripts/precompress_assets.py)
+  negotiated from Accept-Encoding, streamed straight from disk.
+- HTTP/1.1 keep-alive connections served by a bounded thread pool, with
+  large files sent zero-copy via sendfile() and graceful shutdown.
+- Strong ETags and Last-Modified on every file, answering If-None-Match /
+  If-Modified-Since with 304 Not Modified.
+- Resolved paths are kept in a route table and small files in an in-memory
+  LRU, both refreshed by polling file mtimes.
+- Range / If-Range requests answered with 206 Partial Content (multipart
+  for several ranges); bodies stream through one fixed buffer per connection.
+- /api/data/<dataset>?page=&category=&difficulty= answers pages of the
+  dictionary and benchmark data from an in-memory index (the same shape as
+  the files written by scripts/build_data_pages.py).
+
+Usage:
+    python test-server.py [--port 8000] [--workers 64] [--quiet] [--no-file-cache]
 """
+import argparse
+import email.utils
+import functools
+import gzip
+import hashlib
 import http.server
-import socketserver
+import io
+import json
+import mimetypes
 import os
-import gzip
-from io import BytesIO
+import re
+import secrets
+import signal
+import socket
+import stat
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+WEBSITE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+PORT = 8000
+
+# Connections served at once; further connections wait in the accept backlog
+DEFAULT_WORKERS = 64
+
+# Seconds an idle keep-alive connection may hold a worker
+KEEPALIVE_TIMEOUT = 5
+
+# Files at least this large are sent with sendfile() instead of read()/write()
+SENDFILE_THRESHOLD = 64 * 1024
+
+# Per-connection buffer for streaming file data that isn't sendfile()d
+STREAM_BUFFER_SIZE = 64 * 1024
+
+# Range headers with more parts than this are ignored and the whole file sent
+MAX_RANGES = 32
+
+# Directories searched, in order, before falling back to the website root
+SERVE_ROOTS = ('src', 'public')
+
+# Files up to this size are kept in memory after their first request
+HOT_FILE_MAX_SIZE = 256 * 1024
+
+# Memory budget for hot file contents
+HOT_CACHE_BYTES = 32 * 1024 * 1024
+
+# Seconds between mtime checks of every routed file
+POLL_INTERVAL = 1.0
+
+# Preferred first; suffixes match scripts/precompress_assets.py
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+COMPRESSIBLE = ('.html', '.css', '.js', '.mjs', '.json', '.svg', '.xml', '.txt', '.map', '.ts', '.ico')
+
+# Content-hashed names written by the site builder, e.g. styles.0123456789.css;
+# only these are safe to cache for a year
+FINGERPRINTED_RE = re.compile(r'\.[0-9a-f]{10}\.[^./]+$')
+
+# Paged JSON data API; sources and page size match scripts/build_data_pages.py
+DATA_API_PREFIX = '/api/data/'
+DATA_SOURCES = {
+    'dictionary': os.path.join('data', 'dictionary.json'),
+    'benchmarks': os.path.join('public', 'data', 'benchmarks.json'),
+}
+DATA_FACETS = ('category', 'difficulty')
+DATA_PAGE_SIZE = 10
+
+class ETagCache:
+    """
+    Strong ETags computed from file contents once per file version.
+
+    Entries are keyed by path and reused while the file's inode, mtime and
+    size are unchanged, so a file is hashed once per edit, not per request.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, path, version):
+        """ETag for a file at a given (inode, mtime, size) version."""
+        entry = self._entries.get(path)
+        if entry and entry[0] == version:
+            return entry[1]
+
+        digest = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(65536), b''):
+                digest.update(block)
+        etag = f'"{digest.hexdigest()[:20]}"'
+        with self._lock:
+            self._entries[path] = (version, etag)
+        return etag
+
+etag_cache = ETagCache()
+
+def etag_matches(header, etag):
+    """True if an If-None-Match header lists this ETag (weak comparison) or *."""
+    if header.strip() == '*':
+        return True
+    candidates = (tag.strip() for tag in header.split(','))
+    return any(tag.removeprefix('W/') == etag for tag in candidates)
+
+def parse_range(header, size):
+    """
+    Parse a Range header into sorted, merged (start, end) byte offsets, inclusive.
+
+    Returns None when the header must be ignored (not bytes, malformed or
+    too many parts) and [] when none of the ranges can be satisfied.
+    """
+    unit, _, spec = header.partition('=')
+    if unit.strip().lower() != 'bytes' or not spec.strip():
+        return None
+    parts = [part.strip() for part in spec.split(',') if part.strip()]
+    if not parts or len(parts) > MAX_RANGES:
+        return None
+
+    ranges = []
+    for part in parts:
+        first, dash, last = part.partition('-')
+        if not dash:
+            return None
+        try:
+            if not first:
+                # Suffix range: the last N bytes
+                length = int(last)
+                if length < 0:
+                    return None
+                if length == 0:
+                    continue
+                start, end = max(0, size - length), size - 1
+            else:
+                start = int(first)
+                end = int(last) if last else size - 1
+                if last and end < start:
+                    return None
+        except ValueError:
+            return None
+        if start >= size:
+            continue
+        ranges.append((start, min(end, size - 1)))
+
+    ranges.sort()
+    merged = []
+    for start, end in ranges:
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+@functools.lru_cache(maxsize=256)
+def parse_accept_encoding(header):
+    """Map each encoding in an Accept-Encoding header to its q-value."""
+    accepted = {}
+    for part in header.split(','):
+        name, _, params = part.partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            key, _, value = param.partition('=')
+            if key.strip() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[name] = q
+    return accepted
+
+def guess_type(path):
+    """Content type SimpleHTTPRequestHandler would send for a path."""
+    extensions_map = http.server.SimpleHTTPRequestHandler.extensions_map
+    ext = os.path.splitext(path)[1]
+    if ext in extensions_map:
+        return extensions_map[ext]
+    if ext.lower() in extensions_map:
+        return extensions_map[ext.lower()]
+    return mimetypes.guess_type(path)[0] or 'application/octet-stream'
+
+def file_version(path):
+    """(inode, mtime, size) of a regular file, or None if there isn't one."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+class Route:
+    """
+    A request path resolved to a file and everything needed to serve it.
+
+    representations lists (encoding, path, size, etag, version) tuples,
+    precompressed variants in preference order with the identity file last.
+    watched holds (path, version) for every file the resolution depended
+    on, including candidates that didn't exist, so the poller can tell
+    when the route would resolve differently.
+    """
+
+    __slots__ = ('path', 'content_type', 'mtime', 'representations', 'watched')
+
+    def __init__(self, path, content_type, mtime, representations, watched):
+        self.path = path
+        self.content_type = content_type
+        self.mtime = mtime
+        self.representations = representations
+        self.watched = watched
+
+    def negotiate(self, accept_encoding):
+        """Pick the representation to send for an Accept-Encoding header."""
+        if len(self.representations) > 1 and accept_encoding:
+            accepted = parse_accept_encoding(accept_encoding)
+            for representation in self.representations[:-1]:
+                if accepted.get(representation[0], accepted.get('*', 0)) > 0:
+                    return representation
+        return self.representations[-1]
+
+class HotFileCache:
+    """Size-bounded LRU of small file contents, keyed by path and file version."""
+
+    def __init__(self, max_bytes=HOT_CACHE_BYTES, max_file_size=HOT_FILE_MAX_SIZE):
+        self.max_bytes = max_bytes
+        self.max_file_size = max_file_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, path, version):
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        return None
+
+    def put(self, path, version, data):
+        if len(data) > self.max_file_size or len(data) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self._size -= len(old[1])
+            self._entries[path] = (version, data)
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def discard(self, path):
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self._size -= len(old[1])
+
+class StaticFiles:
+    """
+    Route table from request paths to files, backed by a hot file cache.
+
+    The first request for a path probes src/, public/ and the website root
+    and the .br/.gz variants, hashes the ETags and stores the result as a
+    Route; later requests are a dict lookup. Small files are then served
+    from memory, larger ones opened directly. A background thread re-stats
+    every watched file each poll_interval seconds and drops routes whose
+    files changed, so edits are picked up within one interval.
+    """
+
+    def __init__(self, directory, roots=SERVE_ROOTS, poll_interval=POLL_INTERVAL,
+                 hot_cache_bytes=HOT_CACHE_BYTES, cache_routes=True):
+        self.directory = directory
+        self.roots = roots
+        self.poll_interval = poll_interval
+        self.cache_routes = cache_routes
+        self.hot_cache = HotFileCache(max_bytes=hot_cache_bytes)
+        self._routes = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def candidates(self, path):
+        """Files a translated request path may resolve to, in priority order."""
+        relative = os.path.relpath(path, self.directory)
+        if path.endswith('/'):
+            # Directory URLs serve the index page the site builder writes
+            relative = os.path.join(relative, 'index.html')
+        paths = [os.path.join(self.directory, root, relative) for root in self.roots]
+        paths.append(os.path.join(self.directory, relative))
+        return paths
+
+    def lookup(self, path):
+        """Return the Route for a translated request path, or None if no file matches."""
+        route = self._routes.get(path)
+        if route is None:
+            route = self.build_route(path)
+            if route is not None and self.cache_routes:
+                self._routes[path] = route
+        return route
+
+    def build_route(self, path):
+        watched = []
+        for candidate in self.candidates(path):
+            version = file_version(candidate)
+            watched.append((candidate, version))
+            if version is not None:
+                break
+        else:
+            return None
+
+        source, source_version = watched[-1]
+        representations = []
+        if source.endswith(COMPRESSIBLE):
+            for encoding, suffix in ENCODINGS:
+                variant = source + suffix
+                version = file_version(variant)
+                watched.append((variant, version))
+                # A variant older than its source is stale
+                if version is not None and version[1] >= source_version[1]:
+                    representations.append(
+                        (encoding, variant, version[2], etag_cache.get(variant, version), version)
+                    )
+        representations.append(
+            (None, source, source_version[2], etag_cache.get(source, source_version), source_version)
+        )
+        return Route(source, guess_type(source), source_version[1] / 1e9, representations, watched)
+
+    def open(self, representation):
+        """Return a file object with the representation's bytes, or None if it changed."""
+        path, version = representation[1], representation[4]
+        cacheable = version[2] <= min(self.hot_cache.max_file_size, self.hot_cache.max_bytes)
+        if cacheable:
+            data = self.hot_cache.get(path, version)
+            if data is not None:
+                return io.BytesIO(data)
+        try:
+            f = open(path, 'rb')
+        except OSError:
+            return None
+        st = os.fstat(f.fileno())
+        if (st.st_ino, st.st_mtime_ns, st.st_size) != version:
+            f.close()
+            return None
+        if cacheable:
+            with f:
+                data = f.read()
+            self.hot_cache.put(path, version, data)
+            return io.BytesIO(data)
+        return f
+
+    def invalidate(self, path):
+        """Forget a route and the cached contents of its files."""
+        route = self._routes.pop(path, None)
+        if route is not None:
+            for representation in route.representations:
+                self.hot_cache.discard(representation[1])
+
+    def poll(self):
+        """Drop every route whose watched files changed; returns how many."""
+        dropped = 0
+        for path, route in list(self._routes.items()):
+            if any(file_version(watched) != version for watched, version in route.watched):
+                self.invalidate(path)
+                dropped += 1
+        return dropped
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            self.poll()
 
-# Change to website directory
-os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    def start(self):
+        """Start the background mtime poller."""
+        if self.cache_routes and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='reasonpath-file-poller', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+class DataPages:
+    """
+    In-memory index over the JSON datasets behind /api/data/.
+
+    Each dataset is parsed once into its records plus, for every facet
+    value, the positions of the matching records. Encoded pages (and their
+    gzip copies) are cached per query until the source file changes; the
+    file is re-stat'ed at most once per check_interval seconds.
+    """
+
+    def __init__(self, directory, sources=DATA_SOURCES, page_size=DATA_PAGE_SIZE,
+                 check_interval=POLL_INTERVAL):
+        self.directory = directory
+        self.sources = sources
+        self.page_size = page_size
+        self.check_interval = check_interval
+        self._datasets = {}
+        self._lock = threading.Lock()
+
+    def load(self, name):
+        """Return (version, records, facets, pages) for a dataset, reloading it if it changed."""
+        now = time.monotonic()
+        entry = self._datasets.get(name)
+        if entry is not None and now - entry[0] < self.check_interval:
+            return entry[1]
+        with self._lock:
+            entry = self._datasets.get(name)
+            if entry is not None and now - entry[0] < self.check_interval:
+                return entry[1]
+            path = os.path.join(self.directory, self.sources[name])
+            version = file_version(path)
+            if version is None:
+                raise FileNotFoundError(path)
+            if entry is None or entry[1][0] != version:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                records = data if isinstance(data, list) else list(data[name].values())
+                facets = {facet: {} for facet in DATA_FACETS}
+                for position, record in enumerate(records):
+                    for facet, values in facets.items():
+                        if record.get(facet):
+                            values.setdefault(record[facet], []).append(position)
+                dataset = (version, records, facets, {})
+            else:
+                dataset = entry[1]
+            self._datasets[name] = (now, dataset)
+            return dataset
+
+    def page(self, name, filters, number):
+        """
+        Return (body, gzip_body, etag, mtime) for one page, or None if the
+        dataset or page doesn't exist. filters is a tuple of (facet, value).
+        """
+        if name not in self.sources:
+            return None
+        version, records, facets, pages = self.load(name)
+        key = (filters, number)
+        cached = pages.get(key)
+        if cached is not None:
+            return cached
+
+        positions = None
+        for facet, value in filters:
+            matching = facets[facet].get(value, [])
+            positions = matching if positions is None else sorted(set(positions) & set(matching))
+        total = len(records) if positions is None else len(positions)
+        page_count = max(1, -(-total // self.page_size))
+        if number > page_count:
+            return None
+        start = (number - 1) * self.page_size
+        if positions is None:
+            items = records[start:start + self.page_size]
+        else:
+            items = [records[position] for position in positions[start:start + self.page_size]]
+
+        body = json.dumps({'page': number, 'pages': page_count, 'total': total, 'items': items},
+                          separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        result = (body, gzip.compress(body, 6), f'"{hashlib.sha1(body).hexdigest()[:20]}"', version[1] / 1e9)
+        # Only queries naming real facet values are cached, so arbitrary
+        # query strings can't grow the cache
+        if all(value in facets[facet] for facet, value in filters):
+            pages[key] = result
+        return result
+
+class FileBody:
+    """
+    Byte spans of an open file (or in-memory copy) that make up a response body.
+
+    parts is a list of (prefix, offset, length): bytes written before the
+    span (multipart headers, or b''), then length bytes from offset.
+    trailer is written last. copyfile() streams it; do_HEAD just closes it.
+    """
+
+    def __init__(self, source, parts, trailer=b''):
+        self.source = source
+        self.parts = parts
+        self.trailer = trailer
+
+    @property
+    def length(self):
+        return sum(len(prefix) + length for prefix, _, length in self.parts) + len(self.trailer)
+
+    def close(self):
+        self.source.close()
 
 class CustomHandler(http.server.SimpleHTTPRequestHandler):
-    def do_GET(self):
-        # Serve from /src first, then /public
-        src_path = os.path.join('src', self.path.lstrip('/'))
-        public_path = os.path.join('public', self.path.lstrip('/'))
-
-        if os.path.exists(src_path) and not os.path.isdir(src_path):
-            self.path = src_path
-        elif os.path.exists(public_path) and not os.path.isdir(public_path):
-            self.path = public_path
-        # Fallback to default behavior (serves from root for other files like test-server.py itself) 
-        
-        # Gzip handling
-        accept_encoding = self.headers.get('Accept-Encoding', '')
-        if 'gzip' in accept_encoding:
-            gz_path = self.path + '.gz'
-            if os.path.exists(gz_path):
-                self.send_response(200)
-                self.send_header('Content-type', self.guess_type(self.path))
-                self.send_header('Content-Encoding', 'gzip')
-                
-                # Add caching headers
-                self.add_caching_headers(self.path)
-                
-                self.end_headers()
-                with open(gz_path, 'rb') as f:
-                    self.wfile.write(f.read())
-                return
+    # Keep-alive: every response carries a Content-Length
+    protocol_version = 'HTTP/1.1'
+    timeout = KEEPALIVE_TIMEOUT
+    # Headers and body are separate writes; without TCP_NODELAY the body
+    # waits on the client's delayed ACK (~40 ms) on every keep-alive request
+    disable_nagle_algorithm = True
 
-        # Default GET handler without gzip
-        super().do_GET()
+    def handle(self):
+        # Same loop as BaseHTTPRequestHandler, but stop between requests when draining
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection and not self.server.draining:
+            self.handle_one_request()
 
     def send_head(self):
-        # Add caching headers for non-gzipped files
+        if self.path.startswith(DATA_API_PREFIX):
+            return self.send_data_page()
+
         path = self.translate_path(self.path)
-        if os.path.exists(path):
-            self.add_caching_headers(path)
-        return super().send_head()
+        files = self.server.files
+
+        # Retry once if a file changed between resolving the route and opening it
+        for attempt in range(2):
+            route = files.lookup(path)
+            if route is None:
+                # Directories, redirects and 404s
+                return super().send_head()
+
+            encoding, _, size, etag, _ = representation = route.negotiate(
+                self.headers.get('Accept-Encoding', '')
+            )
+            if self.not_modified(etag, route.mtime):
+                self.send_response(304)
+                self.send_validators(route, etag)
+                self.end_headers()
+                return None
+
+            ranges = None
+            range_header = self.headers.get('Range')
+            if range_header and self.if_range_matches(etag, route.mtime):
+                ranges = parse_range(range_header, size)
+            if ranges == []:
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{size}')
+                self.send_header('Content-Length', '0')
+                self.send_validators(route, etag)
+                self.end_headers()
+                return None
+
+            source = files.open(representation)
+            if source is not None:
+                break
+            files.invalidate(path)
+        else:
+            self.send_error(404, "File not found")
+            return None
+
+        if not ranges:
+            self.send_response(200)
+            body = FileBody(source, [(b'', 0, size)])
+            content_type = route.content_type
+        elif len(ranges) == 1:
+            start, end = ranges[0]
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+            body = FileBody(source, [(b'', start, end - start + 1)])
+            content_type = route.content_type
+        else:
+            boundary = secrets.token_hex(16)
+            self.send_response(206)
+            body = FileBody(source, [
+                (f'\r\n--{boundary}\r\nContent-Type: {route.content_type}\r\n'
+                 f'Content-Range: bytes {start}-{end}/{size}\r\n\r\n'.encode('latin-1'),
+                 start, end - start + 1)
+                for start, end in ranges
+            ], trailer=f'\r\n--{boundary}--\r\n'.encode('latin-1'))
+            content_type = f'multipart/byteranges; boundary={boundary}'
+
+        self.send_header('Content-type', content_type)
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Content-Length', str(body.length))
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_validators(route, etag)
+        self.end_headers()
+        # do_GET writes the body with copyfile(); do_HEAD just closes it
+        return body
+
+    def send_data_page(self):
+        """Answer /api/data/<dataset>?page=N&category=...&difficulty=... from DataPages."""
+        url = urllib.parse.urlsplit(self.path)
+        query = urllib.parse.parse_qs(url.query)
+        try:
+            number = int(query.get('page', ['1'])[0])
+        except ValueError:
+            number = 0
+        if number < 1:
+            self.send_error(400, "page must be a positive integer")
+            return None
+        filters = tuple((facet, query[facet][0]) for facet in DATA_FACETS if facet in query)
+
+        try:
+            page = self.server.data_pages.page(url.path[len(DATA_API_PREFIX):].strip('/'), filters, number)
+        except (OSError, ValueError, KeyError, AttributeError) as e:
+            self.send_error(500, f"Could not load dataset: {e}")
+            return None
+        if page is None:
+            self.send_error(404, "No such dataset or page")
+            return None
+
+        body, gzip_body, etag, mtime = page
+        if self.not_modified(etag, mtime):
+            self.send_response(304)
+            self.send_data_validators(etag)
+            self.end_headers()
+            return None
+
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        if parse_accept_encoding(self.headers.get('Accept-Encoding', '')).get('gzip', 0) > 0:
+            body = gzip_body
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_data_validators(etag)
+        self.end_headers()
+        return FileBody(io.BytesIO(body), [(b'', 0, len(body))])
+
+    def send_data_validators(self, etag):
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'public, max-age=0, must-revalidate')
+
+    def if_range_matches(self, etag, mtime):
+        """True if there is no If-Range header or it still matches the file."""
+        if_range = self.headers.get('If-Range')
+        if if_range is None:
+            return True
+        if_range = if_range.strip()
+        if if_range.startswith(('"', 'W/')):
+            # Strong comparison: weak tags never match
+            return if_range == etag
+        try:
+            since = email.utils.parsedate_to_datetime(if_range)
+        except (TypeError, ValueError):
+            return False
+        return since.tzinfo is not None and int(mtime) == since.timestamp()
+
+    def not_modified(self, etag, mtime):
+        """Evaluate If-None-Match, falling back to If-Modified-Since."""
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            return etag_matches(if_none_match, etag)
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            # Last-Modified has one-second resolution
+            return since.tzinfo is not None and int(mtime) <= since.timestamp()
+        return False
+
+    def send_validators(self, route, etag):
+        """Headers shared by 200 and 304 responses."""
+        if route.path.endswith(COMPRESSIBLE):
+            # Caches must key on Accept-Encoding even for identity responses
+            self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', self.date_time_string(route.mtime))
+        self.add_caching_headers(route.path)
+
+    def copyfile(self, source, outputfile):
+        if not isinstance(source, FileBody):
+            # Directory listings
+            outputfile.write(source.getbuffer())
+            return
+        for prefix, offset, length in source.parts:
+            if prefix:
+                outputfile.write(prefix)
+            self.write_span(source.source, offset, length, outputfile)
+        if source.trailer:
+            outputfile.write(source.trailer)
+
+    def write_span(self, source, offset, length, outputfile):
+        """Write length bytes of source from offset without holding them all in memory."""
+        if isinstance(source, io.BytesIO):
+            # Hot files are already in memory
+            with source.getbuffer() as data:
+                outputfile.write(data[offset:offset + length])
+        elif length >= SENDFILE_THRESHOLD:
+            # Zero-copy from the page cache to the socket (falls back to send() where unsupported)
+            self.connection.sendfile(source, offset, length)
+        else:
+            buffer = self.stream_buffer()
+            source.seek(offset)
+            while length > 0:
+                read = source.readinto(buffer[:min(length, STREAM_BUFFER_SIZE)])
+                if not read:
+                    break
+                outputfile.write(buffer[:read])
+                length -= read
+
+    def stream_buffer(self):
+        # One buffer per connection, reused for every response on it
+        buffer = getattr(self, '_stream_buffer', None)
+        if buffer is None:
+            buffer = self._stream_buffer = memoryview(bytearray(STREAM_BUFFER_SIZE))
+        return buffer
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
 
     def add_caching_headers(self, filepath):
-        # Aggressive caching for static assets
-        if filepath.endswith(('.css', '.js', '.svg', '.woff2', '.json')):
-            self.send_header('Cache-Control', 'public, max-age=31536000') # 1 year
-        # Revalidate HTML files
-        elif filepath.endswith('.html'):
+        # Fingerprinted assets never change under the same name
+        if FINGERPRINTED_RE.search(filepath):
+            self.send_header('Cache-Control', 'public, max-age=31536000, immutable') # 1 year
+        # Everything else revalidates; unchanged files cost a 304
+        elif filepath.endswith(('.html', '.css', '.js', '.svg', '.woff2', '.json')):
             self.send_header('Cache-Control', 'public, max-age=0, must-revalidate')
         else:
             self.send_header('Cache-Control', 'no-cache')
 
-PORT = 8000
-Handler = CustomHandler
-
-print(f"🚀 ReasonPath Test Server Starting...")
-print(f"📁 Serving from src/ and public/ directories")
-print(f"🌐 Main Site: http://localhost:{PORT}/index.html")
-print(f"🛑 Press Ctrl+C to stop")
-
-try:
-    with socketserver.TCPServer(('', PORT), Handler) as httpd:
-        httpd.serve_forever()
-except KeyboardInterrupt:
-    print("\n👋 Server stopped")
+class PooledHTTPServer(http.server.HTTPServer):
+    """
+    HTTP server that hands each connection to a bounded thread pool.
+
+    At most `workers` connections are served at once. When every worker is
+    busy the accept loop waits, so extra clients queue in the listen
+    backlog instead of spawning unbounded threads. drain() stops accepting,
+    lets in-flight requests finish and closes idle keep-alive connections.
+    """
+
+    allow_reuse_address = True
+    request_queue_size = 256
+
+    def __init__(self, address, handler, workers=DEFAULT_WORKERS, quiet=False, files=None,
+                 data_pages=None):
+        super().__init__(address, handler)
+        self.quiet = quiet
+        self.files = files or StaticFiles(WEBSITE_DIR)
+        self.data_pages = data_pages or DataPages(WEBSITE_DIR)
+        self.draining = False
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='reasonpath-http')
+        self._slots = threading.BoundedSemaphore(workers)
+        self._connections = set()
+        self._connections_lock = threading.Lock()
+
+    def process_request(self, request, client_address):
+        if self.draining:
+            self.shutdown_request(request)
+            return
+        self._slots.acquire()
+        with self._connections_lock:
+            self._connections.add(request)
+        self.executor.submit(self._serve_connection, request, client_address)
+
+    def _serve_connection(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def shutdown_request(self, request):
+        with self._connections_lock:
+            self._connections.discard(request)
+        super().shutdown_request(request)
+
+    def drain(self):
+        """Stop accepting, finish in-flight requests and close the server."""
+        self.draining = True
+        # Idle keep-alive connections see EOF on their next read; responses
+        # already being written are unaffected
+        with self._connections_lock:
+            connections = list(self._connections)
+        for connection in connections:
+            try:
+                connection.shutdown(socket.SHUT_RD)
+            except OSError:
+                pass
+        self.shutdown()
+        self.executor.shutdown(wait=True)
+        self.files.stop()
+        self.server_close()
+
+def main():
+    parser = argparse.ArgumentParser(description="ReasonPath test server")
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--bind', default='', help="Address to listen on (default: all interfaces)")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help="Connections served concurrently")
+    parser.add_argument('--quiet', action='store_true', help="Don't log each request")
+    parser.add_argument('--no-file-cache', action='store_true',
+                        help="Resolve and read every file on every request")
+    args = parser.parse_args()
+
+    if args.no_file_cache:
+        files = StaticFiles(WEBSITE_DIR, hot_cache_bytes=0, cache_routes=False)
+    else:
+        files = StaticFiles(WEBSITE_DIR)
+    files.start()
+
+    handler = functools.partial(CustomHandler, directory=WEBSITE_DIR)
+    httpd = PooledHTTPServer((args.bind, args.port), handler, workers=args.workers,
+                             quiet=args.quiet, files=files)
+
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+
+    print(f"🚀 ReasonPath Test Server Starting...")
+    print(f"📁 Serving from src/ and public/ directories")
+    print(f"🌐 Main Site: http://localhost:{httpd.server_port}/index.html")
+    print(f"🧵 {args.workers} workers, keep-alive {KEEPALIVE_TIMEOUT}s")
+    print(f"🛑 Press Ctrl+C to stop", flush=True)
+
+    server_thread = threading.Thread(target=httpd.serve_forever, name='reasonpath-accept')
+    server_thread.start()
+    try:
+        while not stop.wait(0.5):
+            pass
+    finally:
+        print("\n⏳ Finishing in-flight requests...", flush=True)
+        httpd.drain()
+        server_thread.join()
+        print("👋 Server stopped")
+
+if __name__ == "__main__":
+    main()